@@ -0,0 +1,94 @@
+# Copyright 2016 DataStax, Inc.
+#
+# Licensed under the DataStax DSE Driver License;
+# you may not use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+# http://www.datastax.com/terms/datastax-dse-driver-license-terms
+"""
+Shared fixtures and timing helpers for the micro benchmarks in this directory.
+
+Benchmarks are standalone scripts, run from the repository root::
+
+    python benchmarks/graph_json.py --help
+"""
+from __future__ import print_function
+
+import json
+import os
+import sys
+import timeit
+import uuid
+
+# make the in-tree dse package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def vertex_id(i):
+    return {'~label': 'person', 'community_id': 1368843392 + i // 1000, 'member_id': i % 1000}
+
+
+def vertex(i, num_properties=2):
+    """
+    A GraphSON vertex, as returned by DSE Graph, with ``num_properties`` single-valued properties.
+    """
+    vid = vertex_id(i)
+    properties = {}
+    for p in range(num_properties):
+        name = 'prop%d' % (p,)
+        value = 'value-%d-%d' % (i, p) if p % 2 else i * 31 + p
+        properties[name] = [{'id': {'local_id': str(uuid.UUID(int=i * 1000 + p)), '~type': name, 'out_vertex': vid},
+                             'value': value}]
+    return {'id': vid, 'label': 'person', 'type': 'vertex', 'properties': properties}
+
+
+def edge(i, num_properties=1):
+    """
+    A GraphSON edge between two person vertices, with ``num_properties`` properties.
+    """
+    out_v = vertex_id(i)
+    in_v = vertex_id(i + 1)
+    properties = dict(('weight%d' % (p,), 0.5 + p) for p in range(num_properties))
+    return {'id': {'out_vertex': out_v, 'local_id': str(uuid.UUID(int=i)), 'in_vertex': in_v, '~type': 'knows'},
+            'label': 'knows', 'type': 'edge',
+            'inV': in_v, 'inVLabel': 'person', 'outV': out_v, 'outVLabel': 'person',
+            'properties': properties}
+
+
+def path(i, length=3):
+    """
+    A GraphSON path alternating vertices and edges, with ``length`` objects.
+    """
+    objects = [vertex(i + n) if n % 2 == 0 else edge(i + n) for n in range(length)]
+    return {'labels': [['step%d' % (n,)] for n in range(length)], 'objects': objects}
+
+
+def graph_rows(objects):
+    """
+    Wraps result objects as the single-column rows handed to graph row factories.
+    """
+    return [(json.dumps({'result': o}),) for o in objects]
+
+
+def best_time(func, repeat=5, number=None):
+    """
+    Returns the best time (seconds) per call of ``func`` over ``repeat`` rounds.
+
+    If ``number`` is not specified, the number of calls per round is scaled so that a round takes at least 0.2 seconds.
+    """
+    timer = timeit.Timer(func)
+    if number is None:
+        number = 1
+        while timer.timeit(number) < 0.2:
+            number *= 2
+    return min(timer.repeat(repeat, number)) / number
+
+
+def print_table(headers, rows):
+    widths = [max(len(str(c)) for c in col) for col in zip(headers, *rows)]
+    fmt = '  '.join('%%-%ds' % (w,) for w in widths)
+    print(fmt % tuple(headers))
+    print(fmt % tuple('-' * w for w in widths))
+    for row in rows:
+        print(fmt % tuple(row))
@@ -0,0 +1,157 @@
+# Copyright 2016 DataStax, Inc.
+#
+# Licensed under the DataStax DSE Driver License;
+# you may not use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+# http://www.datastax.com/terms/datastax-dse-driver-license-terms
+"""
+Serialization and deserialization speed of the geometric types in dse.cqltypes (PointType, LineStringType,
+PolygonType): points, linestrings of 2 to 100k vertices, and polygons with many interior rings, deserialized from both
+little- and big-endian WKB (the driver always serializes little-endian).
+
+Reports objects/s and MB/s of WKB. With --history, results are appended to a JSON lines file, with the time,
+interpreter and git revision, and compared with the previous entry for the same interpreter::
+
+    python benchmarks/geometry_codec.py --history geometry_codec_history.jsonl
+
+    python benchmarks/geometry_codec.py [--cases point,linestring_100000] [--repeat 5]
+"""
+from __future__ import print_function
+
+from optparse import OptionParser
+import json
+import math
+import os
+import platform
+import struct
+import subprocess
+import time
+
+from base import best_time, print_table
+
+from dse.cqltypes import PointType, LineStringType, PolygonType, WKBGeometryType
+from dse.util import Point, LineString, Polygon
+
+PROTOCOL_VERSION = 4
+
+
+def ring(num_points, cx=0.0, cy=0.0, radius=1.0):
+    # closed ring around (cx, cy); coordinates do not matter to the codecs, only their number
+    step = 2 * math.pi / max(num_points - 1, 1)
+    coords = [(cx + radius * math.cos(i * step), cy + radius * math.sin(i * step)) for i in range(num_points - 1)]
+    return coords + coords[:1] if coords else [(cx, cy)]
+
+
+def polygon(exterior_points, num_interiors, interior_points):
+    interiors = [ring(interior_points, cx=(i % 100) / 200.0, cy=(i // 100) / 200.0, radius=0.001)
+                 for i in range(num_interiors)]
+    return Polygon(ring(exterior_points, radius=10.0), interiors)
+
+
+def big_endian(cql_type, val):
+    """
+    WKB of ``val`` in big-endian byte order
+    """
+    if cql_type is PointType:
+        return struct.pack('>BIdd', 0, WKBGeometryType.POINT, val.x, val.y)
+    if cql_type is LineStringType:
+        return _be_points(struct.pack('>BI', 0, WKBGeometryType.LINESTRING), val.coords)
+    rings = [val.exterior] + list(val.interiors) if val.exterior.coords else []
+    byts = struct.pack('>BII', 0, WKBGeometryType.POLYGON, len(rings))
+    for r in rings:
+        byts = _be_points(byts, r.coords)
+    return byts
+
+
+def _be_points(prefix, coords):
+    return prefix + struct.pack('>I' + 'dd' * len(coords), len(coords), *(d for c in coords for d in c))
+
+
+CASES = (
+    ('point', PointType, lambda: Point(1.5, -2.25)),
+    ('linestring_2', LineStringType, lambda: LineString([(0.0, 0.0), (1.0, 1.0)])),
+    ('linestring_100', LineStringType, lambda: LineString(ring(100))),
+    ('linestring_10000', LineStringType, lambda: LineString(ring(10000))),
+    ('linestring_100000', LineStringType, lambda: LineString(ring(100000))),
+    ('polygon_simple', PolygonType, lambda: polygon(5, 0, 0)),
+    ('polygon_10_holes', PolygonType, lambda: polygon(100, 10, 10)),
+    ('polygon_1000_holes', PolygonType, lambda: polygon(1000, 1000, 10)),
+)
+
+
+def run(case_names, repeat):
+    """
+    Returns a dict keyed by 'case/operation' of {'objects_per_s', 'mb_per_s'}
+    """
+    results = {}
+    for name, cql_type, build in CASES:
+        if name not in case_names:
+            continue
+        val = build()
+        le = cql_type.serialize(val, PROTOCOL_VERSION)
+        be = big_endian(cql_type, val)
+        assert cql_type.deserialize(be, PROTOCOL_VERSION) == cql_type.deserialize(le, PROTOCOL_VERSION)
+        for operation, func, size in (('serialize', lambda: cql_type.serialize(val, PROTOCOL_VERSION), len(le)),
+                                      ('deserialize_le', lambda: cql_type.deserialize(le, PROTOCOL_VERSION), len(le)),
+                                      ('deserialize_be', lambda: cql_type.deserialize(be, PROTOCOL_VERSION), len(be))):
+            elapsed = best_time(func, repeat=repeat)
+            results['%s/%s' % (name, operation)] = {'objects_per_s': 1 / elapsed, 'mb_per_s': size / elapsed / 1e6}
+    return results
+
+
+def _git_revision():
+    try:
+        with open(os.devnull, 'w') as devnull:
+            return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=devnull,
+                                           cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _previous_entry(history, interpreter):
+    previous = None
+    if os.path.exists(history):
+        with open(history) as f:
+            for line in f:
+                entry = json.loads(line)
+                if entry.get('interpreter') == interpreter:
+                    previous = entry
+    return previous
+
+
+def main():
+    parser = OptionParser()
+    parser.add_option('--cases', default=','.join(name for name, _, _ in CASES),
+                      help='comma-separated cases [default: %default]')
+    parser.add_option('--repeat', type='int', default=5, help='timing rounds per case [default: %default]')
+    parser.add_option('--history', metavar='FILE', help='append the results to a JSON lines history file, and '
+                                                        'compare with the previous run')
+    options, _ = parser.parse_args()
+
+    results = run(options.cases.split(','), options.repeat)
+
+    interpreter = '%s %s' % (platform.python_implementation(), platform.python_version())
+    previous = _previous_entry(options.history, interpreter) if options.history else None
+
+    headers = ['case', 'objects/s', 'MB/s']
+    if previous:
+        headers.append('MB/s change since %s' % (previous.get('revision') or time.ctime(previous['time']),))
+    table = []
+    for key, r in sorted(results.items()):
+        row = [key, '%.0f' % (r['objects_per_s'],), '%.1f' % (r['mb_per_s'],)]
+        if previous:
+            before = previous['results'].get(key)
+            row.append('%+.1f%%' % ((r['mb_per_s'] / before['mb_per_s'] - 1) * 100,) if before else '')
+        table.append(row)
+    print_table(headers, table)
+
+    if options.history:
+        with open(options.history, 'a') as f:
+            f.write(json.dumps({'time': time.time(), 'interpreter': interpreter, 'revision': _git_revision(),
+                                'results': results}, sort_keys=True) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+# Copyright 2016 DataStax, Inc.
+#
+# Licensed under the DataStax DSE Driver License;
+# you may not use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+# http://www.datastax.com/terms/datastax-dse-driver-license-terms
+"""
+Runs thousands of concurrent coroutines issuing graph queries, comparing Session.execute_graph_aio with bridging
+the blocking Session.execute_graph through a thread pool (loop.run_in_executor).
+
+Requires Python 3.5+ and a DSE Graph cluster.
+
+    python benchmarks/graph_asyncio.py --hosts 127.0.0.1 [--coroutines 2000] [--requests 10] [--query '[1]']
+"""
+from __future__ import print_function
+
+from optparse import OptionParser
+import asyncio
+import time
+
+from base import print_table
+
+from dse.cluster import Cluster, EXEC_PROFILE_GRAPH_SYSTEM_DEFAULT
+
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+async def aio_worker(session, query, requests, latencies):
+    for _ in range(requests):
+        start = time.time()
+        await session.execute_graph_aio(query, execution_profile=EXEC_PROFILE_GRAPH_SYSTEM_DEFAULT)
+        latencies.append(time.time() - start)
+
+
+async def executor_worker(session, query, requests, latencies):
+    loop = asyncio.get_event_loop()
+    for _ in range(requests):
+        start = time.time()
+        await loop.run_in_executor(None, lambda: session.execute_graph(query, execution_profile=EXEC_PROFILE_GRAPH_SYSTEM_DEFAULT))
+        latencies.append(time.time() - start)
+
+
+def run(loop, worker, session, options):
+    latencies = []
+    start = time.time()
+    loop.run_until_complete(asyncio.gather(*(worker(session, options.query, options.requests, latencies)
+                                             for _ in range(options.coroutines))))
+    elapsed = time.time() - start
+    latencies.sort()
+    return ('%.0f' % (len(latencies) / elapsed,),
+            '%.2f' % (percentile(latencies, 0.5) * 1000,),
+            '%.2f' % (percentile(latencies, 0.99) * 1000,))
+
+
+def main():
+    parser = OptionParser()
+    parser.add_option('--hosts', default='127.0.0.1', help='comma-separated contact points [default: %default]')
+    parser.add_option('--coroutines', type='int', default=2000, help='concurrent coroutines [default: %default]')
+    parser.add_option('--requests', type='int', default=10, help='requests per coroutine [default: %default]')
+    parser.add_option('--query', default='[1]', help='graph query [default: %default]')
+    options, _ = parser.parse_args()
+
+    cluster = Cluster(options.hosts.split(','))
+    session = cluster.connect()
+    loop = asyncio.get_event_loop()
+    try:
+        table = [('execute_graph_aio',) + run(loop, aio_worker, session, options),
+                 ('run_in_executor(execute_graph)',) + run(loop, executor_worker, session, options)]
+    finally:
+        cluster.shutdown()
+
+    print("%d coroutines x %d requests\n" % (options.coroutines, options.requests))
+    print_table(['API', 'requests/s', 'p50 ms', 'p99 ms'], table)
+
+
+if __name__ == '__main__':
+    main()
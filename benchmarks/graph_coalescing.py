@@ -0,0 +1,69 @@
+# Copyright 2016 DataStax, Inc.
+#
+# Licensed under the DataStax DSE Driver License;
+# you may not use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+# http://www.datastax.com/terms/datastax-dse-driver-license-terms
+"""
+Many threads reading the same data at once, with and without GraphExecutionProfile.coalesce_requests: reports the
+throughput seen by the threads, and the number of requests actually sent to the cluster.
+
+Requires a DSE Graph cluster.
+
+    python benchmarks/graph_coalescing.py --hosts 127.0.0.1 [--threads 50] [--requests 200] [--query '[x, x]']
+"""
+from __future__ import print_function
+
+from optparse import OptionParser
+from threading import Thread
+import time
+
+from base import print_table
+
+from dse.cluster import Cluster, EXEC_PROFILE_GRAPH_SYSTEM_DEFAULT
+
+
+def run(session, profile, options):
+    futures = set()
+
+    def worker():
+        for _ in range(options.requests):
+            future = session.execute_graph_async(options.query, {'x': 1}, execution_profile=profile)
+            futures.add(future)
+            future.result()
+
+    threads = [Thread(target=worker) for _ in range(options.threads)]
+    start = time.time()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.time() - start
+    return '%.0f' % (options.threads * options.requests / elapsed,), str(len(futures))
+
+
+def main():
+    parser = OptionParser()
+    parser.add_option('--hosts', default='127.0.0.1', help='comma-separated contact points [default: %default]')
+    parser.add_option('--threads', type='int', default=50, help='concurrent threads [default: %default]')
+    parser.add_option('--requests', type='int', default=200, help='requests per thread [default: %default]')
+    parser.add_option('--query', default='[x, x]', help='graph query, with parameter x [default: %default]')
+    options, _ = parser.parse_args()
+
+    cluster = Cluster(options.hosts.split(','))
+    session = cluster.connect()
+    coalescing = session.execution_profile_clone_update(EXEC_PROFILE_GRAPH_SYSTEM_DEFAULT, coalesce_requests=True)
+    try:
+        table = [('independent',) + run(session, EXEC_PROFILE_GRAPH_SYSTEM_DEFAULT, options),
+                 ('coalesced',) + run(session, coalescing, options)]
+    finally:
+        cluster.shutdown()
+
+    print("%d threads x %d requests\n" % (options.threads, options.requests))
+    print_table(['requests', 'requests/s', 'sent to cluster'], table)
+
+
+if __name__ == '__main__':
+    main()
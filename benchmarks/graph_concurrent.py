@@ -0,0 +1,90 @@
+# Copyright 2016 DataStax, Inc.
+#
+# Licensed under the DataStax DSE Driver License;
+# you may not use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+# http://www.datastax.com/terms/datastax-dse-driver-license-terms
+"""
+Measures throughput and latency of execute_graph_concurrent at several concurrency levels, against sequential
+Session.execute_graph calls.
+
+Requires a DSE Graph cluster, or runs offline against the in-process stub server of the test suite with --stub,
+which answers each request with a vertex after the given latency (milliseconds).
+
+    python benchmarks/graph_concurrent.py --hosts 127.0.0.1 [--requests 10000] [--concurrency 1,10,50,100,200]
+    python benchmarks/graph_concurrent.py --stub 2 [--requests 10000]
+"""
+from __future__ import print_function
+
+from optparse import OptionParser
+import time
+
+from base import print_table, vertex
+
+from dse.cluster import Cluster, EXEC_PROFILE_GRAPH_SYSTEM_DEFAULT
+from dse.concurrent import execute_graph_concurrent, GraphExecutionStats
+
+from tests.stub_server import StubServer
+
+
+def sequential(session, statements):
+    latencies = []
+    start = time.time()
+    for statement, parameters in statements:
+        t = time.time()
+        session.execute_graph(statement, parameters, execution_profile=EXEC_PROFILE_GRAPH_SYSTEM_DEFAULT)
+        latencies.append(time.time() - t)
+    elapsed = time.time() - start
+    latencies.sort()
+    return ('%.0f' % (len(latencies) / elapsed,),
+            '%.2f' % (latencies[len(latencies) // 2] * 1000,),
+            '%.2f' % (latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,))
+
+
+def concurrent(session, statements, concurrency):
+    stats = GraphExecutionStats()
+    for _ in execute_graph_concurrent(session, statements, concurrency=concurrency, results_generator=True,
+                                      execution_profile=EXEC_PROFILE_GRAPH_SYSTEM_DEFAULT, stats=stats):
+        pass
+    return ('%.0f' % (stats.throughput,),
+            '%.2f' % (stats.latency_percentile(50) * 1000,),
+            '%.2f' % (stats.latency_percentile(99) * 1000,))
+
+
+def main():
+    parser = OptionParser()
+    parser.add_option('--hosts', default='127.0.0.1', help='comma-separated contact points [default: %default]')
+    parser.add_option('--requests', type='int', default=10000, help='requests per run [default: %default]')
+    parser.add_option('--concurrency', default='1,10,50,100,200',
+                      help='comma-separated concurrency levels [default: %default]')
+    parser.add_option('--query', default='[x]', help='graph query, with parameter x [default: %default]')
+    parser.add_option('--stub', type='float', metavar='LATENCY',
+                      help='run against a local stub server responding after LATENCY milliseconds')
+    options, _ = parser.parse_args()
+
+    statements = [(options.query, {'x': i}) for i in range(options.requests)]
+    server = None
+    if options.stub is not None:
+        server = StubServer(handler=lambda request: [vertex(request.parameters['x'])],
+                            latency=options.stub / 1000.0).start()
+        cluster = Cluster([server.address], port=server.port, protocol_version=4)
+    else:
+        cluster = Cluster(options.hosts.split(','))
+    session = cluster.connect()
+    try:
+        table = [('sequential execute_graph',) + sequential(session, statements)]
+        for level in (int(c) for c in options.concurrency.split(',')):
+            table.append(('execute_graph_concurrent(%d)' % (level,),) + concurrent(session, statements, level))
+    finally:
+        cluster.shutdown()
+        if server:
+            server.stop()
+
+    print("%d requests\n" % (options.requests,))
+    print_table(['API', 'requests/s', 'p50 ms', 'p99 ms'], table)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+# Copyright 2016 DataStax, Inc.
+#
+# Licensed under the DataStax DSE Driver License;
+# you may not use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+# http://www.datastax.com/terms/datastax-dse-driver-license-terms
+"""
+Decode benchmark suite for the graph row factories: single_object_row_factory, graph_result_row_factory,
+graph_object_row_factory, and Path construction, over synthetic GraphSON pages of small and wide vertices,
+multi-property edges and deep paths.
+
+Reports rows/s, and the memory allocated per row (peak while decoding, and retained by the results) as traced by
+tracemalloc (Python 3.4+).
+
+Results can be saved as a baseline, and later runs compared against it to catch regressions in dse/graph.py; the
+comparison exits with status 1 if any case is slower, or allocates more, than the baseline by more than the
+tolerance::
+
+    python benchmarks/graph_decode.py --save graph_decode_baseline.json
+    # change dse/graph.py
+    python benchmarks/graph_decode.py --compare graph_decode_baseline.json [--tolerance 0.1]
+
+Throughput baselines are only meaningful on the machine and interpreter they were recorded with.
+
+    python benchmarks/graph_decode.py [--sizes 10,1000,100000] [--fixtures small_vertex,edge] [--repeat 3]
+"""
+from __future__ import print_function
+
+from optparse import OptionParser
+import gc
+import json
+import sys
+import tracemalloc
+
+from base import vertex, edge, path, graph_rows, best_time, print_table
+
+from dse.graph import single_object_row_factory, graph_result_row_factory, graph_object_row_factory, Path
+
+FIXTURES = (
+    ('small_vertex', lambda i: vertex(i, 2)),
+    ('wide_vertex', lambda i: vertex(i, 50)),
+    ('edge', lambda i: edge(i, 8)),
+    ('deep_path', lambda i: path(i, 21)),
+)
+
+
+def _build_paths(rows):
+    return [Path(o['labels'], o['objects']) for o in rows]
+
+
+def factories(fixture):
+    """
+    (name, function of rows, input transformation) for the cases run on a fixture
+    """
+    cases = [('single_object_row_factory', lambda rows: single_object_row_factory(None, rows), None),
+             ('graph_result_row_factory', lambda rows: graph_result_row_factory(None, rows), None),
+             # graph_object_row_factory returns a generator
+             ('graph_object_row_factory', lambda rows: list(graph_object_row_factory(None, rows)), None)]
+    if fixture == 'deep_path':
+        # Path construction alone, from decoded results, and as done by Result.as_path after decoding
+        cases.append(('Path', _build_paths, lambda rows: [json.loads(r[0])['result'] for r in rows]))
+        cases.append(('graph_result_row_factory + as_path',
+                      lambda rows: [r.as_path() for r in graph_result_row_factory(None, rows)], None))
+    return cases
+
+
+def allocations(func, rows):
+    """
+    Returns (peak, retained) bytes allocated by ``func(rows)``
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = func(rows)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak, retained
+
+
+def run(sizes, fixture_names, repeat):
+    """
+    Returns a dict of results, keyed by 'fixture/rows/case', with rows_per_s, peak_bytes_per_row and
+    retained_bytes_per_row
+    """
+    results = {}
+    for fixture, build in FIXTURES:
+        if fixture not in fixture_names:
+            continue
+        for size in sizes:
+            rows = graph_rows(build(i) for i in range(size))
+            for case, func, transform in factories(fixture):
+                data = transform(rows) if transform else rows
+                elapsed = best_time(lambda: func(data), repeat=repeat)
+                peak, retained = allocations(func, data)
+                results['%s/%d/%s' % (fixture, size, case)] = {'rows_per_s': size / elapsed,
+                                                               'peak_bytes_per_row': float(peak) / size,
+                                                               'retained_bytes_per_row': float(retained) / size}
+    return results
+
+
+def regressions(results, baseline, tolerance):
+    """
+    Returns a list of (case, metric, baseline value, value) for metrics worse than the baseline by more than
+    ``tolerance`` (a fraction). Cases missing from either side are ignored.
+    """
+    found = []
+    for key in sorted(set(results) & set(baseline)):
+        current, base = results[key], baseline[key]
+        if current['rows_per_s'] < base['rows_per_s'] * (1 - tolerance):
+            found.append((key, 'rows_per_s', base['rows_per_s'], current['rows_per_s']))
+        for metric in ('peak_bytes_per_row', 'retained_bytes_per_row'):
+            if current[metric] > base[metric] * (1 + tolerance):
+                found.append((key, metric, base[metric], current[metric]))
+    return found
+
+
+def main():
+    parser = OptionParser()
+    parser.add_option('--sizes', default='10,1000,100000', help='comma-separated rows per page [default: %default]')
+    parser.add_option('--fixtures', default=','.join(name for name, _ in FIXTURES),
+                      help='comma-separated fixtures [default: %default]')
+    parser.add_option('--repeat', type='int', default=3, help='timing rounds per case [default: %default]')
+    parser.add_option('--save', metavar='FILE', help='save the results as a baseline')
+    parser.add_option('--compare', metavar='FILE', help='compare the results against a saved baseline')
+    parser.add_option('--tolerance', type='float', default=0.1,
+                      help='regression tolerance, as a fraction of the baseline [default: %default]')
+    options, _ = parser.parse_args()
+
+    results = run([int(s) for s in options.sizes.split(',')], options.fixtures.split(','), options.repeat)
+
+    print_table(['case', 'rows/s', 'peak B/row', 'retained B/row'],
+                [(key, '%.0f' % (r['rows_per_s'],), '%.0f' % (r['peak_bytes_per_row'],),
+                  '%.0f' % (r['retained_bytes_per_row'],)) for key, r in sorted(results.items())])
+
+    if options.save:
+        with open(options.save, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if options.compare:
+        with open(options.compare) as f:
+            baseline = json.load(f)
+        found = regressions(results, baseline, options.tolerance)
+        if found:
+            print("\nRegressions against %s (tolerance %.0f%%):\n" % (options.compare, options.tolerance * 100))
+            print_table(['case', 'metric', 'baseline', 'current'],
+                        [(key, metric, '%.0f' % (base,), '%.0f' % (current,)) for key, metric, base, current in found])
+            sys.exit(1)
+        print("\nNo regressions against %s" % (options.compare,))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+# Copyright 2016 DataStax, Inc.
+#
+# Licensed under the DataStax DSE Driver License;
+# you may not use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+# http://www.datastax.com/terms/datastax-dse-driver-license-terms
+"""
+Compares the JSON backends registered in dse.graph, decoding vertex, edge and path pages with
+graph_object_row_factory, and encoding graph parameters.
+
+    python benchmarks/graph_json.py [--rows 1000]
+"""
+from __future__ import print_function
+
+from optparse import OptionParser
+
+from base import vertex, edge, path, graph_rows, best_time, print_table
+
+from dse import graph
+
+
+def main():
+    parser = OptionParser()
+    parser.add_option('--rows', type='int', default=1000, help='rows per page [default: %default]')
+    options, _ = parser.parse_args()
+
+    pages = (('vertex', graph_rows(vertex(i) for i in range(options.rows))),
+             ('edge', graph_rows(edge(i) for i in range(options.rows))),
+             ('path', graph_rows(path(i) for i in range(options.rows))))
+    parameters = {'ids': [vertex(i)['id'] for i in range(100)], 'name': 'marko', 'weight': 0.5}
+
+    default_codec = graph.get_json_codec()
+    table = []
+    for name in sorted(graph._json_codecs):
+        loads, dumps = graph._json_codecs[name]
+        row = [name]
+        for _, rows in pages:
+            if loads:
+                graph.set_json_codec(decoder=name)
+                row.append('%.0f' % (len(rows) / best_time(lambda: list(graph.graph_object_row_factory(None, rows))),))
+            else:
+                row.append('-')
+        row.append('%.0f' % (1 / best_time(lambda: dumps(parameters)),) if dumps else '-')
+        table.append(row)
+    graph.set_json_codec(*default_codec)
+
+    print("Default codec (decoder, encoder): %s, %s\n" % default_codec)
+    print_table(['codec'] + ['%s rows/s' % (n,) for n, _ in pages] + ['params/s'], table)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# Copyright 2016 DataStax, Inc.
+#
+# Licensed under the DataStax DSE Driver License;
+# you may not use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+# http://www.datastax.com/terms/datastax-dse-driver-license-terms
+"""
+Measures the per-element memory footprint of graph elements built by the row factories, comparing the
+slot-based classes in dse.graph with equivalent dict-backed classes (the layout prior to __slots__).
+
+Requires Python 3.4+ (tracemalloc).
+
+    python benchmarks/graph_memory.py [--elements 100000] [--properties 4]
+"""
+from __future__ import print_function
+
+from optparse import OptionParser
+import gc
+import tracemalloc
+
+from base import vertex, edge, path, print_table
+
+from dse.graph import Vertex, VertexProperty, Edge, Path
+
+
+class DictVertexProperty(VertexProperty):
+    pass
+
+
+class DictVertex(Vertex):
+
+    @staticmethod
+    def _extract_properties(properties):
+        return dict((k, [DictVertexProperty(p['value'], p.get('properties')) for p in v]) for k, v in properties.items())
+
+
+class DictEdge(Edge):
+    pass
+
+
+class DictPath(Path):
+    pass
+
+
+def as_vertex(o, cls=Vertex):
+    return cls(o['id'], o['label'], o['type'], o.get('properties', {}))
+
+
+def as_edge(o, cls=Edge):
+    return cls(o['id'], o['label'], o['type'], o.get('properties', {}),
+               o['inV'], o['inVLabel'], o['outV'], o['outVLabel'])
+
+
+def footprint(build, objects):
+    gc.collect()
+    tracemalloc.start()
+    built = [build(o) for o in objects]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del built
+    return size / float(len(objects))
+
+
+def main():
+    parser = OptionParser()
+    parser.add_option('--elements', type='int', default=100000, help='elements per measurement [default: %default]')
+    parser.add_option('--properties', type='int', default=4, help='properties per element [default: %default]')
+    options, _ = parser.parse_args()
+
+    vertices = [vertex(i, options.properties) for i in range(options.elements)]
+    edges = [edge(i, options.properties) for i in range(options.elements)]
+    paths = [path(i) for i in range(options.elements // 10)]
+
+    cases = (('vertex', vertices, as_vertex, lambda o: as_vertex(o, DictVertex)),
+             ('edge', edges, as_edge, lambda o: as_edge(o, DictEdge)),
+             ('path', paths, lambda o: Path(o['labels'], o['objects']), lambda o: DictPath(o['labels'], o['objects'])))
+
+    table = []
+    for name, objects, slotted, dict_backed in cases:
+        after = footprint(slotted, objects)
+        before = footprint(dict_backed, objects)
+        table.append((name, '%.0f' % (before,), '%.0f' % (after,), '%.2fx' % (before / after,)))
+
+    print("Bytes per element (%d properties)\n" % (options.properties,))
+    print_table(['element', 'dict-backed', 'slots', 'ratio'], table)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# Copyright 2016 DataStax, Inc.
+#
+# Licensed under the DataStax DSE Driver License;
+# you may not use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+# http://www.datastax.com/terms/datastax-dse-driver-license-terms
+"""
+Measures the overhead of Session.graph_metrics per request: Session.execute_graph_async followed by the completion of
+the request, with request creation, sending and completion stubbed out, with and without metrics.
+
+    python benchmarks/graph_metrics.py
+"""
+from __future__ import print_function
+
+from base import best_time, print_table
+
+from cassandra.policies import NoSpeculativeExecutionPlan
+
+from dse.cluster import Session, GraphExecutionProfile, EXEC_PROFILE_GRAPH_DEFAULT
+from dse.graph import GraphParameterEncoder
+from dse.metrics import GraphMetrics
+
+
+class _Message(object):
+    _query_params = None
+
+
+class _Future(object):
+
+    _spec_execution_plan = NoSpeculativeExecutionPlan()
+
+    def __init__(self):
+        self.message = _Message()
+        self._callbacks = []
+        self.attempted_hosts = ['127.0.0.1']
+
+    def send_request(self):
+        pass
+
+    def add_callbacks(self, callback, errback, callback_args=(), errback_args=()):
+        self._callbacks.append((callback, callback_args))
+
+    def complete(self):
+        for callback, args in self._callbacks:
+            callback([], *args)
+
+
+def main():
+    profile = GraphExecutionProfile()
+    session = Session.__new__(Session)
+    session._get_execution_profile = lambda ep: profile
+    session._create_response_future = lambda *args, **kwargs: _Future()
+    session.client_protocol_handler = None
+    session.graph_parameter_encoder = GraphParameterEncoder()
+
+    def request():
+        session.execute_graph_async('g.V()', execution_profile=EXEC_PROFILE_GRAPH_DEFAULT).complete()
+
+    baseline = best_time(request)
+    session.graph_metrics = GraphMetrics()
+    with_metrics = best_time(request)
+
+    print_table(['execute_graph_async', 'us/request'],
+                [('without metrics', '%.2f' % (baseline * 1e6,)),
+                 ('with metrics', '%.2f' % (with_metrics * 1e6,)),
+                 ('metrics overhead', '%.2f' % ((with_metrics - baseline) * 1e6,))])
+
+
+if __name__ == '__main__':
+    main()
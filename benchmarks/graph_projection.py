@@ -0,0 +1,60 @@
+# Copyright 2016 DataStax, Inc.
+#
+# Licensed under the DataStax DSE Driver License;
+# you may not use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+# http://www.datastax.com/terms/datastax-dse-driver-license-terms
+"""
+Decode time and retained memory of graph_projection_row_factory against graph_object_row_factory, for pages of
+vertices of increasing width.
+
+Requires Python 3.4+ (tracemalloc).
+
+    python benchmarks/graph_projection.py [--rows 1000] [--fields 3]
+"""
+from __future__ import print_function
+
+from optparse import OptionParser
+import gc
+import tracemalloc
+
+from base import vertex, graph_rows, best_time, print_table
+
+from dse import graph
+
+
+def retained(factory, rows):
+    gc.collect()
+    tracemalloc.start()
+    results = list(factory(None, rows))
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del results
+    return size / float(len(rows))
+
+
+def main():
+    parser = OptionParser()
+    parser.add_option('--rows', type='int', default=1000, help='rows per page [default: %default]')
+    parser.add_option('--fields', type='int', default=3, help='properties projected [default: %default]')
+    options, _ = parser.parse_args()
+
+    projection = graph.graph_projection_row_factory('prop%d' % (i,) for i in range(options.fields))
+
+    table = []
+    for width in (4, 16, 64):
+        rows = graph_rows(vertex(i, width) for i in range(options.rows))
+        row = [width]
+        for factory in (graph.graph_object_row_factory, projection):
+            row.append('%.0f' % (len(rows) / best_time(lambda: list(factory(None, rows))),))
+            row.append('%.0f' % (retained(factory, rows),))
+        table.append(row)
+
+    print("Projecting %d properties\n" % (options.fields,))
+    print_table(['properties', 'object rows/s', 'object bytes/row', 'projection rows/s', 'projection bytes/row'], table)
+
+
+if __name__ == '__main__':
+    main()
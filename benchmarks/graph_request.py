@@ -0,0 +1,76 @@
+# Copyright 2016 DataStax, Inc.
+#
+# Licensed under the DataStax DSE Driver License;
+# you may not use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+# http://www.datastax.com/terms/datastax-dse-driver-license-terms
+"""
+Measures the client-side cost of building a graph request: the custom payload built from the execution profile
+on every call (as done before payloads were cached), against the payload cached on the profile, and the whole
+Session.execute_graph_async path with request creation and sending stubbed out, with parameters encoded per request
+or pre-encoded.
+
+    python benchmarks/graph_request.py
+"""
+from __future__ import print_function
+
+import datetime
+
+from base import best_time, print_table
+
+from cassandra.marshal import int64_pack
+from cassandra.policies import NoSpeculativeExecutionPlan
+
+from dse.cluster import Session, GraphExecutionProfile
+from dse.graph import GraphOptions, GraphParameterEncoder, _request_timeout_key
+from dse.util import Point
+
+
+class _Message(object):
+    _query_params = None
+
+
+class _Future(object):
+
+    _spec_execution_plan = NoSpeculativeExecutionPlan()
+
+    def __init__(self):
+        self.message = _Message()
+
+    def send_request(self):
+        pass
+
+
+def uncached_payload(profile):
+    options = profile.graph_options.copy()
+    custom_payload = options.get_options_map()
+    custom_payload[_request_timeout_key] = int64_pack(int(profile.request_timeout * 1000))
+    return custom_payload
+
+
+def main():
+    profile = GraphExecutionProfile(graph_options=GraphOptions(graph_name='benchmark', graph_read_consistency_level=1,
+                                                               graph_write_consistency_level=6))
+    session = Session.__new__(Session)
+    session._get_execution_profile = lambda ep: profile
+    session._create_response_future = lambda *args, **kwargs: _Future()
+    session.client_protocol_handler = None
+    session.graph_parameter_encoder = GraphParameterEncoder()
+
+    parameters = {'ids': list(range(20)), 'location': Point(1, 2), 'since': datetime.date(2016, 9, 13)}
+    encoded_parameters = session.graph_parameter_encoder.encode(parameters)
+
+    table = []
+    for name, func in (('payload, built per request', lambda: uncached_payload(profile)),
+                       ('payload, cached on profile', profile._get_custom_payload),
+                       ('execute_graph_async', lambda: session.execute_graph_async('g.V()', parameters)),
+                       ('execute_graph_async, pre-encoded parameters',
+                        lambda: session.execute_graph_async('g.V()', encoded_parameters))):
+        table.append((name, '%.2f' % (best_time(func) * 1e6,)))
+    print_table(['operation', 'us/request'], table)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+# Copyright 2016 DataStax, Inc.
+#
+# Licensed under the DataStax DSE Driver License;
+# you may not use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+# http://www.datastax.com/terms/datastax-dse-driver-license-terms
+"""
+Compares Session.execute_graph latency for a repeated read query, with and without Session.graph_result_cache.
+
+Requires a DSE Graph cluster.
+
+    python benchmarks/graph_result_cache.py --hosts 127.0.0.1 [--requests 1000] [--query '[x, x]']
+"""
+from __future__ import print_function
+
+from optparse import OptionParser
+
+from base import best_time, print_table
+
+from dse.cluster import Cluster, GraphResultCache, EXEC_PROFILE_GRAPH_SYSTEM_DEFAULT
+
+
+def main():
+    parser = OptionParser()
+    parser.add_option('--hosts', default='127.0.0.1', help='comma-separated contact points [default: %default]')
+    parser.add_option('--requests', type='int', default=1000, help='requests per run [default: %default]')
+    parser.add_option('--query', default='[x, x]', help='graph query, with parameter x [default: %default]')
+    options, _ = parser.parse_args()
+
+    cluster = Cluster(options.hosts.split(','))
+    session = cluster.connect()
+    session.graph_result_cache = GraphResultCache()
+    uncached = EXEC_PROFILE_GRAPH_SYSTEM_DEFAULT
+    cached = session.execution_profile_clone_update(uncached, cache_results=True)
+    try:
+        table = []
+        for name, profile in (('uncached', uncached), ('cached', cached)):
+            seconds = best_time(lambda: session.execute_graph(options.query, {'x': 1}, execution_profile=profile),
+                                number=options.requests)
+            table.append((name, '%.1f' % (seconds * 1e6,), '%.0f' % (1 / seconds,)))
+    finally:
+        cluster.shutdown()
+
+    print("cache hits: %d, misses: %d\n" % (session.graph_result_cache.hits, session.graph_result_cache.misses))
+    print_table(['execute_graph', 'us/request', 'requests/s'], table)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# Copyright 2016 DataStax, Inc.
+#
+# Licensed under the DataStax DSE Driver License;
+# you may not use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+# http://www.datastax.com/terms/datastax-dse-driver-license-terms
+"""
+Throughput of graph_element_row_factory against graph_object_row_factory, both with the default JSON codec and the
+standard library (with which graph_element_row_factory decodes in a single pass).
+
+    python benchmarks/graph_single_pass.py [--rows 1000] [--properties 4]
+"""
+from __future__ import print_function
+
+from optparse import OptionParser
+
+from base import vertex, edge, path, graph_rows, best_time, print_table
+
+from dse import graph
+
+
+def main():
+    parser = OptionParser()
+    parser.add_option('--rows', type='int', default=1000, help='rows per page [default: %default]')
+    parser.add_option('--properties', type='int', default=4, help='properties per element [default: %default]')
+    options, _ = parser.parse_args()
+
+    pages = (('vertex', graph_rows(vertex(i, options.properties) for i in range(options.rows))),
+             ('edge', graph_rows(edge(i, options.properties) for i in range(options.rows))),
+             ('path', graph_rows(path(i) for i in range(options.rows))))
+
+    default_codec = graph.get_json_codec()
+
+    def object_factory(codec):
+        def run(rows):
+            graph.set_json_codec(decoder=codec)
+            # paths are converted by as_path, which the element factory does while decoding
+            return [r.as_path() if isinstance(r, graph.Result) and 'objects' in r.value else r
+                    for r in graph.graph_object_row_factory(None, rows)]
+        return run
+
+    def element_factory(codec):
+        def run(rows):
+            graph.set_json_codec(decoder=codec)
+            return graph.graph_element_row_factory(None, rows)
+        return run
+
+    factories = (('graph_object_row_factory (%s)' % (default_codec[0],), object_factory(default_codec[0])),
+                 ('graph_object_row_factory (json)', object_factory('json')),
+                 ('graph_element_row_factory (%s)' % (default_codec[0],), element_factory(default_codec[0])),
+                 ('graph_element_row_factory (json)', element_factory('json')))
+
+    table = []
+    for name, factory in factories:
+        table.append([name] + ['%.0f' % (len(rows) / best_time(lambda: factory(rows)),) for _, rows in pages])
+    graph.set_json_codec(*default_codec)
+
+    print_table(['row factory'] + ['%s rows/s' % (n,) for n, _ in pages], table)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# Copyright 2016 DataStax, Inc.
+#
+# Licensed under the DataStax DSE Driver License;
+# you may not use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+# http://www.datastax.com/terms/datastax-dse-driver-license-terms
+"""
+Measures the cost of wrapping statements in dse.query.HostTargetingStatement (done for every analytics graph request),
+for simple, graph, bound and batch statements: with a class created on each call (as done before targeting classes
+were cached), against the cached class. Also reports the memory retained by the wrappers created, as traced by
+tracemalloc (Python 3.4+).
+
+    python benchmarks/host_targeting.py [--number 10000]
+"""
+from __future__ import print_function
+
+from optparse import OptionParser
+import gc
+import tracemalloc
+
+from base import best_time, print_table
+
+from cassandra.query import SimpleStatement, BoundStatement, BatchStatement
+
+from dse.graph import SimpleGraphStatement
+from dse.query import HostTargetingStatement
+
+
+class _PreparedStatement(object):
+    column_metadata = None
+    routing_key_indexes = None
+    is_idempotent = False
+    consistency_level = None
+    serial_consistency_level = None
+    fetch_size = None
+    custom_payload = None
+    retry_policy = None
+
+
+class PerCallHostTargetingStatement(object):
+
+    def __init__(self, inner_statement, target_host):
+        self.__class__ = type(inner_statement.__class__.__name__,
+                              (self.__class__, inner_statement.__class__),
+                              {})
+        self.__dict__ = inner_statement.__dict__
+        self.target_host = target_host
+
+
+def statements():
+    batch = BatchStatement()
+    for i in range(10):
+        batch.add(SimpleStatement('INSERT %d' % (i,)))
+    return (('simple', SimpleStatement('SELECT')),
+            ('graph', SimpleGraphStatement('g.V()')),
+            ('bound', BoundStatement(_PreparedStatement())),
+            ('batch', batch))
+
+
+def retained(wrapper, statement, number):
+    """
+    Bytes per wrapper retained by ``number`` wrappers, and the classes they created
+    """
+    gc.collect()
+    tracemalloc.start()
+    wrappers = [wrapper(statement, '127.0.0.1') for _ in range(number)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del wrappers
+    return float(size) / number
+
+
+def main():
+    parser = OptionParser()
+    parser.add_option('--number', type='int', default=10000, help='wrappers per timing round [default: %default]')
+    options, _ = parser.parse_args()
+
+    table = []
+    for name, statement in statements():
+        for label, wrapper in (('per-call class', PerCallHostTargetingStatement),
+                               ('cached class', HostTargetingStatement)):
+            elapsed = best_time(lambda: wrapper(statement, '127.0.0.1'), number=options.number)
+            table.append(('%s / %s' % (name, label), '%.2f' % (elapsed * 1e6,),
+                          '%.0f' % (retained(wrapper, statement, options.number),)))
+    print_table(['statement / wrapper', 'us per wrap', 'retained B per wrap'], table)
+
+
+if __name__ == '__main__':
+    main()
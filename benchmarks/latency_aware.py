@@ -0,0 +1,110 @@
+# Copyright 2016 DataStax, Inc.
+#
+# Licensed under the DataStax DSE Driver License;
+# you may not use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+# http://www.datastax.com/terms/datastax-dse-driver-license-terms
+"""
+Compares graph request latencies with and without dse.policies.LatencyAwarePolicy, on a simulated cluster of
+in-process stub servers (see tests/stub_server.py) on loopback addresses 127.0.0.1 to 127.0.0.N, some of which are
+slow to respond.
+
+Each run executes the same requests with execute_graph_concurrent, with a round robin profile and with the
+latency-aware profile wrapping it, and reports throughput, latency percentiles, and the share of requests served
+by slow nodes. Latencies are measured by the client: with too many requests in flight, time spent queued in the
+client dominates, and slow nodes no longer stand out::
+
+    python benchmarks/latency_aware.py [--nodes 4] [--slow 1] [--latency 5] [--slow-latency 50] [--requests 3000]
+"""
+from __future__ import print_function
+
+from optparse import OptionParser
+import random
+import time
+
+from base import print_table, vertex
+
+from cassandra.policies import DCAwareRoundRobinPolicy
+
+from dse.cluster import Cluster, GraphExecutionProfile
+from dse.concurrent import execute_graph_concurrent, GraphExecutionStats
+from dse.policies import LatencyAwarePolicy
+
+from tests.stub_server import StubServer
+
+
+def jittered(latency):
+    # +/- 50% around the latency
+    return lambda request: latency * random.uniform(0.5, 1.5)
+
+
+def start_cluster(nodes, slow, latency, slow_latency):
+    addresses = ['127.0.0.%d' % (i,) for i in range(1, nodes + 1)]
+    servers = []
+    port = 0
+    for i, address in enumerate(addresses):
+        server = StubServer(handler=lambda request: [vertex(request.parameters['x'])],
+                            latency=jittered(slow_latency if i < slow else latency),
+                            address=address, port=port, peers=[a for a in addresses if a != address]).start()
+        port = server.port
+        servers.append(server)
+    return servers
+
+
+def run(session, servers, slow, profile, statements, concurrency):
+    before = [s.requests for s in servers]
+    stats = GraphExecutionStats()
+    for _ in execute_graph_concurrent(session, statements, concurrency=concurrency, results_generator=True,
+                                      execution_profile=profile, stats=stats):
+        pass
+    served = [s.requests - b for s, b in zip(servers, before)]
+    return (profile,
+            '%.0f' % (stats.throughput,),
+            '%.2f' % (stats.latency_percentile(50) * 1000,),
+            '%.2f' % (stats.latency_percentile(99) * 1000,),
+            '%.1f%%' % (100.0 * sum(served[:slow]) / sum(served),))
+
+
+def main():
+    parser = OptionParser()
+    parser.add_option('--nodes', type='int', default=4, help='number of simulated nodes [default: %default]')
+    parser.add_option('--slow', type='int', default=1, help='number of slow nodes [default: %default]')
+    parser.add_option('--latency', type='float', default=5, help='latency of nodes (ms) [default: %default]')
+    parser.add_option('--slow-latency', type='float', default=50,
+                      help='latency of slow nodes (ms) [default: %default]')
+    parser.add_option('--requests', type='int', default=3000, help='requests per run [default: %default]')
+    parser.add_option('--concurrency', type='int', default=10, help='requests in flight [default: %default]')
+    parser.add_option('--scale', type='float', default=0.1, help='LatencyAwarePolicy scale (s) [default: %default]')
+    parser.add_option('--retry-period', type='float', default=10.0,
+                      help='LatencyAwarePolicy retry_period (s) [default: %default]')
+    options, _ = parser.parse_args()
+
+    servers = start_cluster(options.nodes, options.slow, options.latency / 1000.0, options.slow_latency / 1000.0)
+    profiles = {'round_robin': GraphExecutionProfile(load_balancing_policy=DCAwareRoundRobinPolicy()),
+                'latency_aware': GraphExecutionProfile(load_balancing_policy=LatencyAwarePolicy(
+                    DCAwareRoundRobinPolicy(), scale=options.scale, retry_period=options.retry_period))}
+    cluster = Cluster([servers[0].address], port=servers[0].port, protocol_version=4, execution_profiles=profiles)
+    session = cluster.connect()
+    try:
+        # peers are discovered by the control connection; wait for their pools
+        deadline = time.time() + 10
+        while len(session._pools) < options.nodes and time.time() < deadline:
+            time.sleep(0.01)
+
+        statements = [('[x]', {'x': i}) for i in range(options.requests)]
+        table = [run(session, servers, options.slow, name, statements, options.concurrency)
+                 for name in ('round_robin', 'latency_aware')]
+    finally:
+        cluster.shutdown()
+        for server in servers:
+            server.stop()
+
+    print("%d nodes, %d slow (%.1f ms vs %.1f ms), %d requests, concurrency %d\n" %
+          (options.nodes, options.slow, options.slow_latency, options.latency, options.requests, options.concurrency))
+    print_table(['profile', 'requests/s', 'p50 ms', 'p99 ms', 'slow nodes'], table)
+
+
+if __name__ == '__main__':
+    main()
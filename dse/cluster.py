@@ -6,20 +6,37 @@
 # You may obtain a copy of the License at
 #
 # http://www.datastax.com/terms/datastax-dse-driver-license-terms
+import copy
+from collections import namedtuple, OrderedDict
+try:
+    from collections.abc import Mapping
+except ImportError:  # Python 2
+    from collections import Mapping
 import json
 import logging
 import six
+from threading import Lock
+import time
+import weakref
 
-from cassandra import ConsistencyLevel, __version__ as core_driver_version
-from cassandra.cluster import Cluster, Session, default_lbp_factory, ExecutionProfile, _ConfigMode, _NOT_SET
+from cassandra import ConsistencyLevel, RequestValidationException, __version__ as core_driver_version
+from cassandra.cluster import (Cluster, Session, ResultSet, ControlConnection, default_lbp_factory, ExecutionProfile,
+                               _ConfigMode, _NOT_SET)
 from cassandra.marshal import int64_pack
-from cassandra.query import tuple_factory
+from cassandra.policies import HostStateListener, NoSpeculativeExecutionPlan
+from cassandra.query import tuple_factory, dict_factory
 from dse import _core_driver_target_version, _use_any_core_driver_version, __version__ as dse_driver_version
 import dse.cqltypes  # unsued here, imported to cause type registration
-from dse.graph import GraphOptions, SimpleGraphStatement, graph_object_row_factory, _request_timeout_key
-from dse.policies import DSELoadBalancingPolicy, NeverRetryPolicy
+from dse.graph import (GraphOptions, SimpleGraphStatement, GraphParameterEncoder, graph_object_row_factory,
+                       _request_timeout_key, _vertex_partition_key)
+from dse.policies import DSELoadBalancingPolicy, NeverRetryPolicy, LatencyAwarePolicy, _workloads
 from dse.query import HostTargetingStatement
-from dse.util import Point, LineString, Polygon
+from dse.util import Point, LineString, Polygon, _clock
+
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
 
 if six.PY3:
     long = int
@@ -51,6 +68,15 @@ use Spark/analytics as the traversal source.
 Selected using ``Session.execute_graph(execution_profile=EXEC_PROFILE_GRAPH_ANALYTICS_DEFAULT)``.
 """
 
+class GraphPage(namedtuple('GraphPage', ['rows', 'paging_state'])):
+    """
+    A page of graph results yielded by :meth:`.Session.execute_graph_pages`. ``rows`` is the list of decoded
+    results in the page; ``paging_state`` can be passed to ``Session.execute_graph*(paging_state)`` to resume after
+    this page, or is None if this is the last page.
+    """
+    __slots__ = ()
+
+
 class GraphExecutionProfile(ExecutionProfile):
     graph_options = None
     """
@@ -64,10 +90,36 @@ class GraphExecutionProfile(ExecutionProfile):
     See dse.graph.GraphOptions
     """
 
+    cache_results = False
+    """
+    If True, results of :meth:`.Session.execute_graph` with this profile are served from (and stored in)
+    :attr:`.Session.graph_result_cache`, when set. Only enable this for read-only queries.
+    """
+
+    coalesce_requests = False
+    """
+    If True, concurrent requests with this profile for the same query, parameters and options share a single request
+    to the cluster: while it is in flight, identical requests return the same ResponseFuture, and the decoded result
+    is shared by all callers. Only enable this for read-only queries returning a single page of results.
+    """
+
+    vertex_partition_keys = None
+    """
+    Partition keys of vertex labels with custom ids, used to route statements with a routing vertex id
+    (:meth:`.SimpleGraphStatement.set_routing_vertex_id`) to replicas of the vertex: a dict of vertex label to a
+    sequence of ``(property name, CQL type)``, in partition key order. For example::
+
+        {'sensor': (('sensor_id', UTF8Type), ('day', DateType))}
+
+    Vertices of other labels have standard ids, partitioned by ``community_id``
+    (:class:`cassandra.cqltypes.Int32Type`).
+    """
+
     def __init__(self, load_balancing_policy=None, retry_policy=None,
                  consistency_level=ConsistencyLevel.LOCAL_ONE, serial_consistency_level=None,
                  request_timeout=30.0, row_factory=graph_object_row_factory,
-                 graph_options=None):
+                 graph_options=None, cache_results=False, coalesce_requests=False,
+                 speculative_execution_policy=None, vertex_partition_keys=None):
         """
         Default execution profile for graph execution.
 
@@ -76,12 +128,39 @@ class GraphExecutionProfile(ExecutionProfile):
 
         In addition to default parameters shown in the signature, this profile also defaults ``retry_policy`` to
         :class:`dse.policies.NeverRetryPolicy`.
+
+        ``speculative_execution_policy`` applies to statements marked idempotent
+        (``SimpleGraphStatement(query, is_idempotent=True)``): after the delay set by the policy, another attempt is sent
+        to the next host in the query plan, and the first response received is used. Only read-only queries should be
+        marked idempotent. Extra attempts are counted as ``wasted_attempts`` in :attr:`.Session.graph_metrics`.
         """
         retry_policy = retry_policy or NeverRetryPolicy()
         super(GraphExecutionProfile, self).__init__(load_balancing_policy, retry_policy, consistency_level,
-                                                    serial_consistency_level, request_timeout, row_factory)
+                                                    serial_consistency_level, request_timeout, row_factory,
+                                                    speculative_execution_policy=speculative_execution_policy)
         self.graph_options = graph_options or GraphOptions(graph_source=b'g',
                                                            graph_language=b'gremlin-groovy')
+        self.cache_results = cache_results
+        self.coalesce_requests = coalesce_requests
+        self.vertex_partition_keys = vertex_partition_keys
+
+    def _vertex_routing_key(self, vertex_id, protocol_version):
+        return [cql_type.serialize(vertex_id[name], protocol_version)
+                for name, cql_type in _vertex_partition_key(vertex_id, self.vertex_partition_keys)]
+
+    _custom_payload_cache = None
+
+    def _get_custom_payload(self):
+        # the payload is built once and reused until graph_options (or its content) or request_timeout change;
+        # it is copied into each request message, never mutated
+        options = self.graph_options
+        request_timeout = self.request_timeout
+        cache = self._custom_payload_cache
+        if cache is None or cache[0] is not options or cache[1] != options._version or cache[2] != request_timeout:
+            custom_payload = options.get_options_map()
+            custom_payload[_request_timeout_key] = int64_pack(long(request_timeout * 1000))
+            cache = self._custom_payload_cache = (options, options._version, request_timeout, custom_payload)
+        return cache[3]
 
 
 class GraphAnalyticsExecutionProfile(GraphExecutionProfile):
@@ -97,7 +176,7 @@ class GraphAnalyticsExecutionProfile(GraphExecutionProfile):
 
         In addition to default parameters shown in the signature, this profile also defaults ``retry_policy`` to
         :class:`dse.policies.NeverRetryPolicy`, and ``load_balancing_policy`` to one that targets the current Spark
-        master.
+        master. Analytics queries are never executed speculatively.
         """
         load_balancing_policy = load_balancing_policy or DSELoadBalancingPolicy(default_lbp_factory())
         graph_options = graph_options or GraphOptions(graph_source=b'a',
@@ -106,6 +185,198 @@ class GraphAnalyticsExecutionProfile(GraphExecutionProfile):
                                                              serial_consistency_level, request_timeout, row_factory, graph_options)
 
 
+class GraphResultCache(object):
+    """
+    A least-recently-used cache of graph query results, for :attr:`.Session.graph_result_cache`.
+
+    Results are cached as received (before the row factory is applied), keyed by the query string, the parameters
+    and the graph options of the execution profile. Only single-page results are cached.
+    """
+
+    max_size = None
+    """
+    Upper bound, in bytes, on the size of the cached results (as the length of their JSON text). Least recently used
+    results are evicted to stay under this size.
+    """
+
+    ttl = None
+    """
+    Time, in seconds, after which a cached result expires
+    """
+
+    hits = 0
+    """
+    Number of lookups served from the cache
+    """
+
+    misses = 0
+    """
+    Number of lookups not found in the cache, or expired
+    """
+
+    size = 0
+    """
+    Current size of the cached results, in bytes
+    """
+
+    def __init__(self, max_size=64 * 1024 * 1024, ttl=60.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expiry time, size, value), least recently used first
+        self._lock = Lock()
+
+    def get(self, key):
+        """
+        Returns the value cached for ``key``, or None
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                if entry[0] > _clock():
+                    self._entries[key] = entry
+                    self.hits += 1
+                    return entry[2]
+                self.size -= entry[1]
+            self.misses += 1
+
+    def put(self, key, value, size):
+        """
+        Caches ``value`` for ``key``, evicting least recently used entries if needed
+        """
+        if size > self.max_size:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous[1]
+            self._entries[key] = (_clock() + self.ttl, size, value)
+            self.size += size
+            while self.size > self.max_size:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+
+    def clear(self):
+        """
+        Removes all cached results
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class _CachedResponse(object):
+    """
+    Takes the place of the ResponseFuture in ResultSets served from a GraphResultCache
+    """
+    has_more_pages = False
+    _paging_state = None
+    _col_types = None
+
+    def __init__(self, column_names):
+        self._col_names = column_names
+
+
+class GraphRequestTimings(object):
+    """
+    Timestamps (``time.time()``) of the phases of a graph request, set as ``graph_timings`` on the ResponseFuture
+    when :attr:`.Session.record_graph_timings` is enabled. Phases that did not happen (yet) are None. Only the
+    first page of a paged request is timed.
+    """
+
+    query = None
+    """
+    The :class:`.SimpleGraphStatement` executed
+    """
+
+    started = None
+    """
+    Request execution started
+    """
+
+    encoded = None
+    """
+    Parameters and payload encoded, and the request built
+    """
+
+    analytics_master_resolved = None
+    """
+    Analytics master located, for analytics queries routed to it (possibly from the session cache)
+    """
+
+    sent = None
+    """
+    Request handed to a connection
+    """
+
+    response_received = None
+    """
+    Response received, before the row factory is applied
+    """
+
+    decoded = None
+    """
+    Results decoded by the row factory
+    """
+
+    exception = None
+    """
+    The exception the request failed with, if any
+    """
+
+    def __init__(self, query):
+        self.query = query
+        self.started = time.time()
+
+    @property
+    def encode_time(self):
+        """
+        Seconds spent encoding parameters and building the request
+        """
+        return _elapsed(self.started, self.encoded)
+
+    @property
+    def analytics_master_lookup_time(self):
+        """
+        Seconds spent locating the analytics master
+        """
+        return _elapsed(self.encoded, self.analytics_master_resolved)
+
+    @property
+    def response_time(self):
+        """
+        Seconds between sending the request and receiving the response: network, queueing and server time
+        """
+        return _elapsed(self.sent, self.response_received)
+
+    @property
+    def decode_time(self):
+        """
+        Seconds spent in the row factory
+        """
+        return _elapsed(self.response_received, self.decoded)
+
+    @property
+    def total_time(self):
+        """
+        Seconds from execution to decoded results
+        """
+        return _elapsed(self.started, self.decoded)
+
+    def __repr__(self):
+        return '<%s: encode=%s, analytics_master_lookup=%s, response=%s, decode=%s, total=%s>' % (
+            self.__class__.__name__, self.encode_time, self.analytics_master_lookup_time, self.response_time,
+            self.decode_time, self.total_time)
+
+
+def _elapsed(start, end):
+    if start is None or end is None:
+        return None
+    return end - start
+
+
 class Cluster(Cluster):
     """
     Cluster extending `cassandra.cluster.Cluster <http://datastax.github.io/python-driver/api/cassandra/cluster.html#cassandra.cluster.Cluster>`_.
@@ -129,6 +400,13 @@ class Cluster(Cluster):
         self.profile_manager.profiles.setdefault(EXEC_PROFILE_GRAPH_ANALYTICS_DEFAULT, GraphAnalyticsExecutionProfile(load_balancing_policy=lbp))
         self._config_mode = _ConfigMode.PROFILES
 
+        # also reads the DSE workloads of hosts, for WorkloadAwarePolicy
+        self.control_connection = _ControlConnection(
+            self, self.control_connection_timeout,
+            self.schema_event_refresh_window, self.topology_event_refresh_window,
+            self.status_event_refresh_window,
+            self.schema_metadata_enabled, self.token_metadata_enabled)
+
     def _new_session(self, keyspace):
         session = Session(self, self.metadata.all_hosts(), keyspace)
         self._session_register_user_types(session)
@@ -154,67 +432,375 @@ class Session(Session):
         - Graph execution API
     """
 
+    graph_parameter_encoder = None
+    """
+    :class:`.GraphParameterEncoder` used to encode graph query parameters. Handlers for additional types may be
+    registered on it.
+    """
+
+    analytics_master_cache_ttl = 60.0
+    """
+    Time, in seconds, for which the location of the analytics (Spark) master is reused to route analytics graph
+    queries, before it is queried again. The location is also refreshed when hosts go up, down, or are added or
+    removed, and when a query routed to it fails. Set to 0 or None to query the master before every analytics query.
+    """
+
+    graph_result_cache = None
+    """
+    A :class:`.GraphResultCache` serving :meth:`.execute_graph` results for execution profiles with
+    :attr:`~.GraphExecutionProfile.cache_results` enabled. None (the default) disables caching.
+    """
+
+    graph_metrics = None
+    """
+    A :class:`.GraphMetrics` collecting latencies, errors and requests in flight for graph requests
+    (results served from :attr:`.graph_result_cache` are not included). None (the default) disables metrics.
+    """
+
+    record_graph_timings = False
+    """
+    Whether to time the phases of graph requests, as a :class:`.GraphRequestTimings` set as ``graph_timings`` on
+    the ResponseFutures returned by :meth:`.execute_graph_async` (None when disabled).
+    """
+
+    graph_timings_callback = None
+    """
+    A function called with the :class:`.GraphRequestTimings` of each completed graph request (including failed
+    ones), when :attr:`.record_graph_timings` is enabled. It is called from the event loop thread, and should return
+    quickly; it can be used to log slow requests::
+
+        def log_slow(timings):
+            if (timings.total_time or 0) > 1.0:
+                log.warning("Slow graph query %s: %r", timings.query, timings)
+
+        session.graph_timings_callback = log_slow
+        session.record_graph_timings = True
+    """
+
+    _analytics_master = None  # (address, expiry time)
+    _analytics_master_listener = None
+
     def __init__(self, cluster, hosts, keyspace):
 
         super(Session, self).__init__(cluster, hosts, keyspace)
 
+        self.graph_parameter_encoder = GraphParameterEncoder()
+
+        self._graph_in_flight = {}  # coalesced requests
+        self._graph_in_flight_lock = Lock()
+
+        self._analytics_master_listener = _AnalyticsMasterListener(self)
+        cluster.register_listener(self._analytics_master_listener)
+
         def cql_encode_str_quoted(val):
             return "'%s'" % val
 
         for typ in (Point, LineString, Polygon):
             self.encoder.mapping[typ] = cql_encode_str_quoted
 
-    def execute_graph(self, query, parameters=None, trace=False, execution_profile=EXEC_PROFILE_GRAPH_DEFAULT):
+    def shutdown(self):
+        if self._analytics_master_listener:
+            try:
+                self.cluster.unregister_listener(self._analytics_master_listener)
+            except KeyError:
+                pass
+        super(Session, self).shutdown()
+
+    def execute_graph(self, query, parameters=None, trace=False, execution_profile=EXEC_PROFILE_GRAPH_DEFAULT,
+                      paging_state=None):
         """
         Executes a Gremlin query string or SimpleGraphStatement synchronously,
         and returns a ResultSet from this execution.
 
         `parameters` is dict of named parameters to bind. The values must be
-        JSON-serializable.
+        JSON-serializable, or of a type handled by :attr:`.graph_parameter_encoder`.
+        Parameters may also be passed pre-encoded, as the ``bytes`` returned by
+        ``session.graph_parameter_encoder.encode(parameters)``.
 
         `execution_profile`: Selects an execution profile for the request.
+
+        `paging_state`: Resumes a paged query from the paging state of a previous page (see :class:`.GraphPage`).
+        Page size is set with ``SimpleGraphStatement(fetch_size)``.
+
+        Results may be served from :attr:`.graph_result_cache`, if the execution profile enables it; the ResultSet
+        then has no actual ``response_future``.
         """
-        return self.execute_graph_async(query, parameters, trace, execution_profile).result()
+        profile = self._get_execution_profile(execution_profile)
+        cache_key = self._graph_cache_key(query, parameters, trace, profile, paging_state)
+        if cache_key is not None:
+            cached = self.graph_result_cache.get(cache_key)
+            if cached is not None:
+                column_names, rows = cached
+                return ResultSet(_CachedResponse(column_names), profile.row_factory(column_names, rows))
+        return self._execute_graph_async(query, parameters, trace, execution_profile, paging_state,
+                                         cache_key).result()
 
-    def execute_graph_async(self, query, parameters=None, trace=False, execution_profile=EXEC_PROFILE_GRAPH_DEFAULT):
+    def execute_graph_async(self, query, parameters=None, trace=False, execution_profile=EXEC_PROFILE_GRAPH_DEFAULT,
+                            paging_state=None):
         """
         Execute the graph query and return a `ResponseFuture <http://datastax.github.io/python-driver/api/cassandra/cluster.html#cassandra.cluster.ResponseFuture.result>`_
         object which callbacks may be attached to for asynchronous response delivery. You may also call ``ResponseFuture.result()`` to synchronously block for
         results at any time.
         """
+        return self._execute_graph_async(query, parameters, trace, execution_profile, paging_state)
+
+    def _execute_graph_async(self, query, parameters, trace, execution_profile, paging_state, cache_key=_NOT_SET):
+        profile_key = execution_profile
+        execution_profile = self._get_execution_profile(execution_profile)  # look up instance here so we can apply the extended attributes
+        if cache_key is _NOT_SET:
+            cache_key = self._graph_cache_key(query, parameters, trace, execution_profile, paging_state)
+
+        metrics = self.graph_metrics
+        if metrics is not None:
+            stats, request = metrics._start_request(profile_key, execution_profile.graph_options.graph_name)
+
+        try:
+            if getattr(execution_profile, 'coalesce_requests', False) and not trace and not paging_state:
+                future, created = self._execute_coalesced_graph(query, parameters, execution_profile, cache_key)
+            else:
+                future = self._create_graph_response_future(query, parameters, trace, execution_profile, paging_state)
+                if cache_key is not None:
+                    self._cache_graph_result(future, cache_key)
+                self._send_graph_request(future, execution_profile)
+                created = True
+        except Exception as exc:
+            if metrics is not None:  # invalid requests (parameters, profile) are errors, no longer in flight
+                stats.on_error(exc, request, None)
+            raise
+
+        if metrics is not None:
+            # attempts are counted by the caller that sent the request
+            args = (request, future if created else None)
+            future.add_callbacks(callback=stats.on_success, callback_args=args,
+                                 errback=stats.on_error, errback_args=args)
+        return future
+
+    def _execute_coalesced_graph(self, query, parameters, execution_profile, cache_key):
+        request_key = cache_key or self._graph_request_key(query, parameters, execution_profile)
+        if request_key is None:
+            future = self._create_graph_response_future(query, parameters, False, execution_profile, None)
+            self._send_graph_request(future, execution_profile)
+            return future, True
+
+        # requests sharing a future are sent with the same profile: same options, row factory, policies...
+        key = (execution_profile, request_key)
+        with self._graph_in_flight_lock:
+            future = self._graph_in_flight.get(key)
+            if future is not None:
+                return future, False
+            future = self._create_graph_response_future(query, parameters, False, execution_profile, None)
+            self._graph_in_flight[key] = future
+
+        # each waiter gets its own ResultSet over the result, which must not be a one-shot generator
+        future.row_factory = _materializing_row_factory(future.row_factory)
+        if cache_key is not None:
+            self._cache_graph_result(future, cache_key)
+        args = (key, future)
+        future.add_callbacks(callback=self._on_coalesced_graph_result, callback_args=args,
+                             errback=self._on_coalesced_graph_result, errback_args=args)
+        self._send_graph_request(future, execution_profile)
+        return future, True
+
+    def _on_coalesced_graph_result(self, result, key, future):
+        with self._graph_in_flight_lock:
+            if self._graph_in_flight.get(key) is future:
+                del self._graph_in_flight[key]
+
+    def _create_graph_response_future(self, query, parameters, trace, execution_profile, paging_state):
         if not isinstance(query, SimpleGraphStatement):
             query = SimpleGraphStatement(query)
+        timings = GraphRequestTimings(query) if self.record_graph_timings else None
 
         graph_parameters = None
         if parameters:
             graph_parameters = self._transform_params(parameters)
 
-        execution_profile = self._get_execution_profile(execution_profile)  # look up instance here so we can apply the extended attributes
-
         try:
-            options = execution_profile.graph_options.copy()
+            custom_payload = execution_profile._get_custom_payload()
         except AttributeError:
             raise ValueError("Execution profile for graph queries must derive from GraphExecutionProfile, and provide graph_options")
 
-        custom_payload = options.get_options_map()
-        custom_payload[_request_timeout_key] = int64_pack(long(execution_profile.request_timeout * 1000))
+        if query._routing_vertex_id is not None:
+            query = self._routed_graph_statement(query, execution_profile)
+
         future = self._create_response_future(query, parameters=None, trace=trace, custom_payload=custom_payload,
-                                              timeout=_NOT_SET, execution_profile=execution_profile)
+                                              timeout=_NOT_SET, execution_profile=execution_profile,
+                                              paging_state=paging_state)
         future.message._query_params = graph_parameters
         future._protocol_handler = self.client_protocol_handler
+        if not isinstance(future._spec_execution_plan, NoSpeculativeExecutionPlan):
+            _use_first_response(future)
+        latency_aware_policy = _latency_aware_policy(execution_profile.load_balancing_policy)
+        if latency_aware_policy:
+            _track_latencies(future, latency_aware_policy)
+        future.graph_timings = timings
+        if timings:
+            timings.encoded = time.time()
+            self._time_graph_request(future, timings)
+        return future
+
+    def _routed_graph_statement(self, query, execution_profile):
+        # routing is set on a copy for this request, so the statement is left as the user set it
+        try:
+            routing_key = execution_profile._vertex_routing_key(query._routing_vertex_id, self.cluster.protocol_version)
+        except Exception:
+            log.debug("Failed computing the routing key of vertex id %r (request might not be routed optimally). "
+                      "Make sure the execution profile vertex_partition_keys match the graph schema.",
+                      query._routing_vertex_id, exc_info=True)
+            return query
+        routed = copy.copy(query)
+        routed.routing_key = routing_key
+        # vertices are stored in the keyspace named after the graph
+        graph_name = execution_profile.graph_options.graph_name
+        if graph_name:
+            routed.keyspace = graph_name.decode('utf-8') if isinstance(graph_name, six.binary_type) else graph_name
+        return routed
 
-        if options.is_analytics_source and isinstance(execution_profile.load_balancing_policy, DSELoadBalancingPolicy):
+    def _send_graph_request(self, future, execution_profile):
+        if execution_profile.graph_options.is_analytics_source and \
+                isinstance(execution_profile.load_balancing_policy, DSELoadBalancingPolicy):
             self._target_analytics_master(future)
         else:
-            future.send_request()
-        return future
+            _send_request(future)
+
+    def _time_graph_request(self, future, timings):
+        # the row factory is applied as the response is received, before callbacks
+        row_factory = future.row_factory
+
+        def timing_row_factory(column_names, rows):
+            future.row_factory = row_factory  # only the first page is timed
+            timings.response_received = time.time()
+            result = row_factory(column_names, rows)
+            timings.decoded = time.time()
+            return result
+        future.row_factory = timing_row_factory
+
+        # callbacks are kept for all pages
+        reported = []
+
+        def on_done(result_or_exc, error):
+            if not reported:
+                reported.append(True)
+                if error:
+                    timings.exception = result_or_exc
+                callback = self.graph_timings_callback
+                if callback:
+                    try:
+                        callback(timings)
+                    except Exception:
+                        log.exception("Failed calling graph timings callback %r", callback)
+        future.add_callbacks(callback=on_done, callback_args=(False,), errback=on_done, errback_args=(True,))
+
+    def execute_graph_pages(self, query, parameters=None, trace=False, execution_profile=EXEC_PROFILE_GRAPH_DEFAULT,
+                            paging_state=None):
+        """
+        Executes the graph query and returns a generator of :class:`.GraphPage`, fetching each page only when the
+        previous one has been consumed. Only one page of results is held at a time, so large traversals can be
+        streamed with bounded memory, provided the server pages graph results.
+
+        Page size is set with ``SimpleGraphStatement(fetch_size)``. Each page carries the paging state needed to
+        resume after it: passing it as ``paging_state`` (with the same query and parameters) continues an
+        interrupted iteration, even from another process::
+
+            statement = SimpleGraphStatement('g.V()', fetch_size=1000)
+            for page in session.execute_graph_pages(statement, paging_state=saved_state):
+                export(page.rows)
+                saved_state = page.paging_state  # persist to resume after a restart
+        """
+        future = self.execute_graph_async(query, parameters, trace, execution_profile, paging_state)
+        while True:
+            rows = list(future.result().current_rows)
+            yield GraphPage(rows, future._paging_state)
+            if not future.has_more_pages:
+                break
+            future.start_fetching_next_page()
+
+    def execute_graph_aio(self, query, parameters=None, trace=False, execution_profile=EXEC_PROFILE_GRAPH_DEFAULT,
+                          paging_state=None):
+        """
+        Executes the graph query from an asyncio event loop, and returns an ``asyncio.Future`` for the ResultSet::
+
+            result_set = await session.execute_graph_aio('g.V().limit(10)')
+
+        The future is resolved on the running event loop (through ``call_soon_threadsafe``), without blocking a
+        thread on the result. Client-side timeouts are set by the execution profile ``request_timeout``, or with
+        ``asyncio.wait_for``.
+
+        Cancelling the future only discards the result: the request is not aborted on the server.
+
+        Only the first page is fetched; use :meth:`.execute_graph_aio_pages` to iterate over more pages without
+        blocking the event loop.
+        """
+        loop = asyncio.get_event_loop()
+        aio_future = loop.create_future()
+        response_future = self.execute_graph_async(query, parameters, trace, execution_profile, paging_state)
+        response_future.add_callbacks(callback=_on_aio_result, callback_args=(loop, aio_future, response_future, False),
+                                      errback=_on_aio_error, errback_args=(loop, aio_future))
+        return aio_future
+
+    def execute_graph_aio_pages(self, query, parameters=None, trace=False, execution_profile=EXEC_PROFILE_GRAPH_DEFAULT,
+                                paging_state=None):
+        """
+        Like :meth:`.execute_graph_pages`, but returns an asynchronous iterator of :class:`.GraphPage` for use from an
+        asyncio event loop::
+
+            async for page in session.execute_graph_aio_pages(statement):
+                process(page.rows)
+
+        Each page is requested when the iterator is advanced.
+        """
+        return _AsyncGraphPages(self, (query, parameters, trace, execution_profile, paging_state))
+
+    def _graph_cache_key(self, query, parameters, trace, execution_profile, paging_state):
+        # None if the result is not to be cached
+        if self.graph_result_cache is None or not getattr(execution_profile, 'cache_results', False) \
+                or trace or paging_state:
+            return None
+        return self._graph_request_key(query, parameters, execution_profile)
+
+    def _graph_request_key(self, query, parameters, execution_profile):
+        if isinstance(parameters, six.binary_type):
+            parameters_key = parameters
+        elif parameters:
+            try:
+                parameters_key = json.dumps(parameters, sort_keys=True, separators=(',', ':'),
+                                            default=self.graph_parameter_encoder.default)
+            except (TypeError, ValueError):
+                # keys that cannot be sorted (mixed types), or parameters that cannot be encoded: the request is
+                # neither cached nor coalesced
+                return None
+        else:
+            parameters_key = None
+        query_string = query.query_string if isinstance(query, SimpleGraphStatement) else query
+        return query_string, parameters_key, tuple(sorted(six.iteritems(execution_profile._get_custom_payload())))
+
+    def _cache_graph_result(self, future, cache_key):
+        cache = self.graph_result_cache
+        row_factory = future.row_factory
+
+        def caching_row_factory(column_names, rows):
+            future.row_factory = row_factory  # only the first page is cached, and only if there are no others
+            if future._paging_state is None:
+                cache.put(cache_key, (column_names, rows), sum(len(row[0]) for row in rows if row))
+            return row_factory(column_names, rows)
+        future.row_factory = caching_row_factory
 
     def _transform_params(self, parameters):
+        if isinstance(parameters, six.binary_type):
+            return [parameters]  # pre-encoded with GraphParameterEncoder.encode
         if not isinstance(parameters, dict):
             raise ValueError('The parameters must be a dictionary. Unnamed parameters are not allowed.')
-        return [json.dumps(parameters).encode('utf-8')]
+        return [self.graph_parameter_encoder.encode(parameters)]
 
     def _target_analytics_master(self, future):
+        # analytics queries run on the master only; another attempt would not be routed to it
+        future._spec_execution_plan = _no_speculative_execution_plan
+        master = self._analytics_master
+        if master and master[1] > _clock():
+            self._route_to_analytics_master(future, master[0])
+            _send_request(future)
+            return
+
         future._start_timer()
         master_query_future = self._create_response_future("CALL DseClientTool.getAnalyticsGraphServer()",
                                                            parameters=None, trace=False,
@@ -233,10 +819,248 @@ class Session(Session):
             delimiter_index = addr.rfind(':')  # assumes <ip>:<port> - not robust, but that's what is being provided
             if delimiter_index > 0:
                 addr = addr[:delimiter_index]
-            targeted_query = HostTargetingStatement(query_future.query, addr)
-            query_future.query_plan = self._load_balancer.make_query_plan(self.keyspace, targeted_query)
+            if self.analytics_master_cache_ttl:
+                self._analytics_master = (addr, _clock() + self.analytics_master_cache_ttl)
+            self._route_to_analytics_master(query_future, addr)
         except Exception:
             log.debug("Failed querying analytics master (request might not be routed optimally). "
                       "Make sure the session is connecting to a graph analytics datacenter.", exc_info=True)
 
-        self.submit(query_future.send_request)
+        self.submit(_send_request, query_future)
+
+    def _route_to_analytics_master(self, future, addr):
+        timings = getattr(future, 'graph_timings', None)
+        if timings:
+            timings.analytics_master_resolved = time.time()
+        targeted_query = HostTargetingStatement(future.query, addr)
+        future.query_plan = future._load_balancer.make_query_plan(self.keyspace, targeted_query)
+        future.add_errback(self._on_analytics_query_error, addr)
+
+    def _on_analytics_query_error(self, exc, addr):
+        # the master may have moved, unless the query itself was rejected
+        if not isinstance(exc, RequestValidationException):
+            self._invalidate_analytics_master(addr)
+
+    def _invalidate_analytics_master(self, addr=None):
+        master = self._analytics_master
+        if master and (addr is None or master[0] == addr):
+            self._analytics_master = None
+
+
+class _ControlConnection(ControlConnection):
+    """
+    Sets ``Host.dse_workloads`` from the system tables queried to refresh the node list, including the columns the
+    core driver does not read (``graph`` in DSE 5.0, ``workloads`` in DSE 5.1+)
+    """
+
+    def _refresh_node_list_and_token_map(self, connection, preloaded_results=None, force_token_rebuild=False):
+        if not preloaded_results:
+            # the core driver queries the system tables; their results are recorded on the way
+            connection = _RecordingConnection(connection)
+        super(_ControlConnection, self)._refresh_node_list_and_token_map(connection, preloaded_results,
+                                                                         force_token_rebuild)
+        results = preloaded_results or connection.responses
+        if not results:
+            return
+
+        peers_result, local_result = results
+        metadata = self._cluster.metadata
+        rows = [(self._rpc_from_peer_row(row), row) for row in dict_factory(*peers_result.results)]
+        if local_result.results:
+            rows.append((connection.host, dict_factory(*local_result.results)[0]))
+        for addr, row in rows:
+            host = metadata.get_host(addr)
+            if host is not None:
+                host.dse_workloads = _workloads(row.get('workload'), row.get('graph'), row.get('workloads'))
+
+
+class _RecordingConnection(object):
+    """
+    Proxies a connection, recording the last responses it waited for
+    """
+
+    responses = None
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def wait_for_responses(self, *msgs, **kwargs):
+        self.responses = self._connection.wait_for_responses(*msgs, **kwargs)
+        return self.responses
+
+
+class _AnalyticsMasterListener(HostStateListener):
+    """
+    Invalidates the analytics master location cached by a session on topology changes
+    """
+
+    def __init__(self, session):
+        self._session = weakref.ref(session)  # the cluster holds its listeners; sessions must still be collectable
+
+    def _invalidate(self, host):
+        session = self._session()
+        if session:
+            session._invalidate_analytics_master()
+
+    on_up = on_down = on_add = on_remove = _invalidate
+
+
+_no_speculative_execution_plan = NoSpeculativeExecutionPlan()
+
+
+class _PageProtocolHandler(object):
+    """
+    Protocol handler of the requests for one page of a future: responses it decodes are tagged with it
+    """
+
+    def __init__(self, protocol_handler):
+        self.encode_message = protocol_handler.encode_message
+        self._decode_message = protocol_handler.decode_message
+
+    def decode_message(self, *args, **kwargs):
+        response = self._decode_message(*args, **kwargs)
+        response._page_handler = self
+        return response
+
+
+def _use_first_response(future):
+    # With speculative execution, the core driver handles each response received, calling callbacks again for late
+    # ones. Responses received after the result are discarded instead, including those requested for a previous page
+    # once the next page is being fetched.
+    set_result = future._set_result
+    start_fetching_next_page = future.start_fetching_next_page
+    protocol_handler = future._protocol_handler
+    future._protocol_handler = _PageProtocolHandler(protocol_handler)
+
+    def set_first_result(host, connection, pool, response):
+        if future._event.is_set() or \
+                getattr(response, '_page_handler', future._protocol_handler) is not future._protocol_handler:
+            if pool:
+                pool.return_connection(connection)
+            return
+        set_result(host, connection, pool, response)
+
+    def fetch_next_page():
+        future._protocol_handler = _PageProtocolHandler(protocol_handler)
+        start_fetching_next_page()
+
+    future._set_result = set_first_result
+    future.start_fetching_next_page = fetch_next_page
+
+
+def _latency_aware_policy(policy):
+    # the policy itself, or a policy it wraps
+    while policy is not None:
+        if isinstance(policy, LatencyAwarePolicy):
+            return policy
+        policy = getattr(policy, '_child_policy', None)
+
+
+def _track_latencies(future, policy):
+    # Each attempt is timed, up to the response from its host, including late responses to speculative executions.
+    # Hosts that did not respond when the request fails (timeouts) are recorded with the time waited.
+    sent = {}
+    query = future._query
+    set_result = future._set_result
+
+    def timed_query(host, *args, **kwargs):
+        sent[host] = _clock()
+        req_id = query(host, *args, **kwargs)
+        if req_id is None:  # not sent
+            sent.pop(host, None)
+        return req_id
+
+    def timed_set_result(host, connection, pool, response):
+        start = sent.pop(host, None)
+        if start is not None:
+            policy.record_latency(host, _clock() - start)
+        set_result(host, connection, pool, response)
+
+    def record_unanswered(exc):
+        now = _clock()
+        for host in list(sent):
+            start = sent.pop(host, None)
+            if start is not None:
+                policy.record_latency(host, now - start)
+
+    future._query = timed_query
+    future._set_result = timed_set_result
+    future.add_errback(record_unanswered)
+
+
+def _send_request(future):
+    timings = getattr(future, 'graph_timings', None)
+    if timings:
+        timings.sent = time.time()
+    future.send_request()
+
+
+def _materializing_row_factory(row_factory):
+    def materializing_row_factory(column_names, rows):
+        result = row_factory(column_names, rows)
+        return result if isinstance(result, (list, Mapping)) else list(result)
+    return materializing_row_factory
+
+
+def _set_aio_result(aio_future, result):
+    if not aio_future.done():  # cancelled
+        aio_future.set_result(result)
+
+
+def _set_aio_exception(aio_future, exc):
+    if not aio_future.done():
+        aio_future.set_exception(exc)
+
+
+def _on_aio_result(rows, loop, aio_future, response_future, as_page):
+    if as_page:
+        result = GraphPage(list(ResultSet(response_future, rows).current_rows), response_future._paging_state)
+    else:
+        result = ResultSet(response_future, rows)
+    loop.call_soon_threadsafe(_set_aio_result, aio_future, result)
+
+
+def _on_aio_error(exc, loop, aio_future):
+    loop.call_soon_threadsafe(_set_aio_exception, aio_future, exc)
+
+
+class _AsyncGraphPages(object):
+    """
+    Asynchronous iterator of GraphPage, returned by Session.execute_graph_aio_pages
+    """
+
+    def __init__(self, session, execute_args):
+        self._session = session
+        self._execute_args = execute_args
+        self._response_future = None
+        self._loop = None
+        self._aio_future = None
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        loop = asyncio.get_event_loop()
+        aio_future = loop.create_future()
+        response_future = self._response_future
+        if response_future is None:
+            self._loop, self._aio_future = loop, aio_future
+            response_future = self._response_future = self._session.execute_graph_async(*self._execute_args)
+            # callbacks stay registered and are called again for each page, completing the future of the current
+            # page; those of the session (metrics, latency tracking...) are never cleared
+            response_future.add_callbacks(callback=self._on_page, errback=self._on_error)
+        elif response_future.has_more_pages:
+            self._loop, self._aio_future = loop, aio_future
+            response_future.start_fetching_next_page()
+        else:
+            aio_future.set_exception(StopAsyncIteration())
+        return aio_future
+
+    def _on_page(self, rows):
+        _on_aio_result(rows, self._loop, self._aio_future, self._response_future, True)
+
+    def _on_error(self, exc):
+        _on_aio_error(exc, self._loop, self._aio_future)
@@ -0,0 +1,260 @@
+# Copyright 2016 DataStax, Inc.
+#
+# Licensed under the DataStax DSE Driver License;
+# you may not use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+# http://www.datastax.com/terms/datastax-dse-driver-license-terms
+from collections import deque
+import logging
+import six
+import sys
+from threading import Lock
+import time
+
+from cassandra.concurrent import ExecutionResult, ConcurrentExecutorGenResults, ConcurrentExecutorListResults
+
+from dse.cluster import EXEC_PROFILE_GRAPH_DEFAULT
+from dse.metrics import LatencyHistogram
+from dse.util import _clock
+
+log = logging.getLogger(__name__)
+
+
+def execute_graph_concurrent(session, statements_and_parameters, concurrency=100, raise_on_first_error=True,
+                             results_generator=False, ordered=True, execution_profile=EXEC_PROFILE_GRAPH_DEFAULT,
+                             stats=None):
+    """
+    Executes a sequence of (graph statement, parameters) tuples concurrently through
+    :meth:`.Session.execute_graph_async`, keeping ``concurrency`` requests in flight. This is the graph counterpart of
+    `cassandra.concurrent.execute_concurrent <http://datastax.github.io/python-driver/api/cassandra/concurrent.html#cassandra.concurrent.execute_concurrent>`_.
+    Each ``parameters`` item must be a dict, or None.
+
+    If `raise_on_first_error` is left as :const:`True`, execution will stop
+    after the first failed statement and the corresponding exception will be
+    raised.
+
+    `results_generator` controls how the results are returned.
+
+        If :const:`False`, a list of results is returned after all requests have completed.
+
+        If :const:`True`, a generator is returned, yielding results as they become available (with a constrained
+        memory footprint when there are many statements).
+
+    `ordered` controls the order of the results.
+
+        If :const:`True`, results are in the same order as the statements passed in, as
+        ``ExecutionResult(success, result_or_exc)`` namedtuples.
+
+        If :const:`False`, results are yielded as requests complete, as ``(index, ExecutionResult)`` tuples where
+        ``index`` is the position of the statement in ``statements_and_parameters``. This implies
+        ``results_generator``.
+
+    If ``success`` is :const:`False`, there was an error executing the statement, and ``result_or_exc`` will be an
+    :class:`Exception`. If ``success`` is :const:`True`, ``result_or_exc`` will be the ResultSet.
+
+    `execution_profile` is used for all statements.
+
+    `stats` may be a :class:`.GraphExecutionStats`, which is updated with throughput and latency for the run. A
+    summary is then also logged at debug level when all requests have completed. Requests are only timed when
+    `stats` is given.
+
+    Example usage::
+
+        stats = GraphExecutionStats()
+        results = execute_graph_concurrent(session, [('g.V(id)', {'id': vid}) for vid in vertex_ids],
+                                           concurrency=50, raise_on_first_error=False, stats=stats)
+        for success, result in results:
+            ...
+        print(stats.throughput, stats.latency_percentile(99))
+    """
+    if concurrency <= 0:
+        raise ValueError("concurrency must be greater than 0")
+
+    if not statements_and_parameters:
+        return []
+
+    if not ordered:
+        executor_class = _ConcurrentGraphExecutorUnorderedResults
+    elif results_generator:
+        executor_class = _ConcurrentGraphExecutorGenResults
+    else:
+        executor_class = _ConcurrentGraphExecutorListResults
+    executor = executor_class(session, statements_and_parameters, execution_profile, stats)
+    return executor.execute(concurrency, raise_on_first_error)
+
+
+class GraphExecutionStats(object):
+    """
+    Throughput and latency of a :func:`.execute_graph_concurrent` run.
+
+    Latencies are measured from submission of each request to its completion, in seconds, and kept in a
+    :class:`.LatencyHistogram` (constant space, percentiles within about 3%).
+    """
+
+    requests = 0
+    """
+    Number of requests completed
+    """
+
+    errors = 0
+    """
+    Number of requests that failed
+    """
+
+    start_time = None
+    """
+    Time at which the first request was submitted
+    """
+
+    end_time = None
+    """
+    Time at which the last request completed
+    """
+
+    def __init__(self):
+        self._latency = LatencyHistogram()
+        self._lock = Lock()
+
+    def _start(self):
+        self.start_time = time.time()
+
+    def _record(self, latency, success):
+        with self._lock:
+            self._latency.record(latency)
+            self.requests += 1
+            if not success:
+                self.errors += 1
+            self.end_time = time.time()
+
+    @property
+    def elapsed(self):
+        """
+        Seconds between the first request and the last completion
+        """
+        if self.start_time is None or self.end_time is None:
+            return 0.0
+        return self.end_time - self.start_time
+
+    @property
+    def throughput(self):
+        """
+        Completed requests per second
+        """
+        elapsed = self.elapsed
+        return self.requests / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def mean_latency(self):
+        """
+        Mean request latency
+        """
+        return self._latency.mean
+
+    def latency_percentile(self, percentile):
+        """
+        Returns the request latency at ``percentile`` (0-100)
+        """
+        return self._latency.percentile(percentile)
+
+    def __str__(self):
+        return ("%d requests (%d errors) in %.3fs: %.1f requests/s, latency mean %.2fms, p50 %.2fms, p99 %.2fms" %
+                (self.requests, self.errors, self.elapsed, self.throughput, self.mean_latency * 1000,
+                 self.latency_percentile(50) * 1000, self.latency_percentile(99) * 1000))
+
+
+class _GraphExecutor(object):
+    # Executes graph statements in the core concurrent executors, timing requests when stats are collected
+
+    def __init__(self, session, statements_and_params, execution_profile, stats):
+        super(_GraphExecutor, self).__init__(session, statements_and_params)
+        self._execution_profile = execution_profile
+        self._stats = stats
+
+    def execute(self, concurrency, fail_fast):
+        if self._stats is not None:
+            self._stats._start()
+        return super(_GraphExecutor, self).execute(concurrency, fail_fast)
+
+    def _execute(self, idx, statement, params):
+        self._exec_depth += 1
+        start = _clock()
+        try:
+            future = self.session.execute_graph_async(statement, params, execution_profile=self._execution_profile)
+            args = (future, idx, start)
+            future.add_callbacks(
+                callback=self._on_success, callback_args=args,
+                errback=self._on_error, errback_args=args)
+        except Exception as exc:
+            # exc_info with fail_fast to preserve stack trace info when raising on the client thread
+            e = sys.exc_info() if self._fail_fast and six.PY2 else exc
+            self._record(start, False)
+
+            # see cassandra.concurrent: avoid recursing when all executions are raising
+            if self._exec_depth < self.max_error_recursion:
+                self._put_result(e, idx, False)
+            else:
+                self.session.submit(self._put_result, e, idx, False)
+        self._exec_depth -= 1
+
+    def _on_success(self, result, future, idx, start):
+        self._record(start, True)
+        super(_GraphExecutor, self)._on_success(result, future, idx)
+
+    def _on_error(self, result, future, idx, start):
+        self._record(start, False)
+        super(_GraphExecutor, self)._on_error(result, future, idx)
+
+    def _record(self, start, success):
+        if self._stats is not None:
+            self._stats._record(_clock() - start, success)
+
+    def _log_stats(self):
+        if self._stats is not None:
+            log.debug("Concurrent graph execution: %s", self._stats)
+
+
+class _ConcurrentGraphExecutorGenResults(_GraphExecutor, ConcurrentExecutorGenResults):
+
+    def _results(self):
+        for result in super(_ConcurrentGraphExecutorGenResults, self)._results():
+            yield result
+        self._log_stats()
+
+
+class _ConcurrentGraphExecutorUnorderedResults(_ConcurrentGraphExecutorGenResults):
+
+    def __init__(self, *args):
+        super(_ConcurrentGraphExecutorUnorderedResults, self).__init__(*args)
+        self._completed = deque()
+
+    def _put_result(self, result, idx, success):
+        with self._condition:
+            self._completed.append((idx, ExecutionResult(success, result)))
+            self._execute_next()
+            self._condition.notify()
+
+    def _results(self):
+        with self._condition:
+            while self._current < self._exec_count:
+                while not self._completed:
+                    self._condition.wait()
+                res = self._completed.popleft()
+                self._current += 1
+                try:
+                    self._condition.release()
+                    if self._fail_fast and not res[1][0]:
+                        self._raise(res[1][1])
+                    yield res
+                finally:
+                    self._condition.acquire()
+        self._log_stats()
+
+
+class _ConcurrentGraphExecutorListResults(_GraphExecutor, ConcurrentExecutorListResults):
+
+    def _results(self):
+        results = super(_ConcurrentGraphExecutorListResults, self)._results()
+        self._log_stats()
+        return results
@@ -7,10 +7,28 @@
 #
 # http://www.datastax.com/terms/datastax-dse-driver-license-terms
 from cassandra import ConsistencyLevel
+from cassandra.cqltypes import Int32Type
 from cassandra.query import SimpleStatement
 
+try:
+    from collections.abc import Mapping
+except ImportError:  # Python 2
+    from collections import Mapping
+import datetime
+from decimal import Decimal
+from functools import partial, total_ordering
 import json
+from operator import itemgetter
 import six
+from six.moves import builtins
+import uuid
+
+from dse.util import Point, LineString, Polygon
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # (attr, description, server option)
 _graph_options = (
@@ -26,6 +44,9 @@ Setting this overrides the native `Statement.consistency_level <http://datastax.
 # this is defined by the execution profile attribute, not in graph options
 _request_timeout_key = 'request-timeout'
 
+# standard vertex ids are partitioned by community
+_standard_vertex_partition_key = (('community_id', Int32Type),)
+
 
 class GraphOptions(object):
     """
@@ -35,6 +56,7 @@ class GraphOptions(object):
 
     def __init__(self, **kwargs):
         self._graph_options = {}
+        self._version = 0
         kwargs.setdefault('graph_source', 'g')
         kwargs.setdefault('graph_language', 'gremlin-groovy')
         for attr, value in six.iteritems(kwargs):
@@ -47,6 +69,7 @@ class GraphOptions(object):
 
     def update(self, options):
         self._graph_options.update(options._graph_options)
+        self._version += 1
 
     def get_options_map(self, other_options=None):
         """
@@ -114,9 +137,11 @@ for opt in _graph_options:
             self._graph_options[key] = value
         else:
             self._graph_options.pop(key, None)
+        self._version += 1
 
     def delete(self, key=opt[2]):
         self._graph_options.pop(key, None)
+        self._version += 1
 
     setattr(GraphOptions, opt[0], property(get, set, delete, opt[1]))
 
@@ -126,9 +151,207 @@ class SimpleGraphStatement(SimpleStatement):
     Simple graph statement for :meth:`.Session.execute_graph`.
     Takes the same parameters as `cassandra.query.SimpleStatement <http://datastax.github.io/python-driver/api/cassandra/query.html#cassandra.query.SimpleStatement>`_
     """
+    _routing_vertex_id = None
+
     def __init__(self, *args, **kwargs):
         super(SimpleGraphStatement, self).__init__(*args, **kwargs)
 
+    def set_routing_vertex_id(self, vertex_id):
+        """
+        Sets the id of the vertex this statement looks up or modifies, such as ``vertex.id``, or a dict of the vertex
+        label and partition key properties (``{'~label': 'person', 'community_id': 1368843392}``).
+
+        When executed, a routing key is computed from the vertex id, using the partition keys set in
+        :attr:`.GraphExecutionProfile.vertex_partition_keys`, and the request is routed with it in the keyspace named
+        after the graph. A token-aware load balancing policy (the default) then sends the request to replicas of the
+        vertex first. Routing is set for each request: the ``routing_key`` and ``keyspace`` of the statement are not
+        modified.
+
+        Pass None to stop routing the statement.
+        """
+        self._routing_vertex_id = vertex_id
+
+
+def _stdlib_json_dumps(obj, default=None):
+    return json.dumps(obj, default=default).encode('utf-8')
+
+
+def _json_loads_with_fallback(loads):
+    def _loads(s):
+        try:
+            return loads(s)
+        except ValueError:
+            # anything the backend rejects (NaN, integers wider than 64 bits, ...) is decoded by the stdlib,
+            # so results (and errors) are the same regardless of the backend in use
+            return json.loads(s)
+    return _loads
+
+
+def _json_dumps_with_fallback(dumps):
+    def _dumps(obj, default=None):
+        try:
+            return dumps(obj, default)
+        except (TypeError, ValueError, OverflowError):
+            return _stdlib_json_dumps(obj, default)
+    return _dumps
+
+
+def _orjson_codec():
+    import orjson
+    # orjson silently encodes NaN/Infinity as null, which is not what the stdlib does; it is only used for decoding
+    return orjson.loads, None
+
+
+def _ujson_codec():
+    import ujson
+    # ujson encodes some types itself (Decimal as a float, objects with toDict or __json__) before consulting the
+    # default function, so its output differs from the stdlib's; it is only used for decoding
+    return ujson.loads, None
+
+
+def _rapidjson_codec():
+    import rapidjson
+    return rapidjson.loads, lambda obj, default: rapidjson.dumps(obj, default=default).encode('utf-8')
+
+
+# (name, loader) in order of preference
+_json_codec_preference = (
+    ('orjson', _orjson_codec),
+    ('ujson', _ujson_codec),
+    ('rapidjson', _rapidjson_codec)
+)
+
+_json_codecs = {'json': (json.loads, _stdlib_json_dumps)}
+
+_json_loads = json.loads
+_json_dumps = _stdlib_json_dumps
+_json_codec_names = ['json', 'json']  # [decoder, encoder]
+
+
+def register_json_codec(name, loads=None, dumps=None):
+    """
+    Registers a JSON backend under ``name``, for use with :func:`.set_json_codec`.
+
+    ``loads`` takes a JSON text and returns the decoded object. ``dumps`` takes an object and a ``default`` function
+    (as in :func:`json.dumps`) and returns the encoded ``bytes``; it must call ``default`` for all values that are not
+    of a JSON type, including ``Decimal``, so that :class:`.GraphParameterEncoder` handlers apply. Either may be None
+    if the backend should only be used in one direction.
+
+    Objects or text rejected by the backend are handed to the standard library ``json`` module, so the outcome is
+    always that of the standard library.
+    """
+    _json_codecs[name] = (_json_loads_with_fallback(loads) if loads else None,
+                          _json_dumps_with_fallback(dumps) if dumps else None)
+
+
+def set_json_codec(decoder=None, encoder=None):
+    """
+    Selects the registered JSON backends used to decode graph results (``decoder``) and encode graph parameters
+    (``encoder``). Names not specified are left unchanged.
+
+    By default, the fastest backend installed is selected at import time, in order of preference: ``orjson`` and
+    ``ujson`` (decoding only), ``rapidjson``, and the standard library ``json``.
+    """
+    global _json_loads, _json_dumps
+    for i, name in ((0, decoder), (1, encoder)):
+        if name is None:
+            continue
+        try:
+            func = _json_codecs[name][i]
+        except KeyError:
+            raise ValueError("Unknown JSON codec %r; registered codecs are %s" % (name, sorted(_json_codecs)))
+        if func is None:
+            raise ValueError("JSON codec %r cannot be used for %s" % (name, 'decoding' if i == 0 else 'encoding'))
+        if i == 0:
+            _json_loads = func
+        else:
+            _json_dumps = func
+        _json_codec_names[i] = name
+
+
+def get_json_codec():
+    """
+    Returns the names of the JSON (decoder, encoder) currently in use.
+    """
+    return tuple(_json_codec_names)
+
+
+def _select_json_codecs():
+    for name, codec in _json_codec_preference:
+        try:
+            register_json_codec(name, *codec())
+        except ImportError:
+            pass
+    names = [n for n, _ in _json_codec_preference if n in _json_codecs] + ['json']
+    set_json_codec(decoder=next(n for n in names if _json_codecs[n][0]),
+                   encoder=next(n for n in names if _json_codecs[n][1]))
+
+_select_json_codecs()
+
+
+def _isoformat(value):
+    return value.isoformat()
+
+
+class GraphParameterEncoder(object):
+    """
+    Encodes graph parameters to JSON with the selected JSON backend (see :func:`.set_json_codec`), converting values
+    of types JSON does not support with registered handlers. By default:
+
+        - ``Point``, ``LineString`` and ``Polygon`` are encoded as WKT strings
+        - ``UUID`` as strings
+        - ``datetime``, ``date`` and ``time`` as ISO 8601 strings
+        - ``Decimal`` as strings, keeping their precision
+        - ``set`` and ``frozenset`` as lists
+
+    Handlers also apply to subclasses of registered types. The handler for each value type is resolved once, and
+    cached.
+
+    The encoder used by a session is :attr:`.Session.graph_parameter_encoder`.
+    """
+
+    def __init__(self):
+        self._handlers = {}
+        self._dispatch = {}
+        for cls in (Point, LineString, Polygon, uuid.UUID):
+            self.register(cls, str)
+        for cls in (datetime.datetime, datetime.date, datetime.time):
+            self.register(cls, _isoformat)
+        self.register(Decimal, str)
+        self.register(builtins.set, list)  # the name set is rebound by the GraphOptions property loop
+        self.register(frozenset, list)
+        self.register(VertexId, dict)
+
+    def register(self, cls, handler):
+        """
+        Registers ``handler``, a function converting an instance of ``cls`` to a JSON-serializable value.
+
+        Handlers are consulted for all values that are not of a JSON type (``dict``, ``list``, ``tuple``, ``str``,
+        numbers other than ``Decimal``, ``bool`` and None), whatever the JSON backend.
+        """
+        self._handlers[cls] = handler
+        self._dispatch = {}
+
+    def encode(self, parameters):
+        """
+        Returns the JSON-encoded ``bytes`` for ``parameters``. The result may be passed in place of the parameters
+        dict to :meth:`.Session.execute_graph`, to skip encoding for parameters used repeatedly.
+        """
+        return _json_dumps(parameters, self.default)
+
+    def default(self, value):
+        """
+        Converts a value not natively supported by the JSON backend, or raises TypeError.
+        """
+        cls = type(value)
+        try:
+            handler = self._dispatch[cls]
+        except KeyError:
+            handler = self._dispatch[cls] = next((self._handlers[c] for c in cls.__mro__ if c in self._handlers), None)
+        if handler is None:
+            raise TypeError("%r is not JSON serializable; register a handler with GraphParameterEncoder.register" % (value,))
+        return handler(value)
+
 
 def single_object_row_factory(column_names, rows):
     """
@@ -142,7 +365,7 @@ def graph_result_row_factory(column_names, rows):
     Returns a :class:`dse.graph.Result` object that can load graph results and produce specific types.
     The Result JSON is deserialized and unpacked from the top-level 'result' dict.
     """
-    return [Result(json.loads(row[0])['result']) for row in rows]
+    return [Result(_json_loads(row[0])['result']) for row in rows]
 
 
 def graph_object_row_factory(column_names, rows):
@@ -151,18 +374,198 @@ def graph_object_row_factory(column_names, rows):
     converted to their simplified objects. Some low-level metadata is shed in this conversion. Unknown result types are
     still returned as :class:`dse.graph.Result`.
     """
-    return _graph_object_sequence(json.loads(row[0])['result'] for row in rows)
+    return _graph_object_sequence((_json_loads(row[0])['result'] for row in rows), {})
+
+
+def graph_lazy_result_row_factory(column_names, rows):
+    """
+    Like :func:`~.graph_result_row_factory`, except results are returned as :class:`dse.graph.LazyResult`, which keep
+    the raw row text and only decode it on first access. This is useful when only some of the results are inspected,
+    or when they are just counted.
+    """
+    return [LazyResult(row[0]) for row in rows]
+
+
+def graph_columnar_row_factory(schema, fill_values=None):
+    """
+    Returns a row factory that decodes each page of graph element results (vertices or edges) into NumPy arrays,
+    without creating :class:`.Vertex` or :class:`.Edge` objects.
+
+    ``schema`` is a ``dict`` (or sequence of pairs) mapping property names to the NumPy dtype of their column. A page is
+    returned as a ``dict`` of column name to array: ``'id'`` and ``'label'`` are object arrays, and each property in the
+    schema has an array of its declared dtype. Other properties are ignored. For multi-valued vertex properties,
+    the first value is used.
+
+    Elements missing a property get the corresponding value from ``fill_values`` (a ``dict`` of property name to
+    value), or by default ``nan`` for float columns, ``None`` for object columns, an empty string for string columns,
+    and zero otherwise.
+
+    Each page is a single row of the result set; use ``ResultSet.current_rows[0]``, or iterate to get successive
+    pages. Requires NumPy.
+
+    Example::
+
+        ep = GraphExecutionProfile(row_factory=graph_columnar_row_factory({'age': 'i4', 'score': 'f8'}))
+        columns = session.execute_graph('g.V().hasLabel("person")', execution_profile=ep).current_rows[0]
+        columns['score'].mean()
+    """
+    if np is None:
+        raise ImportError("graph_columnar_row_factory requires NumPy")
+
+    fill_values = fill_values or {}
+    columns = []
+    for name, dtype in dict(schema).items():
+        dtype = np.dtype(dtype)
+        columns.append((name, dtype, fill_values.get(name, _default_fill_value(dtype))))
+
+    def columnar_row_factory(column_names, rows):
+        results = [_json_loads(row[0])['result'] for row in rows]
+        count = len(results)
+        ids = np.empty(count, dtype=object)
+        labels = np.empty(count, dtype=object)
+        properties = []
+        interned = {}
+        for i, result in enumerate(results):
+            ids[i] = _vertex_id(result['id'], interned) if result.get('type') == 'vertex' else result['id']
+            labels[i] = result['label']
+            properties.append(result.get('properties') or {})
+
+        page = {'id': ids, 'label': labels}
+        for name, dtype, fill in columns:
+            values = (_property_value(p.get(name), fill) for p in properties)
+            if dtype.kind in 'OSU':
+                page[name] = np.array(list(values), dtype=dtype)
+            else:
+                page[name] = np.fromiter(values, dtype, count)
+        return page
+
+    return columnar_row_factory
+
+
+def _default_fill_value(dtype):
+    kind = dtype.kind
+    if kind in 'fc':
+        return float('nan')
+    if kind == 'O':
+        return None
+    if kind in 'SU':
+        return ''
+    return 0
+
+
+def _property_value(prop, fill):
+    if prop is None:
+        return fill
+    if isinstance(prop, list):
+        # vertex properties are always encoded as a list of {'value': ...}
+        return prop[0]['value'] if prop else fill
+    return prop
+
+
+def graph_element_row_factory(column_names, rows):
+    """
+    Like :func:`~.graph_object_row_factory`, except that elements are converted wherever they appear in a result,
+    including inside lists, maps and paths (which :func:`~.graph_object_row_factory` leaves as dicts). Unknown result
+    types are still returned as :class:`dse.graph.Result`.
+
+    Results are decoded by the decoder selected with :func:`.set_json_codec`. With the standard library ``json``, they
+    are decoded in a single pass, :class:`~.Vertex` and :class:`~.Edge` objects being built as the JSON is parsed;
+    other decoders have no such hook, and elements are built from the decoded dicts, which is still faster with
+    ``orjson``.
+    """
+    ids = {}  # vertex ids interned in the page
+    if _json_codec_names[0] != 'json':
+        # backends have no object hook: results are decoded by the selected one, then elements are built from the dicts
+        return [_element_or_result(_build_elements(_json_loads(row[0])['result'], ids)) for row in rows]
+    decode = json.JSONDecoder(object_hook=partial(_element_object_hook, ids=ids)).decode
+    return [_element_or_result(decode(row[0])['result']) for row in rows]
 
 
-def _graph_object_sequence(objects):
+def graph_projection_row_factory(fields):
+    """
+    Returns a row factory like :func:`~.graph_object_row_factory`, except that only the named ``fields`` are
+    materialized, which saves time and memory when results are wide but only a few fields are needed.
+
+    For :class:`~.Vertex` and :class:`~.Edge` results, ``fields`` selects the properties to extract; other properties
+    are skipped (element ids, labels and edge endpoints are always kept). For other map results, ``fields`` selects
+    the top-level keys of the :class:`dse.graph.Result`. Any other result is returned unchanged.
+
+    Example::
+
+        ep = GraphExecutionProfile(row_factory=graph_projection_row_factory(('name', 'age')))
+    """
+    fields = tuple(fields)
+
+    def projection_row_factory(column_names, rows):
+        ids = {}
+        return [_project(_json_loads(row[0])['result'], fields, ids) for row in rows]
+
+    return projection_row_factory
+
+
+def _project(o, fields, ids):
+    if not isinstance(o, dict):
+        return Result(o)
+    typ = o.get('type')
+    if typ == 'vertex' or typ == 'edge':
+        properties = o.get('properties') or {}
+        res = Result(dict(o, properties=dict((f, properties[f]) for f in fields if f in properties)))
+        return res._as_vertex(ids) if typ == 'vertex' else res._as_edge(ids)
+    return Result(dict((f, o[f]) for f in fields if f in o))
+
+
+def _element_object_hook(o, ids):
+    # called for every JSON object, innermost first; most of them (ids, vertex property entries) have no type
+    if 'type' not in o:
+        return o
+    typ = o['type']
+    if typ == 'vertex':
+        try:
+            return Vertex(_vertex_id(o['id'], ids), o['label'], typ, o.get('properties', {}))
+        except (KeyError, TypeError, AttributeError):
+            pass
+    elif typ == 'edge':
+        try:
+            return Edge(o['id'], o['label'], typ, o.get('properties', {}),
+                        _vertex_id(o['inV'], ids), o['inVLabel'], _vertex_id(o['outV'], ids), o['outVLabel'])
+        except (KeyError, TypeError, AttributeError):
+            pass
+    return o
+
+
+def _build_elements(o, ids):
+    # calls _element_object_hook on dicts, innermost first, as the standard library decoder does; the content of
+    # elements (ids, properties) holds no elements, and is not walked
+    if isinstance(o, dict):
+        if o.get('type') in ('vertex', 'edge'):
+            return _element_object_hook(o, ids)
+        for key, value in six.iteritems(o):
+            if isinstance(value, (dict, list)):
+                o[key] = _build_elements(value, ids)
+        return _element_object_hook(o, ids)
+    if isinstance(o, list):
+        for i, value in enumerate(o):
+            if isinstance(value, (dict, list)):
+                o[i] = _build_elements(value, ids)
+    return o
+
+
+def _element_or_result(o):
+    return o if isinstance(o, Element) else Result(o)
+
+
+def _graph_object_sequence(objects, ids):
     for o in objects:
+        if isinstance(o, Element):
+            yield o
+            continue
         res = Result(o)
         if isinstance(o, dict):
             typ = res.value.get('type')
             if typ == 'vertex':
-                res = res.as_vertex()
+                res = res._as_vertex(ids)
             elif typ == 'edge':
-                res = res.as_edge()
+                res = res._as_edge(ids)
         yield res
 
 
@@ -212,8 +615,11 @@ class Result(object):
 
         Raises TypeError if parsing fails (i.e. the result structure is not valid).
         """
+        return self._as_vertex(None)
+
+    def _as_vertex(self, ids):
         try:
-            return Vertex(self.id, self.label, self.type, self.value.get('properties', {}))
+            return Vertex(_vertex_id(self.id, ids), self.label, self.type, self.value.get('properties', {}))
         except (AttributeError, ValueError, TypeError):
             raise TypeError("Could not create Vertex from %r" % (self,))
 
@@ -223,9 +629,12 @@ class Result(object):
 
         Raises TypeError if parsing fails (i.e. the result structure is not valid).
         """
+        return self._as_edge(None)
+
+    def _as_edge(self, ids):
         try:
             return Edge(self.id, self.label, self.type, self.value.get('properties', {}),
-                        self.inV, self.inVLabel, self.outV, self.outVLabel)
+                        _vertex_id(self.inV, ids), self.inVLabel, _vertex_id(self.outV, ids), self.outVLabel)
         except (AttributeError, ValueError, TypeError):
             raise TypeError("Could not create Edge from %r" % (self,))
 
@@ -241,8 +650,153 @@ class Result(object):
             raise TypeError("Could not create Path from %r" % (self,))
 
 
+_NOT_DECODED = object()
+
+
+class LazyResult(Result):
+    """
+    A :class:`.Result` created from the raw JSON text of a graph result row. The text is decoded, and unpacked from the
+    top-level 'result' dict, on first access to :attr:`~.Result.value` (directly, or through any of the accessors).
+    """
+
+    def __init__(self, row):
+        self._row = row
+        self._value = _NOT_DECODED
+
+    @property
+    def value(self):
+        """
+        Deserialized value from the result, decoded on first access
+        """
+        if self._value is _NOT_DECODED:
+            self._value = _json_loads(self._row)['result']
+            self._row = None
+        return self._value
+
+    @property
+    def is_decoded(self):
+        """
+        True if the result text has been decoded
+        """
+        return self._value is not _NOT_DECODED
+
+
+@total_ordering
+class VertexId(Mapping):
+    """
+    An immutable vertex id, as found in :attr:`.Vertex.id` and in :attr:`.Edge.inV` and :attr:`.Edge.outV`.
+
+    DSE Graph vertex ids are maps of the vertex label (``'~label'``) and the key properties of the vertex
+    (``community_id`` and ``member_id`` for standard ids). A VertexId is a read-only ``Mapping`` of the same items,
+    equal to the ``dict`` it was created from, and, unlike the ``dict``, hashable and ordered, so that ids can be
+    used as ``dict`` keys or in sets, for instance to join edges to vertices.
+
+    Row factories intern ids within each page of results: equal ids decoded in a page are the same object.
+
+    VertexIds are encoded as maps when passed as graph parameters.
+    """
+
+    # keys are shared by all ids with the same key properties; only the values are stored per id
+    __slots__ = ('_keys', '_values', '_hash')
+
+    def __init__(self, id):
+        try:
+            keys, values = _vertex_id_layouts[tuple(id)]
+        except KeyError:
+            keys, values = _vertex_id_layout(id)
+        self._keys = keys
+        self._values = values(id)
+        self._hash = None
+
+    @property
+    def label(self):
+        """
+        The vertex label, or None if the id does not include it
+        """
+        return self.get('~label')
+
+    def partition_key(self, vertex_partition_keys=None):
+        """
+        Returns the tuple of partition key values of the vertex: ``(community_id,)`` for standard ids, or the
+        values of the properties declared for the vertex label in ``vertex_partition_keys`` (see
+        :attr:`.GraphExecutionProfile.vertex_partition_keys`).
+
+        Raises KeyError if the id is missing a partition key property.
+        """
+        return tuple(self[name] for name, _ in _vertex_partition_key(self, vertex_partition_keys))
+
+    def __getitem__(self, key):
+        try:
+            return self._values[self._keys.index(key)]
+        except ValueError:
+            raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(self._values)
+        return self._hash
+
+    def __eq__(self, other):
+        if isinstance(other, VertexId):
+            return self._keys == other._keys and self._values == other._values
+        return Mapping.__eq__(self, other)
+
+    def __ne__(self, other):
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
+
+    def __lt__(self, other):
+        if not isinstance(other, VertexId):
+            return NotImplemented
+        return (self._keys, self._values) < (other._keys, other._values)
+
+    def __reduce__(self):
+        return VertexId, (dict(self.items()),)
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, dict(self.items()))
+
+_vertex_id_layouts = {}
+
+
+def _vertex_id_layout(id):
+    # sorted keys, and a function getting the values in that order, cached by key order (which is the same for all
+    # ids of a label, as decoded)
+    keys = tuple(sorted(id))
+    values = itemgetter(*keys) if len(keys) > 1 else lambda id: tuple([id[k] for k in keys])
+    return _vertex_id_layouts.setdefault(tuple(id), (keys, values))
+
+
+def _vertex_id(value, ids=None):
+    # ids are decoded as dicts; ``ids`` interns them within a page of results
+    if type(value) is dict:
+        id = VertexId(value)
+        try:
+            hash(id)
+        except TypeError:  # ids with unhashable values (lists...) are kept as decoded
+            return value
+        if ids is not None:
+            id = ids.setdefault(id, id)
+        return id
+    return value
+
+
+def _vertex_partition_key(vertex_id, vertex_partition_keys):
+    if vertex_partition_keys:
+        return vertex_partition_keys.get(vertex_id['~label'], _standard_vertex_partition_key)
+    return _standard_vertex_partition_key
+
+
 class Element(object):
 
+    __slots__ = ('id', 'label', 'type', 'properties')
+
     element_type = None
 
     _attrs = ('id', 'label', 'type', 'properties')
@@ -274,10 +828,17 @@ class Vertex(Element):
     Vertex ``properties`` are extracted into a ``dict`` of property names to list of :class:`~VertexProperty` (list
     because they are always encoded that way, and sometimes have multiple cardinality; VertexProperty because sometimes
     the properties themselves have property maps).
+
+    DSE Graph vertex ids are maps, returned as :class:`.VertexId`.
     """
 
+    __slots__ = ()
+
     element_type = 'vertex'
 
+    def __init__(self, id, label, type, properties):
+        super(Vertex, self).__init__(_vertex_id(id), label, type, properties)
+
     @staticmethod
     def _extract_properties(properties):
         # vertex properties are always encoded as a list, regardless of Cardinality
@@ -294,17 +855,11 @@ class Vertex(Element):
 class VertexProperty(object):
     """
     Vertex properties have a top-level value and an optional ``dict`` of properties.
-    """
 
-    value = None
-    """
-    Value of the property
+    ``value`` is the value of the property; ``properties`` is the ``dict`` of properties attached to the property.
     """
 
-    properties = None
-    """
-    dict of properties attached to the property
-    """
+    __slots__ = ('value', 'properties')
 
     def __init__(self, value, properties=None):
         self.value = value
@@ -321,9 +876,11 @@ class Edge(Element):
     """
     Represents an Edge element from a graph query.
 
-    Attributes match initializer parameters.
+    Attributes match initializer parameters. ``inV`` and ``outV`` are :class:`.VertexId` for DSE Graph vertex ids.
     """
 
+    __slots__ = ('inV', 'inVLabel', 'outV', 'outVLabel')
+
     element_type = 'edge'
 
     _attrs = Element._attrs + ('inV', 'inVLabel', 'outV', 'outVLabel')
@@ -331,9 +888,9 @@ class Edge(Element):
     def __init__(self, id, label, type, properties,
                  inV, inVLabel, outV, outVLabel):
         super(Edge, self).__init__(id, label, type, properties)
-        self.inV = inV
+        self.inV = _vertex_id(inV)
         self.inVLabel = inVLabel
-        self.outV = outV
+        self.outV = _vertex_id(outV)
         self.outVLabel = outVLabel
 
     def __repr__(self):
@@ -352,21 +909,15 @@ class Path(object):
     Labels list is taken verbatim from the results.
 
     Objects are either :class:`~.Result` or :class:`~.Vertex`/:class:`~.Edge` for recognized types
-    """
 
-    labels = None
-    """
-    List of labels in the path
+    ``labels`` is the list of labels in the path; ``objects`` is the list of objects in the path.
     """
 
-    objects = None
-    """
-    List of objects in the path
-    """
+    __slots__ = ('labels', 'objects')
 
     def __init__(self, labels, objects):
         self.labels = labels
-        self.objects = list(_graph_object_sequence(objects))
+        self.objects = list(_graph_object_sequence(objects, {}))
 
     def __eq__(self, other):
         return self.labels == other.labels and self.objects == other.objects
@@ -0,0 +1,255 @@
+# Copyright 2016 DataStax, Inc.
+#
+# Licensed under the DataStax DSE Driver License;
+# you may not use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+# http://www.datastax.com/terms/datastax-dse-driver-license-terms
+from collections import Counter, deque
+import itertools
+from operator import rshift
+import six
+import struct
+from threading import Lock
+
+from cassandra import OperationTimedOut, Timeout
+from cassandra.cluster import ExecutionProfile
+
+from dse.cluster import EXEC_PROFILE_GRAPH_DEFAULT, EXEC_PROFILE_GRAPH_SYSTEM_DEFAULT, EXEC_PROFILE_GRAPH_ANALYTICS_DEFAULT
+from dse.util import _clock
+
+# Log-linear buckets, 2 ** _PRECISION_BITS per power of two (a relative error under 2 ** -_PRECISION_BITS), from 2 ** -20
+# seconds (about a microsecond) to 2 ** 12 seconds (68 minutes); smaller and larger latencies are counted in the first and
+# last buckets. The bucket of a latency is read from the bits of its IEEE 754 representation, in which the exponent is
+# followed by the mantissa: shifting out all but the top _PRECISION_BITS mantissa bits gives a key that grows by one
+# from a bucket to the next (negative latencies get negative keys).
+_PRECISION_BITS = 5
+_KEY_SHIFT = 52 - _PRECISION_BITS
+
+
+def _bucket_keys(latencies):
+    count = len(latencies)
+    return map(rshift, struct.unpack('<%dq' % count, struct.pack('<%dd' % count, *latencies)), itertools.repeat(_KEY_SHIFT))
+
+
+def _bucket_bound(key):
+    return struct.unpack('<d', struct.pack('<q', key << _KEY_SHIFT))[0]
+
+_first_key, = _bucket_keys([2.0 ** -20])
+_last_key, = _bucket_keys([2.0 ** 12])
+_bucket_lower_bounds = [_bucket_bound(key) for key in range(_first_key, _last_key + 1)]
+_bucket_values = [(low + high) / 2 for low, high in zip(_bucket_lower_bounds, _bucket_lower_bounds[1:])] + \
+                 [_bucket_lower_bounds[-1]]
+
+
+_default_profile_names = {
+    EXEC_PROFILE_GRAPH_DEFAULT: 'graph_default',
+    EXEC_PROFILE_GRAPH_SYSTEM_DEFAULT: 'graph_system_default',
+    EXEC_PROFILE_GRAPH_ANALYTICS_DEFAULT: 'graph_analytics_default'
+}
+
+
+def _profile_name(profile_key):
+    try:
+        return _default_profile_names[profile_key]
+    except KeyError:
+        if isinstance(profile_key, ExecutionProfile):  # distinct instances of a class are distinct profiles
+            return '%s@%x' % (type(profile_key).__name__, id(profile_key))
+        return str(profile_key)
+
+
+def _text(graph_name):
+    # graph options hold names encoded
+    return graph_name.decode('utf-8') if isinstance(graph_name, six.binary_type) else graph_name
+
+
+class LatencyHistogram(object):
+    """
+    A latency histogram with HDR-style log-linear buckets, recording latencies from a microsecond to hours
+    with a relative precision of about 3%, in constant space.
+    """
+
+    count = 0
+    """
+    Number of latencies recorded
+    """
+
+    def __init__(self):
+        self._counts = [0] * len(_bucket_lower_bounds)
+        self._sum = 0.0
+        self._min = None
+        self._max = 0.0
+
+    def record(self, latency):
+        """
+        Records a latency, in seconds
+        """
+        self._record_all([latency])
+
+    def _record_all(self, latencies):
+        # bucket keys are computed and counted without a Python loop over the latencies
+        counts = self._counts
+        last = len(counts) - 1
+        for key, count in six.iteritems(Counter(_bucket_keys(latencies))):
+            counts[min(max(key - _first_key, 0), last)] += count
+        self.count += len(latencies)
+        self._sum += sum(latencies)
+        low = max(min(latencies), 0.0)
+        if self._min is None or low < self._min:
+            self._min = low
+        self._max = max(self._max, max(latencies))
+
+    @property
+    def mean(self):
+        """
+        Mean latency (seconds), or 0 if nothing was recorded
+        """
+        return self._sum / self.count if self.count else 0.0
+
+    def percentile(self, percentile):
+        """
+        Returns the latency (seconds) at ``percentile`` (0-100), or 0 if nothing was recorded
+        """
+        if not self.count:
+            return 0.0
+        if percentile <= 0:
+            return self._min
+        if percentile >= 100:
+            return self._max
+        target = self.count * percentile / 100.0
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if count and seen >= target:
+                return min(max(_bucket_values[index], self._min), self._max)
+        return self._max
+
+    def summary(self):
+        """
+        Returns a dict of latency statistics, in seconds: min, mean, max, and the 50th, 75th, 95th, 99th and 99.9th
+        percentiles
+        """
+        if not self.count:
+            return dict((k, 0.0) for k in ('min', 'mean', 'max', 'p50', 'p75', 'p95', 'p99', 'p999'))
+        return {'min': self._min,
+                'mean': self.mean,
+                'max': self._max,
+                'p50': self.percentile(50),
+                'p75': self.percentile(75),
+                'p95': self.percentile(95),
+                'p99': self.percentile(99),
+                'p999': self.percentile(99.9)}
+
+
+class _GraphRequestStats(object):
+
+    # Completed requests are queued, and recorded in the histogram in batches: deque.append and next(itertools.count)
+    # are atomic, so the request path takes no lock.
+    _batch_size = 1024
+
+    def __init__(self):
+        self.lock = Lock()
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.timeouts = 0
+        self.wasted_attempts = 0
+        self._completed = deque()
+        self._started = itertools.count()
+        self._snapshots = 0
+
+    def start(self):
+        next(self._started)
+        return [_clock()]  # emptied once the request has been recorded
+
+    def on_success(self, result, request, future):
+        if request:  # callbacks are called again for each page; only the first completion is recorded
+            self._completed.append(_clock() - request.pop())
+            if future is not None and len(future.attempted_hosts) > 1:
+                self._record_wasted_attempts(future)
+            if len(self._completed) >= self._batch_size:
+                self._record_completed()
+
+    def on_error(self, exc, request, future):
+        if request:
+            self._completed.append(_clock() - request.pop())
+            with self.lock:
+                self.errors += 1
+                if isinstance(exc, (OperationTimedOut, Timeout)):
+                    self.timeouts += 1
+            if future is not None and len(future.attempted_hosts) > 1:
+                self._record_wasted_attempts(future)
+            if len(self._completed) >= self._batch_size:
+                self._record_completed()
+
+    def _record_wasted_attempts(self, future):
+        # one response is used; other attempts (speculative executions, retries) were wasted
+        with self.lock:
+            self.wasted_attempts += len(future.attempted_hosts) - 1
+
+    def _record_completed(self):
+        with self.lock:
+            completed = self._completed
+            batch = [completed.popleft() for _ in range(len(completed))]
+            if batch:
+                self.latency._record_all(batch)
+
+    def snapshot(self):
+        self._record_completed()
+        with self.lock:
+            # a count can only be read by taking its next value: values taken by snapshots are not requests
+            started = next(self._started) - self._snapshots
+            self._snapshots += 1
+            return {'requests': self.latency.count,
+                    'errors': self.errors,
+                    'timeouts': self.timeouts,
+                    'wasted_attempts': self.wasted_attempts,
+                    'in_flight': max(started - self.latency.count - len(self._completed), 0),
+                    'latency': self.latency.summary()}
+
+
+class GraphMetrics(object):
+    """
+    Collects metrics for graph requests executed by a :class:`.Session` (see :attr:`.Session.graph_metrics`),
+    separately for each execution profile and graph name:
+
+        - a :class:`.LatencyHistogram` of request latencies, from execution to completion
+        - counts of completed requests, errors, and timeouts (client and server side)
+        - the number of wasted attempts: attempts sent for a request besides the one whose response was used
+          (speculative executions, see :class:`.GraphExecutionProfile`)
+        - the number of requests in flight
+
+    Execution profiles are named by their key in the cluster (``'graph_default'``, ``'graph_system_default'`` and
+    ``'graph_analytics_default'`` for the default graph profiles). Profiles passed as instances are named by their class
+    and id, such as ``'GraphExecutionProfile@7f0c2a4b5d10'``.
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = Lock()
+
+    def _start_request(self, profile_key, graph_name):
+        # stats are keyed by the profile as passed to execute_graph, and named on snapshot
+        try:
+            stats = self._stats[(profile_key, graph_name)]
+        except KeyError:
+            with self._lock:
+                stats = self._stats.setdefault((profile_key, graph_name), _GraphRequestStats())
+        return stats, stats.start()
+
+    def snapshot(self):
+        """
+        Returns a dict of metrics, keyed by ``(profile name, graph name)``. Each value is a dict with ``requests``,
+        ``errors``, ``timeouts``, ``wasted_attempts``, ``in_flight``, and ``latency`` (see :meth:`.LatencyHistogram.summary`).
+        """
+        with self._lock:
+            stats = list(self._stats.items())
+        return dict(((_profile_name(profile_key), _text(graph_name)), s.snapshot())
+                    for (profile_key, graph_name), s in stats)
+
+    def reset(self):
+        """
+        Discards all metrics. Requests in flight are not recorded when they complete.
+        """
+        with self._lock:
+            self._stats = {}
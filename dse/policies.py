@@ -6,8 +6,14 @@
 # You may obtain a copy of the License at
 #
 # http://www.datastax.com/terms/datastax-dse-driver-license-terms
+import math
+import six
+from threading import Lock
+
 from cassandra.policies import LoadBalancingPolicy, RetryPolicy
 
+from dse.util import _clock
+
 
 class WrapperPolicy(LoadBalancingPolicy):
 
@@ -66,6 +72,223 @@ class DSELoadBalancingPolicy(WrapperPolicy):
                 yield h
 
 
+class _HostLatency(object):
+
+    __slots__ = ('average', 'count', 'timestamp')
+
+    def __init__(self, latency, timestamp):
+        self.average = latency
+        self.count = 1
+        self.timestamp = timestamp
+
+    def add(self, latency, timestamp, scale):
+        # the weight of the previous average decreases with the time elapsed since it was updated
+        delay = timestamp - self.timestamp
+        if delay > 0:
+            scaled_delay = delay / scale
+            previous_weight = math.log(scaled_delay + 1) / scaled_delay
+            self.average = (1 - previous_weight) * latency + previous_weight * self.average
+            self.timestamp = timestamp
+        self.count += 1
+
+
+class LatencyAwarePolicy(WrapperPolicy):
+    """
+    A :class:`.LoadBalancingPolicy` wrapper that moves slow hosts to the end of the child policy's query plan.
+
+    The policy keeps an exponentially weighted moving average of the graph request latencies of each host, measured
+    by the :class:`.Session` for graph requests executed with a profile using this policy (directly, or wrapped in
+    another policy such as :class:`.DSELoadBalancingPolicy`). Hosts with an average more than
+    ``exclusion_threshold`` times that of the fastest host are penalized: they are tried after all the others, in the
+    order of the child plan.
+
+    ``scale`` (seconds) sets how fast older latencies stop mattering: the weight of the previous average decreases
+    with the time elapsed since the last measurement, relative to ``scale``. A penalized host gets few requests, and
+    so few new measurements; it is given another chance once its last measurement is older than ``retry_period``
+    (seconds). Hosts are only compared once they have ``min_measurements`` measurements.
+
+    Example::
+
+        ep = GraphExecutionProfile(load_balancing_policy=LatencyAwarePolicy(DCAwareRoundRobinPolicy()))
+    """
+
+    exclusion_threshold = 2.0
+    """
+    Hosts with an average latency above this multiple of the fastest host's are penalized
+    """
+
+    scale = 0.1
+    """
+    Time (seconds) over which the weight of past latencies decreases
+    """
+
+    retry_period = 10.0
+    """
+    Time (seconds) after its last measurement a penalized host is tried again in its child plan order
+    """
+
+    min_measurements = 50
+    """
+    Number of latencies measured for a host before it is compared to others
+    """
+
+    # the average latency of the fastest host is recomputed at most this often (seconds)
+    _min_average_update_interval = 0.1
+
+    def __init__(self, child_policy, exclusion_threshold=2.0, scale=0.1, retry_period=10.0, min_measurements=50):
+        if exclusion_threshold < 1:
+            raise ValueError("exclusion_threshold must be at least 1")
+        if scale <= 0:
+            raise ValueError("scale must be positive")
+        super(LatencyAwarePolicy, self).__init__(child_policy)
+        self.exclusion_threshold = exclusion_threshold
+        self.scale = scale
+        self.retry_period = retry_period
+        self.min_measurements = min_measurements
+        self._latencies = {}
+        self._lock = Lock()
+        self._min_average = None
+        self._min_average_updated = None
+
+    def record_latency(self, host, latency):
+        """
+        Records the latency (seconds) of a request to ``host``. Called by the session for graph requests.
+        """
+        now = _clock()
+        with self._lock:
+            stats = self._latencies.get(host)
+            if stats is None:
+                self._latencies[host] = _HostLatency(latency, now)
+            else:
+                stats.add(latency, now, self.scale)
+
+    def host_latencies(self):
+        """
+        Returns a dict of host to (average latency, number of measurements)
+        """
+        with self._lock:
+            return dict((host, (stats.average, stats.count)) for host, stats in self._latencies.items())
+
+    def make_query_plan(self, working_keyspace=None, query=None):
+        child_plan = self._child_policy.make_query_plan(working_keyspace, query)
+        if not self._latencies:
+            for h in child_plan:
+                yield h
+            return
+
+        now = _clock()
+        threshold = self._threshold(now)
+        penalized = []
+        for h in child_plan:
+            if threshold is not None and self._is_penalized(h, threshold, now):
+                penalized.append(h)
+            else:
+                yield h
+        for h in penalized:
+            yield h
+
+    def _is_penalized(self, host, threshold, now):
+        stats = self._latencies.get(host)
+        return (stats is not None and stats.count >= self.min_measurements and
+                now - stats.timestamp < self.retry_period and stats.average > threshold)
+
+    def _threshold(self, now):
+        updated = self._min_average_updated
+        if updated is None or now - updated >= self._min_average_update_interval:
+            with self._lock:
+                averages = [stats.average for stats in self._latencies.values()
+                            if stats.count >= self.min_measurements and now - stats.timestamp < self.retry_period]
+            self._min_average = min(averages) if averages else None
+            self._min_average_updated = now
+        min_average = self._min_average
+        return min_average * self.exclusion_threshold if min_average is not None else None
+
+    def _forget(self, host):
+        with self._lock:
+            self._latencies.pop(host, None)
+
+    def on_up(self, host):
+        self._forget(host)
+        return self._child_policy.on_up(host)
+
+    def on_remove(self, host):
+        self._forget(host)
+        return self._child_policy.on_remove(host)
+
+
+class WorkloadAwarePolicy(WrapperPolicy):
+    """
+    A :class:`.LoadBalancingPolicy` wrapper that routes requests to hosts running one of the preferred DSE
+    ``workloads`` first, in the order of the child policy's query plan. Hosts running other workloads (or whose
+    workload is unknown) are only tried after them, as a fallback.
+
+    DSE reports the workloads of each node in the ``system.local`` and ``system.peers`` tables: ``'Cassandra'``,
+    ``'Search'``, ``'Analytics'`` and ``'Graph'``. They are read by :class:`dse.cluster.Cluster` into
+    ``Host.dse_workloads``.
+
+    The preferred workloads depend on the requests, so each execution profile uses its own policy; for instance,
+    routing graph OLTP queries, graph analytics queries and plain CQL requests to their datacenters::
+
+        profiles = {
+            EXEC_PROFILE_DEFAULT: ExecutionProfile(
+                load_balancing_policy=WorkloadAwarePolicy(RoundRobinPolicy(), ['Cassandra'])),
+            EXEC_PROFILE_GRAPH_DEFAULT: GraphExecutionProfile(
+                load_balancing_policy=WorkloadAwarePolicy(RoundRobinPolicy(), ['Graph'])),
+            EXEC_PROFILE_GRAPH_ANALYTICS_DEFAULT: GraphAnalyticsExecutionProfile(
+                load_balancing_policy=DSELoadBalancingPolicy(WorkloadAwarePolicy(RoundRobinPolicy(), ['Analytics'])))}
+        cluster = Cluster(execution_profiles=profiles)
+
+    Hosts are only used if the child policy yields them: ``DCAwareRoundRobinPolicy`` ignores the hosts of remote
+    datacenters, unless ``used_hosts_per_remote_dc`` is set.
+    """
+
+    workloads = None
+    """
+    frozenset of the workloads of the hosts tried first
+    """
+
+    def __init__(self, child_policy, workloads):
+        if isinstance(workloads, six.string_types):
+            workloads = (workloads,)
+        workloads = frozenset(workloads)
+        if not workloads:
+            raise ValueError("At least one preferred workload is required")
+        super(WorkloadAwarePolicy, self).__init__(child_policy)
+        self.workloads = workloads
+
+    def make_query_plan(self, working_keyspace=None, query=None):
+        workloads = self.workloads
+        fallback = []
+        for h in self._child_policy.make_query_plan(working_keyspace, query):
+            if workloads.isdisjoint(_host_workloads(h)):
+                fallback.append(h)
+            else:
+                yield h
+        for h in fallback:
+            yield h
+
+
+# workloads reported (DSE 5.0) for nodes running several of them
+_combined_workloads = {'SearchAnalytics': ('Search', 'Analytics')}
+
+
+def _workloads(workload, graph=False, workloads=None):
+    # DSE 5.1+ reports a set of workloads; DSE 5.0 a single workload, and whether graph is enabled
+    if workloads:
+        return frozenset(workloads)
+    result = set(_combined_workloads.get(workload, (workload,))) if workload else set()
+    if graph:
+        result.add('Graph')
+    return frozenset(result)
+
+
+def _host_workloads(host):
+    workloads = getattr(host, 'dse_workloads', None)
+    if workloads is None:  # not read yet: the workload read by the core driver
+        workloads = _workloads(getattr(host, 'dse_workload', None))
+    return workloads
+
+
 class NeverRetryPolicy(RetryPolicy):
     def _rethrow(self, *args, **kwargs):
         return self.RETHROW, None
@@ -7,15 +7,45 @@
 #
 # http://www.datastax.com/terms/datastax-dse-driver-license-terms
 
+# statement class -> targeting subclass
+_targeting_classes = {}
+
 
 class HostTargetingStatement(object):
     """
     Wraps any query statement and attaches a target host, making
     it usable in a targeted LBP without modifying the user's statement.
+
+    The wrapper is an instance of the statement's class, sharing its attributes; only ``target_host`` is its own.
+    Wrapping a statement that is already targeted retargets a new wrapper, leaving the first one unchanged.
     """
+
+    # kept out of the shared __dict__, so the wrapped statement is not modified
+    __slots__ = ('target_host',)
+
+    def __new__(cls, inner_statement, target_host):
+        return object.__new__(_targeting_class(inner_statement.__class__))
+
     def __init__(self, inner_statement, target_host):
-            self.__class__ = type(inner_statement.__class__.__name__,
-                                  (self.__class__, inner_statement.__class__),
-                                  {})
-            self.__dict__ = inner_statement.__dict__
-            self.target_host = target_host
+        self.__dict__ = inner_statement.__dict__
+        self.target_host = target_host
+
+    def __reduce__(self):
+        # targeting classes are created at run time, and cannot be imported: copies and pickles are wrapped again,
+        # around a statement of the wrapped class with the same attributes
+        statement_class = self._statement_class
+        statement = statement_class.__new__(statement_class)
+        statement.__dict__.update(self.__dict__)
+        return HostTargetingStatement, (statement, self.target_host)
+
+
+def _targeting_class(statement_class):
+    # one subclass per statement class, created on first use
+    try:
+        return _targeting_classes[statement_class]
+    except KeyError:
+        if issubclass(statement_class, HostTargetingStatement):
+            return statement_class
+        targeting_class = type(statement_class.__name__, (HostTargetingStatement, statement_class),
+                               {'_statement_class': statement_class})
+        return _targeting_classes.setdefault(statement_class, targeting_class)
@@ -9,6 +9,11 @@
 
 from itertools import chain
 
+try:
+    from time import monotonic as _clock  # for time intervals
+except ImportError:  # Python 2
+    from time import time as _clock
+
 _nan = float('nan')
 
 
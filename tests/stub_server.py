@@ -0,0 +1,453 @@
+# Copyright 2016 DataStax, Inc.
+#
+# Licensed under the DataStax DSE Driver License;
+# you may not use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+# http://www.datastax.com/terms/datastax-dse-driver-license-terms
+"""
+An in-process stand-in for a single DSE Graph node, speaking enough of the native protocol (v3 and v4) for a
+:class:`dse.cluster.Cluster` to connect and execute graph queries, without a live cluster::
+
+    with StubServer(responses={'g.V().count()': [42]}, latency=0.002) as server:
+        cluster = Cluster([server.address], port=server.port, protocol_version=4)
+        session = cluster.connect()
+        session.execute_graph('g.V().count()')[0]  # 42
+
+Graph queries (``QUERY`` messages with a ``graph-language`` custom payload) are answered with the results returned by
+``handler(request)``, a :class:`GraphRequest`, JSON-encoded as GraphSON result rows. The default handler serves
+``responses[query]`` (a list of results, or a function of the request returning one), and no results for unknown
+queries. Handlers may raise :class:`StubError` to answer with an error.
+
+Other nodes may be listed in ``system.peers`` with ``peers`` (addresses), to run a cluster of stub servers on the same
+port of several loopback addresses (127.0.0.x). Nodes report the DSE 5.0 ``workload`` and ``graph`` columns: the
+server's own are ``workload`` and ``graph``, those of peers ``peer_workloads[address]`` (a (workload, graph) tuple),
+the server's own by default.
+
+Responses are delayed by ``latency`` seconds (a number, or a function of the request), without blocking other
+requests. ``CALL DseClientTool.getAnalyticsGraphServer()`` locates the analytics master at ``analytics_master``
+(the server address by default). Control connection queries on ``system.local`` and ``system.peers`` describe a
+single datacenter; other CQL queries get empty results.
+
+Not supported: compression, authentication, prepared statements, batches, paging (all results are returned in one
+page) and tracing.
+"""
+from collections import namedtuple
+import heapq
+import itertools
+import json
+import socket
+import struct
+from threading import Condition, Lock, Thread
+import time
+import uuid
+
+_header = struct.Struct('>BBhBi')  # version, flags, stream, opcode, length (protocol v3+)
+
+_CUSTOM_PAYLOAD_FLAG = 0x04
+
+_OP_ERROR = 0x00
+_OP_STARTUP = 0x01
+_OP_READY = 0x02
+_OP_OPTIONS = 0x05
+_OP_SUPPORTED = 0x06
+_OP_QUERY = 0x07
+_OP_RESULT = 0x08
+_OP_REGISTER = 0x0B
+
+_RESULT_VOID = 0x0001
+_RESULT_ROWS = 0x0002
+_RESULT_SET_KEYSPACE = 0x0003
+
+_TYPE_BOOLEAN = 0x0004
+_TYPE_UUID = 0x000C
+_TYPE_VARCHAR = 0x000D
+_TYPE_INET = 0x0010
+_TYPE_MAP = 0x0021
+_TYPE_SET = 0x0022
+
+SERVER_ERROR = 0x0000
+PROTOCOL_ERROR = 0x000A
+OVERLOADED = 0x1001
+INVALID = 0x2200
+
+_SUPPORTED_VERSIONS = (3, 4)
+
+ANALYTICS_MASTER_QUERY = "CALL DseClientTool.getAnalyticsGraphServer()"
+
+
+GraphRequest = namedtuple('GraphRequest', ['query', 'parameters', 'custom_payload'])
+"""
+A graph query received by a :class:`StubServer`: the query string, the decoded parameters (or None), and the custom
+payload (graph options)
+"""
+
+
+class StubError(Exception):
+    """
+    Raised by handlers to answer with an ERROR message (``code`` is a native protocol error code)
+    """
+
+    def __init__(self, message, code=SERVER_ERROR):
+        super(StubError, self).__init__(message)
+        self.code = code
+
+
+class StubServer(object):
+    """
+    A native protocol server answering graph queries on ``address``:``port`` (an ephemeral port by default), from
+    threads of the current process. See the module documentation.
+    """
+
+    requests = 0
+    """
+    Number of graph requests received
+    """
+
+    def __init__(self, responses=None, handler=None, latency=0, address='127.0.0.1', port=0, analytics_master=None,
+                 release_version='3.0.11.1485', dse_version='5.0.4', peers=(), workload='Analytics', graph=False,
+                 peer_workloads=None):
+        self.responses = responses or {}
+        self.handler = handler or self._canned_response
+        self.latency = latency
+        self.address = address
+        self.analytics_master = analytics_master or address
+        self.release_version = release_version
+        self.dse_version = dse_version
+        self.peers = peers
+        self.workload = workload
+        self.graph = graph
+        self.peer_workloads = peer_workloads or {}
+        self.host_id = uuid.uuid4()
+        self.schema_version = uuid.uuid4()
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((address, port))
+        self.port = self._socket.getsockname()[1]
+        self._connections = set()
+        self._lock = Lock()
+        self._scheduled = []  # heap of (due time, sequence, connection, frame)
+        self._sequence = itertools.count()
+        self._scheduled_condition = Condition()
+        self._running = False
+
+    def start(self):
+        self._running = True
+        self._socket.listen(128)
+        for target in (self._accept, self._send_scheduled):
+            thread = Thread(target=target)
+            thread.daemon = True
+            thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        with self._scheduled_condition:
+            self._scheduled_condition.notify()
+        try:
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except socket.error:
+            pass
+        self._socket.close()
+        with self._lock:
+            connections = list(self._connections)
+        for connection in connections:
+            connection.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _canned_response(self, request):
+        results = self.responses.get(request.query, [])
+        return results(request) if callable(results) else results
+
+    def _accept(self):
+        while self._running:
+            try:
+                sock, _ = self._socket.accept()
+            except socket.error:
+                return
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            connection = _Connection(self, sock)
+            with self._lock:
+                self._connections.add(connection)
+            thread = Thread(target=connection.serve)
+            thread.daemon = True
+            thread.start()
+
+    def _discard(self, connection):
+        with self._lock:
+            self._connections.discard(connection)
+
+    def _send_later(self, delay, connection, frame):
+        with self._scheduled_condition:
+            heapq.heappush(self._scheduled, (time.time() + delay, next(self._sequence), connection, frame))
+            self._scheduled_condition.notify()
+
+    def _send_scheduled(self):
+        # a single thread delays all responses, so that latency does not limit concurrency
+        with self._scheduled_condition:
+            while self._running:
+                now = time.time()
+                while self._scheduled and self._scheduled[0][0] <= now:
+                    _, _, connection, frame = heapq.heappop(self._scheduled)
+                    connection.send(frame)
+                self._scheduled_condition.wait(self._scheduled[0][0] - now if self._scheduled else None)
+
+    def _respond(self, version, stream, query, custom_payload, values):
+        if custom_payload is not None and 'graph-language' in custom_payload:
+            parameters = json.loads(values[0].decode('utf-8')) if values else None
+            request = GraphRequest(query, parameters, custom_payload)
+            with self._lock:
+                self.requests += 1
+            latency = self.latency(request) if callable(self.latency) else self.latency
+            try:
+                rows = [[json.dumps({'result': result}).encode('utf-8')] for result in self.handler(request)]
+                body = _rows_body([('gremlin', _varchar)], rows)
+                opcode = _OP_RESULT
+            except StubError as exc:
+                body = _error_body(exc.code, str(exc))
+                opcode = _OP_ERROR
+            return latency, _frame(version, stream, opcode, body)
+
+        return 0, _frame(version, stream, *self._cql_response(query))
+
+    def _cql_response(self, query):
+        normalized = ' '.join(query.split()).lower()
+        if query == ANALYTICS_MASTER_QUERY:
+            location = {'location': '%s:7077' % (self.analytics_master,)}
+            return _OP_RESULT, _rows_body([('result', _map(_varchar, _varchar))], [[_encode_map(location)]])
+        if 'system.peers_v2' in normalized:
+            return _OP_ERROR, _error_body(INVALID, "unconfigured table peers_v2")
+        if 'system.peers' in normalized:
+            return _OP_RESULT, _rows_body(_peers_columns, [self._peer_row(peer) for peer in self.peers])
+        if 'system.local' in normalized:
+            return _OP_RESULT, _rows_body(*self._local_row())
+        if normalized.startswith('use '):
+            keyspace = query.split()[1].strip('"')
+            return _OP_RESULT, struct.pack('>i', _RESULT_SET_KEYSPACE) + _string(keyspace)
+        if normalized.startswith('select'):  # schema queries; the driver does not decode metadata without columns
+            return _OP_RESULT, _rows_body([('keyspace_name', _varchar)], [])
+        return _OP_RESULT, struct.pack('>i', _RESULT_VOID)
+
+    def _peer_row(self, peer):
+        address = socket.inet_aton(peer)
+        workload, graph = self.peer_workloads.get(peer, (self.workload, self.graph))
+        return [address, b'dc1', b'r1', uuid.uuid5(uuid.NAMESPACE_OID, peer).bytes, address, self.schema_version.bytes,
+                self.release_version.encode(), self.dse_version.encode(), workload.encode(), _encode_boolean(graph),
+                _encode_collection([_token(peer)])]
+
+    def _local_row(self):
+        address = socket.inet_aton(self.address)
+        values = (('key', _varchar, b'local'),
+                  ('cluster_name', _varchar, b'stub'),
+                  ('data_center', _varchar, b'dc1'),
+                  ('rack', _varchar, b'r1'),
+                  ('partitioner', _varchar, b'org.apache.cassandra.dht.Murmur3Partitioner'),
+                  ('release_version', _varchar, self.release_version.encode()),
+                  ('dse_version', _varchar, self.dse_version.encode()),
+                  ('workload', _varchar, self.workload.encode()),
+                  ('graph', _boolean, _encode_boolean(self.graph)),
+                  ('host_id', _uuid, self.host_id.bytes),
+                  ('schema_version', _uuid, self.schema_version.bytes),
+                  ('tokens', _set(_varchar), _encode_collection([_token(self.address)])),
+                  ('rpc_address', _inet, address),
+                  ('broadcast_address', _inet, address),
+                  ('listen_address', _inet, address))
+        return [(name, typ) for name, typ, _ in values], [[value for _, _, value in values]]
+
+
+class _Connection(object):
+
+    def __init__(self, server, sock):
+        self.server = server
+        self.sock = sock
+        self.lock = Lock()
+
+    def serve(self):
+        try:
+            while True:
+                header = self._read(_header.size)
+                if header is None:
+                    break
+                version, flags, stream, opcode, length = _header.unpack(header)
+                body = self._read(length) if length else b''
+                if body is None:
+                    break
+                self._handle(version & 0x7F, flags, stream, opcode, body)
+        except socket.error:
+            pass
+        finally:
+            self.close()
+
+    def _read(self, size):
+        chunks = []
+        while size:
+            chunk = self.sock.recv(size)
+            if not chunk:
+                return None
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b''.join(chunks)
+
+    def _handle(self, version, flags, stream, opcode, body):
+        if version not in _SUPPORTED_VERSIONS:
+            # the driver retries with a lower version on this message
+            message = "Invalid or unsupported protocol version (%d); supported versions are (%s)" % (
+                version, ', '.join('%d/v%d' % (v, v) for v in _SUPPORTED_VERSIONS))
+            self.send(_frame(max(_SUPPORTED_VERSIONS), stream, _OP_ERROR, _error_body(PROTOCOL_ERROR, message)))
+            return
+
+        if opcode == _OP_OPTIONS:
+            self.send(_frame(version, stream, _OP_SUPPORTED,
+                             _string_multimap({'CQL_VERSION': ['3.4.0'], 'COMPRESSION': []})))
+        elif opcode in (_OP_STARTUP, _OP_REGISTER):
+            self.send(_frame(version, stream, _OP_READY, b''))
+        elif opcode == _OP_QUERY:
+            custom_payload = None
+            position = 0
+            if flags & _CUSTOM_PAYLOAD_FLAG:
+                custom_payload, position = _read_bytes_map(body, position)
+            query, values = _read_query(body, position)
+            delay, frame = self.server._respond(version, stream, query, custom_payload, values)
+            if delay > 0:
+                self.server._send_later(delay, self, frame)
+            else:
+                self.send(frame)
+        else:
+            self.send(_frame(version, stream, _OP_ERROR,
+                             _error_body(PROTOCOL_ERROR, "Opcode 0x%02x is not supported by the stub server" % opcode)))
+
+    def send(self, frame):
+        try:
+            with self.lock:
+                self.sock.sendall(frame)
+        except socket.error:
+            self.close()
+
+    def close(self):
+        self.server._discard(self)
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except socket.error:
+            pass
+        self.sock.close()
+
+
+def _token(address):
+    # a distinct Murmur3 token per node
+    return str(struct.unpack('>i', socket.inet_aton(address))[0]).encode()
+
+
+def _frame(version, stream, opcode, body):
+    return _header.pack(0x80 | version, 0, stream, opcode, len(body)) + body
+
+
+def _string(value):
+    encoded = value.encode('utf-8')
+    return struct.pack('>H', len(encoded)) + encoded
+
+
+def _bytes(value):
+    if value is None:
+        return struct.pack('>i', -1)
+    return struct.pack('>i', len(value)) + value
+
+
+def _string_multimap(values):
+    return struct.pack('>H', len(values)) + b''.join(
+        _string(key) + struct.pack('>H', len(strings)) + b''.join(_string(s) for s in strings)
+        for key, strings in values.items())
+
+
+def _error_body(code, message):
+    return struct.pack('>i', code) + _string(message)
+
+
+# type options: column types in Rows metadata
+_boolean = struct.pack('>H', _TYPE_BOOLEAN)
+_varchar = struct.pack('>H', _TYPE_VARCHAR)
+_uuid = struct.pack('>H', _TYPE_UUID)
+_inet = struct.pack('>H', _TYPE_INET)
+
+
+def _set(element_type):
+    return struct.pack('>H', _TYPE_SET) + element_type
+
+
+def _map(key_type, value_type):
+    return struct.pack('>H', _TYPE_MAP) + key_type + value_type
+
+
+def _encode_boolean(value):
+    return b'\x01' if value else b'\x00'
+
+
+def _encode_collection(elements):
+    return struct.pack('>i', len(elements)) + b''.join(_bytes(e) for e in elements)
+
+
+def _encode_map(values):
+    return struct.pack('>i', len(values)) + b''.join(_bytes(k.encode('utf-8')) + _bytes(v.encode('utf-8'))
+                                                     for k, v in values.items())
+
+
+_peers_columns = [('peer', _inet), ('data_center', _varchar), ('rack', _varchar), ('host_id', _uuid),
+                  ('rpc_address', _inet), ('schema_version', _uuid), ('release_version', _varchar),
+                  ('dse_version', _varchar), ('workload', _varchar), ('graph', _boolean), ('tokens', _set(_varchar))]
+
+
+def _rows_body(columns, rows):
+    # global table spec (flag 0x0001), as the driver does not care which table results come from
+    metadata = struct.pack('>iii', _RESULT_ROWS, 0x0001, len(columns)) + _string('system') + _string('stub')
+    metadata += b''.join(_string(name) + typ for name, typ in columns)
+    return metadata + struct.pack('>i', len(rows)) + b''.join(_bytes(value) for row in rows for value in row)
+
+
+def _read_bytes_map(body, position):
+    count, = struct.unpack_from('>H', body, position)
+    position += 2
+    values = {}
+    for _ in range(count):
+        key, position = _read_string(body, position)
+        values[key], position = _read_value(body, position)
+    return values, position
+
+
+def _read_string(body, position):
+    length, = struct.unpack_from('>H', body, position)
+    position += 2
+    return body[position:position + length].decode('utf-8'), position + length
+
+
+def _read_value(body, position):
+    length, = struct.unpack_from('>i', body, position)
+    position += 4
+    if length < 0:
+        return None, position
+    return body[position:position + length], position + length
+
+
+def _read_query(body, position):
+    # QUERY (v3, v4): <query: long string><consistency: short><flags: byte>[<n: short><value_1>...<value_n>]...
+    length, = struct.unpack_from('>i', body, position)
+    position += 4
+    query = body[position:position + length].decode('utf-8')
+    position += length + 2
+    flags = struct.unpack_from('>B', body, position)[0]
+    position += 1
+    values = []
+    if flags & 0x01:
+        count, = struct.unpack_from('>H', body, position)
+        position += 2
+        for _ in range(count):
+            if flags & 0x40:  # named values
+                _, position = _read_string(body, position)
+            value, position = _read_value(body, position)
+            values.append(value)
+    return query, values
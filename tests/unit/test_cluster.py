@@ -13,10 +13,30 @@ except ImportError:
     import unittest  # noqa
 
 from dse import _core_driver_target_version
-from dse.cluster import Cluster
+from cassandra import InvalidRequest, OperationTimedOut
+from cassandra.cluster import ResultSet
+from cassandra.cqltypes import Int32Type, UTF8Type
+from cassandra.policies import (ConstantSpeculativeExecutionPolicy, NoSpeculativeExecutionPolicy,
+                                NoSpeculativeExecutionPlan, RoundRobinPolicy, TokenAwarePolicy)
+from cassandra.pool import Host
+from dse.cluster import (Cluster, Session, GraphPage, GraphExecutionProfile, GraphAnalyticsExecutionProfile,
+                         GraphResultCache, GraphRequestTimings, _use_first_response, _track_latencies,
+                         _latency_aware_policy,
+                         EXEC_PROFILE_GRAPH_DEFAULT, _AnalyticsMasterListener)
+from dse.graph import GraphOptions, GraphParameterEncoder, SimpleGraphStatement
+from dse.metrics import GraphMetrics
+from dse.policies import DSELoadBalancingPolicy, LatencyAwarePolicy
+from dse.util import Point
 from dse import _use_any_core_driver_version
 
-from mock import patch
+from mock import Mock, patch
+import json
+from threading import Event, Lock, Thread
+
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
 
 
 class ClusterTests(unittest.TestCase):
@@ -49,3 +69,727 @@ class ClusterTests(unittest.TestCase):
         @test_category cluster
         """
         Cluster()
+
+
+class GraphExecutionProfileTests(unittest.TestCase):
+
+    def test_custom_payload_cached(self):
+        profile = GraphExecutionProfile(graph_options=GraphOptions(graph_name='g1'))
+        payload = profile._get_custom_payload()
+        self.assertEqual(payload['graph-name'], b'g1')
+        self.assertIs(profile._get_custom_payload(), payload)
+
+    def test_custom_payload_invalidated(self):
+        profile = GraphExecutionProfile(graph_options=GraphOptions(graph_name='g1'))
+        payload = profile._get_custom_payload()
+
+        profile.graph_options.graph_name = 'g2'
+        self.assertEqual(profile._get_custom_payload()['graph-name'], b'g2')
+
+        del profile.graph_options.graph_name
+        self.assertNotIn('graph-name', profile._get_custom_payload())
+
+        profile.graph_options.update(GraphOptions(graph_name='g3'))
+        self.assertEqual(profile._get_custom_payload()['graph-name'], b'g3')
+
+        profile.graph_options = GraphOptions(graph_name='g4')
+        self.assertEqual(profile._get_custom_payload()['graph-name'], b'g4')
+
+        profile.request_timeout = 5.0
+        payload = profile._get_custom_payload()
+        self.assertEqual(payload['request-timeout'], b'\x00\x00\x00\x00\x00\x00\x13\x88')
+        self.assertIs(profile._get_custom_payload(), payload)
+
+    def test_speculative_execution_policy(self):
+        self.assertIsInstance(GraphExecutionProfile().speculative_execution_policy, NoSpeculativeExecutionPolicy)
+        policy = ConstantSpeculativeExecutionPolicy(0.1, 2)
+        self.assertIs(GraphExecutionProfile(speculative_execution_policy=policy).speculative_execution_policy, policy)
+        self.assertIsInstance(GraphAnalyticsExecutionProfile().speculative_execution_policy,
+                              NoSpeculativeExecutionPolicy)
+
+    def test_vertex_routing_key(self):
+        profile = GraphExecutionProfile(vertex_partition_keys={'sensor': (('sensor_id', UTF8Type),
+                                                                          ('bucket', Int32Type))})
+        self.assertEqual(profile._vertex_routing_key({'~label': 'person', 'community_id': 1234, 'member_id': 0}, 4),
+                         [b'\x00\x00\x04\xd2'])
+        self.assertEqual(profile._vertex_routing_key({'~label': 'sensor', 'sensor_id': u's1', 'bucket': 1}, 4),
+                         [b's1', b'\x00\x00\x00\x01'])
+        self.assertRaises(KeyError, profile._vertex_routing_key, {'~label': 'sensor', 'sensor_id': u's1'}, 4)
+
+
+class FirstResponseTests(unittest.TestCase):
+
+    def test_late_response_discarded(self):
+        future = Mock(_event=Event())
+        set_result = future._set_result
+        _use_first_response(future)
+        pool = Mock()
+
+        future._set_result('h1', 'c1', pool, 'first')
+        set_result.assert_called_once_with('h1', 'c1', pool, 'first')
+        future._event.set()
+
+        future._set_result('h2', 'c2', pool, 'late')
+        self.assertEqual(set_result.call_count, 1)
+        pool.return_connection.assert_called_once_with('c2')
+
+    def test_previous_page_response_discarded(self):
+        future = Mock(_event=Event())
+        future._protocol_handler.decode_message.side_effect = lambda body: Mock(body=body)
+        set_result = future._set_result
+        fetch_next_page = future.start_fetching_next_page
+        _use_first_response(future)
+        pool = Mock()
+
+        first_page = future._protocol_handler
+        late = first_page.decode_message('page 1')
+        future._set_result('h1', 'c1', pool, first_page.decode_message('page 1'))
+        future._event.set()
+
+        future._event.clear()  # as done by the core driver to fetch the next page
+        future.start_fetching_next_page()
+        fetch_next_page.assert_called_once_with()
+        self.assertIsNot(future._protocol_handler, first_page)
+
+        future._set_result('h2', 'c2', pool, late)  # speculative response for the first page
+        self.assertEqual(set_result.call_count, 1)
+        pool.return_connection.assert_called_once_with('c2')
+
+        response = future._protocol_handler.decode_message('page 2')
+        future._set_result('h1', 'c1', pool, response)
+        self.assertEqual(set_result.call_count, 2)
+        set_result.assert_called_with('h1', 'c1', pool, response)
+
+
+class LatencyTrackingTests(unittest.TestCase):
+
+    def setUp(self):
+        self.future = Mock()
+        self.future._query.side_effect = lambda host: 1 if host != 'down' else None
+        self.set_result = self.future._set_result
+        self.policy = Mock()
+        _track_latencies(self.future, self.policy)
+
+    def test_responses(self):
+        self.future._query('h1')
+        self.future._query('h2')
+        self.future._set_result('h2', 'c', None, 'response')
+        self.future._set_result('h1', 'c', None, 'late')
+        self.assertEqual([c[0][0] for c in self.policy.record_latency.call_args_list], ['h2', 'h1'])
+        self.assertEqual(self.set_result.call_count, 2)
+
+    def test_unanswered(self):
+        self.future._query('h1')
+        self.future._query('down')
+        self.future._query('h2')
+        self.future._set_result('h1', 'c', None, 'error')
+        errback = self.future.add_errback.call_args[0][0]
+        errback(OperationTimedOut())
+        self.assertEqual([c[0][0] for c in self.policy.record_latency.call_args_list], ['h1', 'h2'])
+
+    def test_wrapped_policy(self):
+        policy = LatencyAwarePolicy(RoundRobinPolicy())
+        self.assertIs(_latency_aware_policy(policy), policy)
+        self.assertIs(_latency_aware_policy(DSELoadBalancingPolicy(policy)), policy)
+        self.assertIsNone(_latency_aware_policy(DSELoadBalancingPolicy(TokenAwarePolicy(RoundRobinPolicy()))))
+
+
+class SessionGraphParametersTests(unittest.TestCase):
+
+    def setUp(self):
+        self.session = Session.__new__(Session)
+        self.session.graph_parameter_encoder = GraphParameterEncoder()
+
+    def test_encoded(self):
+        encoded, = self.session._transform_params({'p': Point(1, 2)})
+        self.assertEqual(json.loads(encoded.decode('utf-8')), {'p': str(Point(1, 2))})
+
+    def test_pre_encoded(self):
+        encoded = self.session.graph_parameter_encoder.encode({'a': 1})
+        self.assertEqual(self.session._transform_params(encoded), [encoded])
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, self.session._transform_params, [1, 2])
+
+
+class SessionAnalyticsMasterTests(unittest.TestCase):
+
+    def setUp(self):
+        self.session = Session.__new__(Session)
+        self.session.keyspace = None
+        self.session.submit = lambda fn, *args: fn(*args)
+        self.master_queries = 0
+
+        def create_response_future(*args, **kwargs):
+            self.master_queries += 1
+            master_future = Mock()
+            master_future.result.return_value = [[{'location': '10.0.0.%d:7077' % (self.master_queries,)}]]
+            master_future.add_callbacks.side_effect = \
+                lambda callback, callback_args, **kwargs: callback(None, *callback_args)
+            return master_future
+        self.session._create_response_future = create_response_future
+
+    def _target(self):
+        future = Mock(query=SimpleGraphStatement('g.V()'))
+        self.session._target_analytics_master(future)
+        self.assertEqual(future.send_request.call_count, 1)
+        targeted = future._load_balancer.make_query_plan.call_args[0][1]
+        return future, targeted.target_host
+
+    def test_cached(self):
+        _, addr = self._target()
+        self.assertEqual(addr, '10.0.0.1')
+        self.assertEqual(self._target()[1], '10.0.0.1')
+        self.assertEqual(self.master_queries, 1)
+
+    def test_expired(self):
+        self._target()
+        expiry = self.session._analytics_master[1]
+        with patch('dse.cluster._clock', return_value=expiry + 1):
+            self.assertEqual(self._target()[1], '10.0.0.2')
+
+    def test_caching_disabled(self):
+        self.session.analytics_master_cache_ttl = 0
+        self._target()
+        self.assertEqual(self._target()[1], '10.0.0.2')
+
+    def test_query_failure_refresh(self):
+        future, addr = self._target()
+        errback, errback_addr = future.add_errback.call_args[0]
+        self.assertEqual(errback_addr, addr)
+        errback(InvalidRequest(), addr)  # rejected query, master is still valid
+        self.assertEqual(self._target()[1], '10.0.0.1')
+
+        errback(OperationTimedOut(), addr)
+        self.assertEqual(self._target()[1], '10.0.0.2')
+
+    def test_no_speculative_execution(self):
+        future, _ = self._target()
+        self.assertIsInstance(future._spec_execution_plan, NoSpeculativeExecutionPlan)
+
+    def test_timings(self):
+        future = Mock(query=SimpleGraphStatement('g.V()'))
+        future.graph_timings = timings = GraphRequestTimings(future.query)
+        timings.encoded = timings.started
+        self.session._target_analytics_master(future)
+        self.assertTrue(timings.encoded <= timings.analytics_master_resolved <= timings.sent)
+
+    def test_topology_refresh(self):
+        self._target()
+        listener = _AnalyticsMasterListener(self.session)
+        listener.on_down(Mock())
+        self.assertEqual(self._target()[1], '10.0.0.2')
+
+        del self.session
+        listener.on_remove(Mock())  # session collected, listener is a no-op
+
+
+class SessionGraphRoutingTests(unittest.TestCase):
+
+    def setUp(self):
+        self.session = Session.__new__(Session)
+        self.session.cluster = Mock(protocol_version=4)
+        self.profile = GraphExecutionProfile(graph_options=GraphOptions(graph_name='friends'),
+                                             vertex_partition_keys={'sensor': (('sensor_id', UTF8Type),
+                                                                               ('bucket', Int32Type))})
+
+    def test_routing_key(self):
+        statement = SimpleGraphStatement('g.V(vid)')
+        statement.set_routing_vertex_id({'~label': 'person', 'community_id': 1234, 'member_id': 0})
+        routed = self.session._routed_graph_statement(statement, self.profile)
+        self.assertEqual(routed.routing_key, b'\x00\x00\x04\xd2')
+        self.assertEqual(routed.keyspace, 'friends')
+        self.assertEqual(routed.query_string, 'g.V(vid)')
+        self.assertEqual((statement.routing_key, statement.keyspace), (None, None))  # routed on a copy
+
+        statement.set_routing_vertex_id({'~label': 'sensor', 'sensor_id': u's1', 'bucket': 1})
+        routed = self.session._routed_graph_statement(statement, self.profile)
+        self.assertEqual(routed.routing_key, b'\x00\x02s1\x00\x00\x04\x00\x00\x00\x01\x00')
+
+    def test_invalid_vertex_id(self):
+        statement = SimpleGraphStatement('g.V(vid)')
+        statement.set_routing_vertex_id({'~label': 'person'})
+        self.assertIs(self.session._routed_graph_statement(statement, self.profile), statement)  # not routed, but executed
+        self.assertEqual((statement.routing_key, statement.keyspace), (None, None))
+
+    def test_routing_unset(self):
+        session = Session.__new__(Session)
+        session._create_response_future = Mock()
+        session._get_execution_profile = Mock(return_value=self.profile)
+        session.client_protocol_handler = Mock()
+        session.record_graph_timings = False
+        session.cluster = self.session.cluster
+        statement = SimpleGraphStatement('g.V(vid)')
+        statement.set_routing_vertex_id({'~label': 'person', 'community_id': 1234, 'member_id': 0})
+        session._create_graph_response_future(statement, None, False, self.profile, None)
+        routed = session._create_response_future.call_args[0][0]
+        self.assertEqual((routed.routing_key, routed.keyspace), (b'\x00\x00\x04\xd2', 'friends'))
+
+        statement.set_routing_vertex_id(None)
+        session._create_graph_response_future(statement, None, False, self.profile, None)
+        self.assertIs(session._create_response_future.call_args[0][0], statement)
+        self.assertEqual((statement.routing_key, statement.keyspace), (None, None))
+
+    def test_replicas_first(self):
+        hosts = [Host('127.0.0.%d' % (i,), Mock()) for i in range(1, 5)]
+        for h in hosts:
+            h.set_up()
+        replica = hosts[2]
+        metadata = Mock()
+        metadata.get_host.return_value = None
+        metadata.get_replicas.return_value = [replica]
+        policy = DSELoadBalancingPolicy(TokenAwarePolicy(RoundRobinPolicy()))
+        policy.populate(Mock(metadata=metadata), hosts)
+
+        statement = SimpleGraphStatement('g.V(vid)')
+        statement.set_routing_vertex_id({'~label': 'person', 'community_id': 1234, 'member_id': 0})
+        routed = self.session._routed_graph_statement(statement, self.profile)
+        for _ in range(len(hosts)):
+            query_plan = list(policy.make_query_plan(None, routed))
+            self.assertEqual(query_plan[0], replica)
+            self.assertEqual(sorted(query_plan), sorted(hosts))
+        metadata.get_replicas.assert_called_with('friends', b'\x00\x00\x04\xd2')
+
+
+class GraphResultCacheTests(unittest.TestCase):
+
+    def test_lru(self):
+        cache = GraphResultCache(max_size=10)
+        cache.put('a', 1, 4)
+        cache.put('b', 2, 4)
+        self.assertEqual(cache.get('a'), 1)  # b is now least recently used
+        cache.put('c', 3, 4)
+        self.assertEqual((cache.get('a'), cache.get('b'), cache.get('c')), (1, None, 3))
+        self.assertEqual((len(cache), cache.size), (2, 8))
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+
+    def test_replace(self):
+        cache = GraphResultCache(max_size=10)
+        cache.put('a', 1, 4)
+        cache.put('a', 2, 6)
+        self.assertEqual((cache.get('a'), cache.size), (2, 6))
+
+    def test_oversized(self):
+        cache = GraphResultCache(max_size=10)
+        cache.put('a', 1, 11)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.size, 0)
+
+    def test_ttl(self):
+        cache = GraphResultCache(ttl=-1)
+        cache.put('a', 1, 4)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual((len(cache), cache.size, cache.misses), (0, 0, 1))
+
+    def test_clear(self):
+        cache = GraphResultCache()
+        cache.put('a', 1, 4)
+        cache.clear()
+        self.assertEqual((len(cache), cache.size), (0, 0))
+
+
+class RowsFutureMock(object):
+    """
+    Applies the row factory to its rows when sent, as the driver does when a response is received
+    """
+    _col_names = ['gremlin']
+    _col_types = None
+    _spec_execution_plan = NoSpeculativeExecutionPlan()
+
+    def __init__(self, rows, row_factory, paging_state=None):
+        self.rows = rows
+        self.row_factory = row_factory
+        self.message = Mock()
+        self.paging_state = paging_state
+
+    def send_request(self):
+        self._paging_state = self.paging_state
+        self.result_rows = self.row_factory(self._col_names, self.rows)
+
+    @property
+    def has_more_pages(self):
+        return self._paging_state is not None
+
+    def result(self):
+        return ResultSet(self, self.result_rows)
+
+
+def graph_session(create_response_future, get_execution_profile=lambda ep: ep):
+    """
+    A Session executing graph requests without a cluster, with futures returned by ``create_response_future``
+    """
+    session = Session.__new__(Session)
+    session.graph_parameter_encoder = GraphParameterEncoder()
+    session.client_protocol_handler = None
+    session._get_execution_profile = get_execution_profile
+    session._create_response_future = create_response_future
+    session._graph_in_flight = {}
+    session._graph_in_flight_lock = Lock()
+    return session
+
+
+class SessionGraphResultCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.futures = []
+        self.paging_state = None
+
+        def create_response_future(*args, **kwargs):
+            future = RowsFutureMock([('{"result": %d}' % (len(self.futures),),)],
+                                    kwargs['execution_profile'].row_factory, self.paging_state)
+            self.futures.append(future)
+            return future
+        self.session = graph_session(create_response_future)
+        self.session.graph_result_cache = GraphResultCache()
+        self.profile = GraphExecutionProfile(row_factory=lambda column_names, rows: [r[0].upper() for r in rows],
+                                             cache_results=True)
+
+    def execute(self, query='g.V()', parameters=None, profile=None):
+        return self.session.execute_graph(query, parameters, execution_profile=profile or self.profile).current_rows
+
+    def test_cached(self):
+        self.assertEqual(self.execute(), ['{"RESULT": 0}'])
+        self.assertEqual(self.execute(SimpleGraphStatement('g.V()')), ['{"RESULT": 0}'])  # row factory applied
+        self.assertEqual(len(self.futures), 1)
+        self.assertEqual((self.session.graph_result_cache.hits, self.session.graph_result_cache.misses), (1, 1))
+
+    def test_async_populates(self):
+        self.session.execute_graph_async('g.V()', execution_profile=self.profile).result()
+        self.execute()
+        self.assertEqual(len(self.futures), 1)
+
+    def test_key(self):
+        self.execute('g.V()', {'a': 1, 'b': Point(1, 2)})
+        self.execute('g.V()', {'b': Point(1, 2), 'a': 1})
+        self.assertEqual(len(self.futures), 1)
+
+        self.execute('g.V()', {'a': 2, 'b': Point(1, 2)})
+        self.execute('g.E()', {'a': 1, 'b': Point(1, 2)})
+        self.profile.graph_options.graph_name = 'other'
+        self.execute('g.V()', {'a': 1, 'b': Point(1, 2)})
+        self.assertEqual(len(self.futures), 4)
+
+    def test_not_cached(self):
+        self.execute(profile=GraphExecutionProfile())
+        self.execute(profile=GraphExecutionProfile())
+        self.assertEqual(len(self.futures), 2)
+
+        self.paging_state = b'more'
+        self.execute()
+        self.paging_state = None
+        self.execute()
+        self.assertEqual(len(self.futures), 4)
+
+        self.session.graph_result_cache = None
+        self.execute()
+        self.assertEqual(len(self.futures), 5)
+
+    def test_unsortable_parameters(self):
+        # keys of mixed types cannot be sorted into a key: the request is executed, and not cached
+        self.assertEqual(self.execute('g.V()', {1: 'a', 'b': 2}), ['{"RESULT": 0}'])
+        self.assertEqual(self.execute('g.V()', {1: 'a', 'b': 2}), ['{"RESULT": 1}'])
+        self.assertEqual(len(self.session.graph_result_cache._entries), 0)
+
+
+class InFlightFutureMock(RowsFutureMock):
+    """
+    Receives its response when completed by the test
+    """
+
+    def __init__(self, *args):
+        super(InFlightFutureMock, self).__init__(*args)
+        self.callbacks = []
+        self.attempted_hosts = ['127.0.0.1']
+
+    def send_request(self):
+        pass
+
+    def add_callbacks(self, callback, errback, callback_args=(), errback_args=()):
+        self.callbacks.append((callback, callback_args, errback, errback_args))
+
+    def complete(self, error=None):
+        if error:
+            for _, _, errback, args in self.callbacks:
+                errback(error, *args)
+        else:
+            super(InFlightFutureMock, self).send_request()
+            for callback, args, _, _ in self.callbacks:
+                callback(self.result_rows, *args)
+
+
+class SessionGraphCoalescingTests(unittest.TestCase):
+
+    def setUp(self):
+        self.futures = []
+
+        def create_response_future(*args, **kwargs):
+            future = InFlightFutureMock([('{"result": %d}' % (len(self.futures),),)],
+                                        kwargs['execution_profile'].row_factory)
+            self.futures.append(future)
+            return future
+        self.session = graph_session(create_response_future)
+        self.profile = GraphExecutionProfile(row_factory=lambda column_names, rows: (r[0] for r in rows),
+                                             coalesce_requests=True)
+
+    def execute(self, parameters=None, profile=None):
+        return self.session.execute_graph_async('g.V()', parameters, execution_profile=profile or self.profile)
+
+    def test_coalesced(self):
+        future = self.execute({'a': 1, 'b': 2})
+        self.assertIs(self.execute({'b': 2, 'a': 1}), future)
+        self.assertIsNot(self.execute({'a': 2, 'b': 2}), future)
+        self.assertEqual(len(self.futures), 2)
+
+        future.complete()
+        self.assertEqual(len(self.session._graph_in_flight), 1)  # the other request is still in flight
+        self.assertIsNot(self.execute({'a': 1, 'b': 2}), future)
+        self.assertEqual(len(self.futures), 3)
+
+    def test_result_shared(self):
+        future = self.execute()
+        self.assertIs(self.execute(), future)
+        future.complete()
+        # the generator returned by the row factory is materialized for every waiter
+        self.assertEqual(list(future.result()), ['{"result": 0}'])
+        self.assertEqual(list(future.result()), ['{"result": 0}'])
+
+    def test_error(self):
+        future = self.execute()
+        future.complete(RuntimeError())
+        self.assertFalse(self.session._graph_in_flight)
+        self.assertIsNot(self.execute(), future)
+
+    def test_not_coalesced(self):
+        profile = GraphExecutionProfile()
+        self.assertIsNot(self.execute(profile=profile), self.execute(profile=profile))
+        self.assertIsNot(self.execute(profile=GraphExecutionProfile(coalesce_requests=True)), self.execute())
+        self.assertIsNot(self.session.execute_graph_async('g.V()', trace=True, execution_profile=self.profile),
+                         self.execute())
+
+    def test_unsortable_parameters(self):
+        future = self.execute({1: 'a', 'b': 2})
+        self.assertIsNot(self.execute({1: 'a', 'b': 2}), future)
+        self.assertEqual(len(self.futures), 2)
+        self.assertFalse(self.session._graph_in_flight)
+
+
+class PagedFutureMock(object):
+    """
+    Stands in for a ResponseFuture over a sequence of pages
+    """
+    def __init__(self, pages):
+        self.pages = pages
+        self.page = 0
+
+    def result(self):
+        return Mock(current_rows=iter(self.pages[self.page]))
+
+    @property
+    def _paging_state(self):
+        return str(self.page) if self.has_more_pages else None
+
+    @property
+    def has_more_pages(self):
+        return self.page < len(self.pages) - 1
+
+    def start_fetching_next_page(self):
+        self.page += 1
+
+
+class SessionGraphPagingTests(unittest.TestCase):
+
+    def _session(self, future):
+        session = Session.__new__(Session)
+        session.execute_graph_async = Mock(return_value=future)
+        return session
+
+    def test_pages(self):
+        pages = [[1, 2], [3, 4], [5]]
+        future = PagedFutureMock(pages)
+        session = self._session(future)
+        results = session.execute_graph_pages('g.V()', paging_state='saved')
+
+        # nothing is requested until iteration starts, and pages are fetched one at a time
+        self.assertFalse(session.execute_graph_async.called)
+        self.assertEqual(next(results), GraphPage([1, 2], '0'))
+        session.execute_graph_async.assert_called_once_with('g.V()', None, False, EXEC_PROFILE_GRAPH_DEFAULT, 'saved')
+        self.assertEqual(future.page, 0)
+
+        self.assertEqual(list(results), [GraphPage([3, 4], '1'), GraphPage([5], None)])
+
+    def test_single_page(self):
+        session = self._session(PagedFutureMock([[]]))
+        self.assertEqual(list(session.execute_graph_pages('g.V()')), [GraphPage([], None)])
+
+
+class CallbackFutureMock(PagedFutureMock):
+    """
+    Completes each page from another thread, like the driver event loop: callbacks stay registered, and are called
+    again for each page
+    """
+    _col_names = None
+    _col_types = None
+
+    def __init__(self, pages, error=None):
+        super(CallbackFutureMock, self).__init__(pages)
+        self.error = error
+        self.callbacks = []
+
+    def add_callbacks(self, callback, errback, callback_args=(), errback_args=()):
+        self.callbacks.append((callback, errback, callback_args, errback_args))
+        self._complete([self.callbacks[-1]])
+
+    def start_fetching_next_page(self):
+        super(CallbackFutureMock, self).start_fetching_next_page()
+        self._complete(list(self.callbacks))
+
+    def _complete(self, callbacks):
+        for callback, errback, callback_args, errback_args in callbacks:
+            if self.error:
+                Thread(target=errback, args=(self.error,) + errback_args).start()
+            else:
+                Thread(target=callback, args=(self.pages[self.page],) + callback_args).start()
+
+
+@unittest.skipIf(asyncio is None, "asyncio is not available")
+class SessionGraphAsyncioTests(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+    def _session(self, future):
+        session = Session.__new__(Session)
+        session.execute_graph_async = Mock(return_value=future)
+        return session
+
+    def _wait(self, aio_future):
+        return self.loop.run_until_complete(asyncio.wait_for(aio_future, 5))
+
+    def test_result(self):
+        session = self._session(CallbackFutureMock([[1, 2, 3]]))
+        result = self._wait(session.execute_graph_aio('g.V()', {'a': 1}))
+        self.assertEqual(list(result), [1, 2, 3])
+        session.execute_graph_async.assert_called_once_with('g.V()', {'a': 1}, False, EXEC_PROFILE_GRAPH_DEFAULT, None)
+
+    def test_error(self):
+        session = self._session(CallbackFutureMock([], error=ValueError('expected')))
+        self.assertRaises(ValueError, self._wait, session.execute_graph_aio('g.V()'))
+
+    def test_cancel(self):
+        session = self._session(CallbackFutureMock([[1]]))
+        aio_future = session.execute_graph_aio('g.V()')
+        aio_future.cancel()
+        self.loop.run_until_complete(asyncio.sleep(0.05))  # late result is discarded
+        self.assertTrue(aio_future.cancelled())
+
+    def test_pages(self):
+        future = CallbackFutureMock([[1, 2], [3], [4, 5]])
+        pages = self._session(future).execute_graph_aio_pages('g.V()')
+        self.assertIs(pages.__aiter__(), pages)
+
+        session_callback = Mock()  # such as metrics, registered by execute_graph_async
+        future.callbacks.append((session_callback, session_callback, (), ()))
+        results = []
+        while True:
+            try:
+                results.append(self._wait(pages.__anext__()))
+            except StopAsyncIteration:
+                break
+            self.assertEqual(len(future.callbacks), 2)
+        self.assertEqual(results, [GraphPage([1, 2], '0'), GraphPage([3], '1'), GraphPage([4, 5], None)])
+        self.assertEqual(session_callback.call_count, 2)  # still called for the pages after the first
+
+    def test_pages_error(self):
+        future = CallbackFutureMock([[1, 2], [3]])
+        pages = self._session(future).execute_graph_aio_pages('g.V()')
+        self.assertEqual(self._wait(pages.__anext__()), GraphPage([1, 2], '0'))
+        future.error = ValueError('expected')
+        self.assertRaises(ValueError, self._wait, pages.__anext__())
+
+
+class SessionGraphMetricsTests(unittest.TestCase):
+
+    def setUp(self):
+        self.session = graph_session(
+            lambda *args, **kwargs: InFlightFutureMock([('{"result": 1}',)], kwargs['execution_profile'].row_factory),
+            lambda ep: self.profile)
+        self.session.graph_metrics = GraphMetrics()
+        self.profile = GraphExecutionProfile(graph_options=GraphOptions(graph_name='g'))
+
+    def snapshot(self):
+        return self.session.graph_metrics.snapshot()[('graph_default', 'g')]
+
+    def test_metrics(self):
+        futures = [self.session.execute_graph_async('g.V()') for _ in range(3)]
+        self.assertEqual(self.snapshot()['in_flight'], 3)
+        futures[0].complete()
+        futures[1].complete(OperationTimedOut())
+        snapshot = self.snapshot()
+        self.assertEqual((snapshot['requests'], snapshot['errors'], snapshot['timeouts'], snapshot['in_flight']),
+                         (2, 1, 1, 1))
+
+    def test_coalesced(self):
+        self.profile.coalesce_requests = True
+        future = self.session.execute_graph_async('g.V()')
+        self.assertIs(self.session.execute_graph_async('g.V()'), future)
+        future.complete()
+        self.assertEqual(self.snapshot()['requests'], 2)
+
+    def test_invalid_request(self):
+        self.assertRaises(ValueError, self.session.execute_graph_async, 'g.V()', ['not', 'a', 'dict'])
+        self.assertRaises(ValueError, self.session.execute_graph_async, 'g.V()', ['not', 'a', 'dict'])
+        snapshot = self.snapshot()
+        self.assertEqual((snapshot['requests'], snapshot['errors'], snapshot['in_flight']), (2, 2, 0))
+
+
+class SessionGraphTimingsTests(unittest.TestCase):
+
+    def setUp(self):
+        self.session = graph_session(
+            lambda *args, **kwargs: InFlightFutureMock([('{"result": 1}',)], kwargs['execution_profile'].row_factory))
+        self.session.record_graph_timings = True
+        self.reported = []
+        self.session.graph_timings_callback = self.reported.append
+
+    def test_timings(self):
+        future = self.session.execute_graph_async('g.V()', {'a': 1}, execution_profile=GraphExecutionProfile())
+        timings = future.graph_timings
+        self.assertEqual(timings.query.query_string, 'g.V()')
+        self.assertIsNotNone(timings.encode_time)
+        self.assertIsNotNone(timings.sent)
+        self.assertEqual((timings.response_received, timings.total_time), (None, None))
+
+        future.complete()
+        self.assertEqual(self.reported, [timings])
+        self.assertTrue(timings.started <= timings.encoded <= timings.sent <= timings.response_received <=
+                        timings.decoded)
+        self.assertIsNone(timings.analytics_master_lookup_time)
+        self.assertIn('total=', repr(timings))
+
+        future.complete()  # next page
+        self.assertEqual(self.reported, [timings])
+
+    def test_error(self):
+        future = self.session.execute_graph_async('g.V()', execution_profile=GraphExecutionProfile())
+        error = OperationTimedOut()
+        future.complete(error)
+        self.assertIs(self.reported[0].exception, error)
+        self.assertIsNone(self.reported[0].decoded)
+
+    def test_callback_error(self):
+        self.session.graph_timings_callback = Mock(side_effect=RuntimeError)
+        future = self.session.execute_graph_async('g.V()', execution_profile=GraphExecutionProfile())
+        future.complete()
+        self.assertEqual(self.session.graph_timings_callback.call_count, 1)
+
+    def test_disabled(self):
+        self.session.record_graph_timings = False
+        future = self.session.execute_graph_async('g.V()', execution_profile=GraphExecutionProfile())
+        self.assertIsNone(future.graph_timings)
+        future.complete()
+        self.assertEqual(self.reported, [])
@@ -0,0 +1,137 @@
+# Copyright 2016 DataStax, Inc.
+#
+# Licensed under the DataStax DSE Driver License;
+# you may not use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+# http://www.datastax.com/terms/datastax-dse-driver-license-terms
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest  # noqa
+
+from mock import patch
+from random import random
+from threading import Thread
+import time
+
+from dse.cluster import EXEC_PROFILE_GRAPH_DEFAULT
+from dse.concurrent import execute_graph_concurrent, GraphExecutionStats
+
+
+class GraphFutureMock(object):
+
+    _col_names = None
+    _col_types = None
+    has_more_pages = False
+
+    def __init__(self, rows, error=None, delay=0):
+        self.rows = rows
+        self.error = error
+        self.delay = delay
+
+    def add_callbacks(self, callback, errback, callback_args=(), errback_args=()):
+        def complete():
+            time.sleep(self.delay)
+            if self.error:
+                errback(self.error, *errback_args)
+            else:
+                callback(self.rows, *callback_args)
+        Thread(target=complete).start()
+
+    def clear_callbacks(self):
+        pass
+
+
+class GraphSessionMock(object):
+    """
+    Echoes the 'i' parameter as the only row of each result; fails for indexes in ``errors``,
+    and raises on submission for indexes in ``raises``
+    """
+
+    def __init__(self, errors=(), raises=(), delay=False):
+        self.errors = errors
+        self.raises = raises
+        self.delay = delay
+        self.profiles = set()
+
+    def execute_graph_async(self, statement, parameters=None, execution_profile=None):
+        self.profiles.add(execution_profile)
+        i = parameters['i']
+        if i in self.raises:
+            raise RuntimeError(i)
+        return GraphFutureMock([i], RuntimeError(i) if i in self.errors else None,
+                               delay=random() / 100 if self.delay else 0)
+
+    def submit(self, fn, *args, **kwargs):
+        Thread(target=fn, args=args, kwargs=kwargs).start()
+
+
+def statements(n):
+    return [('g.V()', {'i': i}) for i in range(n)]
+
+
+class ExecuteGraphConcurrentTests(unittest.TestCase):
+
+    def assert_rows(self, results, expected):
+        self.assertEqual([(success, list(result) if success else result.args[0]) for success, result in results],
+                         expected)
+
+    def test_list_results(self):
+        session = GraphSessionMock(delay=True)
+        results = execute_graph_concurrent(session, statements(50), concurrency=5)
+        self.assert_rows(results, [(True, [i]) for i in range(50)])
+        self.assertEqual(session.profiles, set([EXEC_PROFILE_GRAPH_DEFAULT]))
+
+    def test_generator_results(self):
+        results = execute_graph_concurrent(GraphSessionMock(delay=True), statements(50), concurrency=5,
+                                           results_generator=True)
+        self.assertNotIsInstance(results, list)
+        self.assert_rows(results, [(True, [i]) for i in range(50)])
+
+    def test_unordered_results(self):
+        results = list(execute_graph_concurrent(GraphSessionMock(delay=True), statements(50), concurrency=5,
+                                                ordered=False))
+        self.assertEqual(sorted(idx for idx, _ in results), list(range(50)))
+        for idx, (success, result) in results:
+            self.assertTrue(success)
+            self.assertEqual(list(result), [idx])
+
+    def test_errors(self):
+        session = GraphSessionMock(errors=(3,), raises=(7,))
+        results = execute_graph_concurrent(session, statements(10), concurrency=3, raise_on_first_error=False)
+        self.assert_rows(results, [(True, [i]) if i not in (3, 7) else (False, i) for i in range(10)])
+
+        for kwargs in ({}, {'results_generator': True}, {'ordered': False}):
+            self.assertRaises(RuntimeError, lambda: list(execute_graph_concurrent(session, statements(10), **kwargs)))
+
+    def test_invalid_concurrency(self):
+        self.assertRaises(ValueError, execute_graph_concurrent, GraphSessionMock(), statements(1), concurrency=0)
+
+    def test_empty(self):
+        self.assertEqual(execute_graph_concurrent(GraphSessionMock(), []), [])
+
+    def test_stats(self):
+        stats = GraphExecutionStats()
+        execute_graph_concurrent(GraphSessionMock(errors=(1, 2)), statements(20), raise_on_first_error=False,
+                                 stats=stats)
+        self.assertEqual(stats.requests, 20)
+        self.assertEqual(stats.errors, 2)
+        self.assertGreaterEqual(stats.elapsed, 0)
+        self.assertLessEqual(stats.latency_percentile(50), stats.latency_percentile(99))
+        self.assertIn('20 requests (2 errors)', str(stats))
+
+    def test_latency_clock(self):
+        # latencies are measured on the monotonic clock, not the wall clock
+        stats = GraphExecutionStats()
+        with patch('dse.concurrent._clock', return_value=100.0):
+            execute_graph_concurrent(GraphSessionMock(delay=True), statements(5), stats=stats)
+        self.assertEqual(stats.requests, 5)
+        self.assertEqual(stats.mean_latency, 0.0)
+
+    def test_empty_stats(self):
+        stats = GraphExecutionStats()
+        self.assertEqual((stats.elapsed, stats.throughput, stats.mean_latency, stats.latency_percentile(99)),
+                         (0.0, 0.0, 0.0, 0.0))
@@ -16,10 +16,27 @@ except ImportError:
 import json
 import six
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 from cassandra.policies import RetryPolicy
 from dse.graph import (SimpleGraphStatement, GraphOptions, Result, VertexProperty,
                        _graph_options, graph_result_row_factory, single_object_row_factory,
-                       Vertex, Edge, Path)
+                       graph_object_row_factory, graph_lazy_result_row_factory, graph_columnar_row_factory,
+                       graph_element_row_factory, graph_projection_row_factory,
+                       LazyResult, Vertex, Edge, Path, VertexId,
+                       register_json_codec, set_json_codec, get_json_codec, GraphParameterEncoder)
+from dse.util import Point, LineString, Polygon
+import dse.graph
+
+from cassandra.cqltypes import UTF8Type
+
+import datetime
+from decimal import Decimal
+import pickle
+import uuid
 
 
 class GraphResultTests(unittest.TestCase):
@@ -226,6 +243,82 @@ class GraphTypeTests(unittest.TestCase):
         self.assertEqual(eval(repr(path)), path)
 
 
+    def test_no_instance_dict(self):
+        vertex = Vertex('id_val', 'label_val', 'vertex', {'name': [{'value': 'val'}]})
+        edge = Edge('id_val', 'label_val', 'edge', {}, 'inV_val', 'inVLabel_val', 'outV_val', 'outVLabel_val')
+        path = Path([['a']], [])
+        for o in (vertex, vertex.properties['name'][0], edge, path):
+            self.assertFalse(hasattr(o, '__dict__'))
+            self.assertRaises(AttributeError, setattr, o, 'not_an_attribute', None)
+
+
+class VertexIdTests(unittest.TestCase):
+
+    id_dict = {'~label': 'person', 'community_id': 1368843392, 'member_id': 0}
+
+    def test_mapping(self):
+        vertex_id = VertexId(self.id_dict)
+        self.assertEqual(dict(vertex_id), self.id_dict)
+        self.assertEqual(len(vertex_id), 3)
+        self.assertEqual(vertex_id['community_id'], 1368843392)
+        self.assertIn('member_id', vertex_id)
+        self.assertIsNone(vertex_id.get('sensor_id'))
+        self.assertRaises(KeyError, vertex_id.__getitem__, 'sensor_id')
+        self.assertEqual(vertex_id.label, 'person')
+        with self.assertRaises(TypeError):
+            vertex_id['member_id'] = 1
+
+    def test_equality(self):
+        vertex_id = VertexId(self.id_dict)
+        self.assertEqual(vertex_id, self.id_dict)
+        self.assertEqual(self.id_dict, vertex_id)
+        self.assertEqual(vertex_id, VertexId(dict(self.id_dict)))
+        self.assertNotEqual(vertex_id, VertexId(dict(self.id_dict, member_id=1)))
+        self.assertNotEqual(vertex_id, dict(self.id_dict, member_id=1))
+        self.assertNotEqual(vertex_id, 'person')
+
+    def test_hashable(self):
+        ids = [VertexId(dict(self.id_dict, member_id=i % 3)) for i in range(9)]
+        self.assertEqual(len(set(ids)), 3)
+        self.assertEqual(hash(VertexId(self.id_dict)), hash(VertexId(dict(self.id_dict))))
+        joined = dict((vertex_id, i) for i, vertex_id in enumerate(ids))
+        self.assertEqual(joined[VertexId(self.id_dict)], 6)
+
+    def test_ordering(self):
+        ids = [VertexId(dict(self.id_dict, member_id=i)) for i in (2, 0, 1)]
+        self.assertEqual([i['member_id'] for i in sorted(ids)], [0, 1, 2])
+        self.assertTrue(ids[1] < ids[0])
+        self.assertTrue(ids[0] >= ids[2])
+
+    def test_partition_key(self):
+        self.assertEqual(VertexId(self.id_dict).partition_key(), (1368843392,))
+        partition_keys = {'sensor': (('sensor_id', UTF8Type), ('bucket', UTF8Type))}
+        sensor_id = VertexId({'~label': 'sensor', 'sensor_id': 's1', 'bucket': '2016-09', 'time': 0})
+        self.assertEqual(sensor_id.partition_key(partition_keys), ('s1', '2016-09'))
+        self.assertEqual(VertexId(self.id_dict).partition_key(partition_keys), (1368843392,))
+        self.assertRaises(KeyError, VertexId({'~label': 'sensor', 'sensor_id': 's1'}).partition_key, partition_keys)
+
+    def test_no_instance_dict(self):
+        self.assertRaises(AttributeError, setattr, VertexId(self.id_dict), 'x', 1)
+
+    def test_pickle(self):
+        vertex_id = VertexId(self.id_dict)
+        self.assertEqual(pickle.loads(pickle.dumps(vertex_id, 2)), vertex_id)
+
+    def test_repr(self):
+        self.assertEqual(eval(repr(VertexId(self.id_dict))), VertexId(self.id_dict))
+
+    def test_elements(self):
+        in_id = dict(self.id_dict, member_id=1)
+        vertex = Vertex(self.id_dict, 'person', 'vertex', {})
+        edge = Edge('e', 'knows', 'edge', {}, in_id, 'person', self.id_dict, 'person')
+        self.assertIsInstance(vertex.id, VertexId)
+        self.assertIsInstance(edge.inV, VertexId)
+        self.assertIsInstance(edge.outV, VertexId)
+        self.assertEqual(edge.outV, vertex.id)
+        self.assertEqual(Vertex('id', 'person', 'vertex', {}).id, 'id')  # other id types are left as is
+
+
 class GraphOptionTests(unittest.TestCase):
 
     opt_mapping = dict((t[0], t[2]) for t in _graph_options if not t[0].endswith('consistency_level'))  # cl excluded from general tests because it requires mapping to names
@@ -365,6 +458,22 @@ class GraphStatementTests(unittest.TestCase):
         kwargs['bogus'] = object()
         self.assertRaises(TypeError, SimpleGraphStatement, **kwargs)
 
+    def test_routing_vertex_id(self):
+        statement = SimpleGraphStatement('g.V(vid)')
+        self.assertIsNone(statement._routing_vertex_id)
+        vertex_id = {'~label': 'person', 'community_id': 1234, 'member_id': 0}
+        statement.set_routing_vertex_id(vertex_id)
+        self.assertIs(statement._routing_vertex_id, vertex_id)
+        statement.set_routing_vertex_id(None)
+        self.assertIsNone(statement._routing_vertex_id)
+
+
+def graph_rows(objects):
+    """
+    Rows of graph results, as received from the server
+    """
+    return [(json.dumps({'result': o}),) for o in objects]
+
 
 class GraphRowFactoryTests(unittest.TestCase):
 
@@ -380,3 +489,300 @@ class GraphRowFactoryTests(unittest.TestCase):
         for i, res in enumerate(results):
             self.assertIsInstance(res, Result)
             self.assertEqual(res.value, i)
+
+
+class GraphElementRowFactoryTests(unittest.TestCase):
+
+    vertex_dict = {'id': {'member_id': 0, 'community_id': 1}, 'label': 'person', 'type': 'vertex',
+                   'properties': {'name': [{'id': 'x', 'value': 'val', 'properties': {'meta': 1}}]}}
+    edge_dict = {'id': 'e', 'label': 'knows', 'type': 'edge', 'properties': {'weight': 0.5},
+                 'inV': 'in', 'inVLabel': 'person', 'outV': 'out', 'outVLabel': 'person'}
+
+    def test_same_as_object_row_factory(self):
+        rows = graph_rows([self.vertex_dict, self.edge_dict, 1, 'text', None, {'a': [1, 2]}])
+        expected = list(graph_object_row_factory(None, rows))
+        results = graph_element_row_factory(None, rows)
+        self.assertEqual(results, expected)
+        self.assertIsInstance(results[0], Vertex)
+        self.assertIsInstance(results[1], Edge)
+        self.assertEqual(results[0].properties['name'][0], VertexProperty('val', {'meta': 1}))
+        for res in results[2:]:
+            self.assertIsInstance(res, Result)
+
+    def test_malformed_element(self):
+        # left as a map rather than failing the whole page, since element-like maps may be nested anywhere
+        results = graph_element_row_factory(None, graph_rows([{'type': 'vertex'}]))
+        self.assertEqual(results, [Result({'type': 'vertex'})])
+
+    def test_vertex_ids_interned(self):
+        edge_dict = dict(self.edge_dict, inV={'member_id': 0, 'community_id': 1},
+                         outV={'member_id': 1, 'community_id': 1})
+        other_vertex = dict(self.vertex_dict, id={'member_id': 1, 'community_id': 1})
+        rows = graph_rows([self.vertex_dict, edge_dict, other_vertex])
+        for factory in (graph_element_row_factory, graph_object_row_factory, graph_projection_row_factory(['name'])):
+            vertex, edge, other = factory(None, rows)
+            self.assertIsInstance(vertex.id, VertexId)
+            self.assertIs(edge.inV, vertex.id)
+            self.assertIs(edge.outV, other.id)
+
+    def test_unhashable_vertex_id(self):
+        unhashable_id = {'~label': 'person', 'community_id': 1, 'member_id': [0, 1]}
+        rows = graph_rows([dict(self.vertex_dict, id=unhashable_id)])
+        for factory in (graph_element_row_factory, graph_object_row_factory):
+            vertex, = factory(None, rows)
+            self.assertIs(type(vertex.id), dict)
+            self.assertEqual(vertex.id, unhashable_id)
+
+    def test_nested_elements(self):
+        path_dict = {'labels': [['a'], []], 'objects': [self.vertex_dict, self.edge_dict]}
+        path_result, list_result = graph_element_row_factory(None, graph_rows([path_dict, [self.vertex_dict]]))
+        self.assertEqual(path_result.as_path(), Result(path_dict).as_path())
+        self.assertIsInstance(list_result[0], Vertex)
+
+    def test_decoders(self):
+        path_dict = {'labels': [['a'], []], 'objects': [self.vertex_dict, self.edge_dict]}
+        rows = graph_rows([self.vertex_dict, self.edge_dict, path_dict, {'a': [self.edge_dict]}, {'type': 'vertex'}, 1])
+        codec = get_json_codec()
+        try:
+            set_json_codec(decoder='json')
+            expected = graph_element_row_factory(None, rows)
+            for name in dse.graph._json_codecs:
+                if dse.graph._json_codecs[name][0]:
+                    set_json_codec(decoder=name)
+                    results = graph_element_row_factory(None, rows)
+                    self.assertEqual(results, expected, name)
+                    self.assertEqual([type(r) for r in results], [Vertex, Edge, Result, Result, Result, Result], name)
+                    self.assertIsInstance(results[3].value['a'][0], Edge, name)
+        finally:
+            set_json_codec(*codec)
+
+
+class GraphProjectionRowFactoryTests(unittest.TestCase):
+
+    def test_elements(self):
+        vertex_dict = {'id': 1, 'label': 'person', 'type': 'vertex',
+                       'properties': dict(('p%d' % i, [{'value': i}]) for i in range(10))}
+        edge_dict = {'id': 2, 'label': 'knows', 'type': 'edge', 'properties': {'p1': 1, 'p2': 2},
+                     'inV': 3, 'inVLabel': 'person', 'outV': 4, 'outVLabel': 'person'}
+        factory = graph_projection_row_factory(['p1', 'p3', 'not_there'])
+        vertex, edge = factory(None, graph_rows([vertex_dict, edge_dict]))
+
+        self.assertEqual(vertex, Vertex(1, 'person', 'vertex', {'p1': [{'value': 1}], 'p3': [{'value': 3}]}))
+        self.assertEqual(edge, Edge(2, 'knows', 'edge', {'p1': 1}, 3, 'person', 4, 'person'))
+
+    def test_other_results(self):
+        factory = graph_projection_row_factory(['a', 'c'])
+        results = factory(None, graph_rows([{'a': 1, 'b': 2}, [1, 2], 'text', {'type': 'other', 'c': 0}]))
+        self.assertEqual(results, [Result({'a': 1}), Result([1, 2]), Result('text'), Result({'c': 0})])
+
+        self.assertRaises(TypeError, factory, None, graph_rows([{'type': 'vertex'}]))
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class GraphColumnarRowFactoryTests(unittest.TestCase):
+
+    def test_vertex_columns(self):
+        vertices = [{'id': {'member_id': i}, 'label': 'person', 'type': 'vertex',
+                     'properties': {'age': [{'value': 20 + i}, {'value': 0}], 'score': [{'value': i / 2.0}],
+                                    'name': [{'value': 'n%d' % i}], 'ignored': [{'value': 1}]}}
+                    for i in range(5)]
+        del vertices[2]['properties']['score']
+        del vertices[3]['properties']['age']
+        factory = graph_columnar_row_factory({'age': 'i4', 'score': 'f8', 'name': 'U8'}, fill_values={'age': -1})
+        page = factory(None, graph_rows(vertices))
+
+        self.assertEqual(sorted(page), ['age', 'id', 'label', 'name', 'score'])
+        self.assertEqual(list(page['id']), [{'member_id': i} for i in range(5)])
+        self.assertEqual(list(page['label']), ['person'] * 5)
+        self.assertEqual(page['age'].dtype, np.dtype('i4'))
+        self.assertEqual(list(page['age']), [20, 21, 22, -1, 24])
+        self.assertEqual(list(page['name']), ['n%d' % i for i in range(5)])
+        self.assertTrue(np.isnan(page['score'][2]))
+        self.assertEqual(page['score'][4], 2.0)
+
+    def test_edge_columns(self):
+        edges = [{'id': i, 'label': 'knows', 'type': 'edge', 'properties': {'weight': i * 0.25}} for i in range(3)]
+        edges.append({'id': 3, 'label': 'knows', 'type': 'edge'})
+        page = graph_columnar_row_factory([('weight', float), ('since', object)])(None, graph_rows(edges))
+        self.assertEqual(list(page['weight'][:3]), [0, 0.25, 0.5])
+        self.assertTrue(np.isnan(page['weight'][3]))
+        self.assertEqual(list(page['since']), [None] * 4)
+
+    def test_empty_page(self):
+        page = graph_columnar_row_factory({'age': int})(None, [])
+        self.assertEqual([len(c) for c in page.values()], [0, 0, 0])
+
+
+class LazyResultTests(unittest.TestCase):
+
+    def _make_result(self, value):
+        return LazyResult(json.dumps({'result': value}))
+
+    def test_result_value(self):
+        for v in GraphResultTests._values:
+            result = self._make_result(v)
+            self.assertEqual(result.value, v)
+            self.assertEqual(result, Result(v))
+
+    def test_as_vertex(self):
+        vertex_dict = {'id': 1, 'label': 'l', 'type': 'vertex', 'properties': {'name': [{'value': 'val'}]}}
+        vertex = self._make_result(vertex_dict).as_vertex()
+        self.assertEqual(vertex, Result(vertex_dict).as_vertex())
+
+    def test_decoded_on_access(self):
+        result = self._make_result({'a': 1})
+        self.assertFalse(result.is_decoded)
+        self.assertEqual(result.a, 1)
+        self.assertTrue(result.is_decoded)
+
+        for access in (lambda r: r.value, lambda r: r['a'], str):
+            result = self._make_result({'a': 1})
+            access(result)
+            self.assertTrue(result.is_decoded)
+
+    def test_lazy_row_factory(self):
+        col_names = []  # unused
+        rows = [json.dumps({'result': i}) for i in range(10)]
+        results = graph_lazy_result_row_factory(col_names, ((o,) for o in rows))
+        self.assertEqual(len(results), 10)
+        self.assertFalse(any(r.is_decoded for r in results))
+        self.assertEqual(results[3].value, 3)
+        self.assertEqual([r.is_decoded for r in results], [i == 3 for i in range(10)])
+        self.assertEqual([r.value for r in results], list(range(10)))
+
+
+class JSONCodecTests(unittest.TestCase):
+
+    def setUp(self):
+        self._codec = get_json_codec()
+
+    def tearDown(self):
+        set_json_codec(*self._codec)
+        dse.graph._json_codecs.pop('unit_test', None)
+
+    def test_default_codec(self):
+        decoder, encoder = get_json_codec()
+        self.assertIn(decoder, dse.graph._json_codecs)
+        self.assertIn(encoder, dse.graph._json_codecs)
+
+    def test_unknown_codec(self):
+        self.assertRaises(ValueError, set_json_codec, decoder='not_a_codec')
+        self.assertRaises(ValueError, set_json_codec, encoder='not_a_codec')
+        self.assertEqual(get_json_codec(), self._codec)
+
+    def test_one_way_codec(self):
+        register_json_codec('unit_test', loads=json.loads)
+        set_json_codec(decoder='unit_test')
+        self.assertEqual(get_json_codec(), ('unit_test', self._codec[1]))
+        self.assertRaises(ValueError, set_json_codec, encoder='unit_test')
+
+    def test_encoders_equivalent(self):
+        class Celsius(object):
+            def __init__(self, degrees):
+                self.degrees = degrees
+
+            def toDict(self):
+                return {'degrees': self.degrees}
+
+            def __json__(self):
+                return '{"degrees": %d}' % (self.degrees,)
+
+        encoder = GraphParameterEncoder()
+        encoder.register(Celsius, lambda c: '%dC' % (c.degrees,))
+        params = {'decimal': Decimal('1.10000000000000000001'), 'celsius': [Celsius(20)], 'set': frozenset([1]),
+                  'big': 2 ** 70, 'text': u'\u00e9', 'nested': {'a': [1, 2.5, None, True]}}
+        set_json_codec(encoder='json')
+        expected = encoder.encode(params)
+        self.assertEqual(json.loads(expected.decode('utf-8'))['decimal'], '1.10000000000000000001')
+        for name in dse.graph._json_codecs:
+            if dse.graph._json_codecs[name][1]:
+                set_json_codec(encoder=name)
+                self.assertEqual(json.loads(encoder.encode(params).decode('utf-8')),
+                                 json.loads(expected.decode('utf-8')), name)
+
+    def test_codecs_equivalent(self):
+        vertex = {'id': 1, 'label': 'l', 'type': 'vertex', 'properties': {'p': [{'value': 2 ** 70}]}}
+        rows = graph_rows(list(GraphResultTests._values) + [vertex])
+        params = {'a': [1, 2.5, None, True], 'b': {'c': u'\u00e9'}, 1: float('inf')}
+        for name in dse.graph._json_codecs:
+            loads, dumps = dse.graph._json_codecs[name]
+            if loads:
+                set_json_codec(decoder=name)
+                self.assertEqual([r.value for r in graph_result_row_factory(None, rows)],
+                                 [json.loads(r[0])['result'] for r in rows])
+                self.assertEqual(list(graph_object_row_factory(None, rows))[-1].properties['p'][0].value, 2 ** 70)
+            if dumps:
+                self.assertEqual(json.loads(dumps(params).decode('utf-8')), json.loads(json.dumps(params)))
+
+    def test_fallback(self):
+        def loads(s):
+            raise ValueError()
+
+        def dumps(obj, default):
+            raise TypeError()
+
+        register_json_codec('unit_test', loads, dumps)
+        set_json_codec('unit_test', 'unit_test')
+        rows = graph_rows(range(3))
+        self.assertEqual([r.value for r in graph_result_row_factory(None, rows)], [0, 1, 2])
+        self.assertRaises(ValueError, graph_result_row_factory, None, [('{',)])
+        self.assertEqual(dse.graph._json_dumps({'a': 1}), json.dumps({'a': 1}).encode('utf-8'))
+
+
+class GraphParameterEncoderTests(unittest.TestCase):
+
+    def setUp(self):
+        self._codec = get_json_codec()
+
+    def tearDown(self):
+        set_json_codec(*self._codec)
+
+    def test_default_handlers(self):
+        u = uuid.uuid4()
+        params = {'point': Point(1, 2),
+                  'line': LineString(((1, 2), (3, 4))),
+                  'polygon': Polygon([(10.0, 10.0), (80.0, 10.0), (80., 88.0), (10., 89.0), (10., 10.)]),
+                  'uuid': u,
+                  'datetime': datetime.datetime(2016, 9, 13, 10, 30, 5, 123000),
+                  'date': datetime.date(2016, 9, 13),
+                  'time': datetime.time(10, 30),
+                  'decimal': Decimal('1.10000000000000000001'),
+                  'set': set([1]),
+                  'nested': [{'frozen': frozenset(['a'])}],
+                  'vertex_id': VertexId({'~label': 'person', 'community_id': 1, 'member_id': 0})}
+        expected = {'point': str(params['point']),
+                    'line': str(params['line']),
+                    'polygon': str(params['polygon']),
+                    'uuid': str(u),
+                    'datetime': '2016-09-13T10:30:05.123000',
+                    'date': '2016-09-13',
+                    'time': '10:30:00',
+                    'decimal': '1.10000000000000000001',
+                    'set': [1],
+                    'nested': [{'frozen': ['a']}],
+                    'vertex_id': {'~label': 'person', 'community_id': 1, 'member_id': 0}}
+        self.assertTrue(expected['point'].startswith('POINT'))
+        encoder = GraphParameterEncoder()
+        for name in dse.graph._json_codecs:
+            if dse.graph._json_codecs[name][1]:
+                set_json_codec(encoder=name)
+                self.assertEqual(json.loads(encoder.encode(params).decode('utf-8')), expected, name)
+
+    def test_register(self):
+        class Money(Decimal):
+            pass
+
+        class Celsius(object):
+            def __init__(self, degrees):
+                self.degrees = degrees
+
+        set_json_codec(encoder='json')
+        encoder = GraphParameterEncoder()
+        self.assertEqual(json.loads(encoder.encode({'m': Money('2.10')}).decode('utf-8')), {'m': '2.10'})  # subclass
+        self.assertRaises(TypeError, encoder.encode, {'t': Celsius(20)})
+
+        u = uuid.uuid4()
+        encoder.register(Celsius, lambda c: '%dC' % (c.degrees,))
+        encoder.register(uuid.UUID, lambda v: v.hex)
+        self.assertEqual(json.loads(encoder.encode({'t': Celsius(20), 'u': u}).decode('utf-8')),
+                         {'t': '20C', 'u': u.hex})
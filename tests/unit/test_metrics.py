@@ -0,0 +1,124 @@
+# Copyright 2016 DataStax, Inc.
+#
+# Licensed under the DataStax DSE Driver License;
+# you may not use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+# http://www.datastax.com/terms/datastax-dse-driver-license-terms
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest  # noqa
+
+from cassandra import OperationTimedOut, ReadTimeout
+from mock import Mock
+from dse.cluster import GraphExecutionProfile, EXEC_PROFILE_GRAPH_DEFAULT, EXEC_PROFILE_GRAPH_ANALYTICS_DEFAULT
+from dse.metrics import GraphMetrics, LatencyHistogram
+
+
+class LatencyHistogramTests(unittest.TestCase):
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        latencies = [i / 10000.0 for i in range(1, 1001)]  # 0.1ms to 100ms
+        histogram._record_all(latencies)
+        self.assertEqual(histogram.count, 1000)
+        for percentile in (50, 75, 95, 99):
+            expected = latencies[int(len(latencies) * percentile / 100.0) - 1]
+            self.assertAlmostEqual(histogram.percentile(percentile), expected, delta=expected * 0.04)
+        self.assertEqual(histogram.percentile(100), 0.1)
+
+    def test_summary(self):
+        histogram = LatencyHistogram()
+        for latency in (0.000001, 0.002, 0.003):
+            histogram.record(latency)
+        summary = histogram.summary()
+        self.assertEqual((summary['min'], summary['max']), (0.000001, 0.003))
+        self.assertAlmostEqual(summary['mean'], 0.005001 / 3)
+        self.assertTrue(summary['min'] <= summary['p50'] <= summary['p99'] <= summary['max'])
+
+    def test_out_of_range(self):
+        histogram = LatencyHistogram()
+        histogram.record(-0.001)  # clock adjustment
+        histogram.record(100000.0)
+        self.assertEqual(histogram.count, 2)
+        self.assertEqual(histogram.percentile(0), 0.0)
+        self.assertEqual(histogram.percentile(100), 100000.0)
+
+    def test_empty(self):
+        summary = LatencyHistogram().summary()
+        self.assertEqual(set(summary), set(['min', 'mean', 'max', 'p50', 'p75', 'p95', 'p99', 'p999']))
+        self.assertEqual(set(summary.values()), set([0.0]))
+
+
+class GraphMetricsTests(unittest.TestCase):
+
+    def test_counters(self):
+        metrics = GraphMetrics()
+        stats, first = metrics._start_request(EXEC_PROFILE_GRAPH_DEFAULT, b'graph')
+        _, second = metrics._start_request(EXEC_PROFILE_GRAPH_DEFAULT, b'graph')
+        _, third = metrics._start_request(EXEC_PROFILE_GRAPH_DEFAULT, b'graph')
+        _, fourth = metrics._start_request(EXEC_PROFILE_GRAPH_DEFAULT, b'graph')
+
+        stats.on_success([], first, None)
+        stats.on_success([], first, None)  # next page
+        stats.on_error(OperationTimedOut(), second, None)
+        stats.on_error(ReadTimeout('timeout'), third, None)
+        snapshot = metrics.snapshot()[('graph_default', 'graph')]
+        self.assertEqual((snapshot['requests'], snapshot['errors'], snapshot['timeouts'], snapshot['in_flight']),
+                         (3, 2, 2, 1))
+
+        stats.on_error(RuntimeError(), fourth, None)
+        snapshot = metrics.snapshot()[('graph_default', 'graph')]
+        self.assertEqual((snapshot['requests'], snapshot['errors'], snapshot['timeouts'], snapshot['in_flight']),
+                         (4, 3, 2, 0))
+        self.assertGreaterEqual(snapshot['latency']['max'], snapshot['latency']['min'])
+
+    def test_errors_batched(self):
+        metrics = GraphMetrics()
+        stats, _ = metrics._start_request(EXEC_PROFILE_GRAPH_DEFAULT, b'graph')
+        for _ in range(stats._batch_size):
+            stats.on_error(RuntimeError(), metrics._start_request(EXEC_PROFILE_GRAPH_DEFAULT, b'graph')[1], None)
+        self.assertEqual(len(stats._completed), 0)
+        self.assertEqual(stats.latency.count, stats._batch_size)
+
+    def test_wasted_attempts(self):
+        metrics = GraphMetrics()
+        stats, first = metrics._start_request(EXEC_PROFILE_GRAPH_DEFAULT, b'graph')
+        _, second = metrics._start_request(EXEC_PROFILE_GRAPH_DEFAULT, b'graph')
+        _, third = metrics._start_request(EXEC_PROFILE_GRAPH_DEFAULT, b'graph')
+        stats.on_success([], first, Mock(attempted_hosts=['h1']))
+        stats.on_success([], second, Mock(attempted_hosts=['h1', 'h2', 'h3']))
+        stats.on_error(OperationTimedOut(), third, Mock(attempted_hosts=['h1', 'h2']))
+        self.assertEqual(metrics.snapshot()[('graph_default', 'graph')]['wasted_attempts'], 3)
+
+    def test_keys(self):
+        metrics = GraphMetrics()
+        metrics._start_request(EXEC_PROFILE_GRAPH_DEFAULT, b'a')
+        metrics._start_request(EXEC_PROFILE_GRAPH_DEFAULT, b'b')
+        metrics._start_request(EXEC_PROFILE_GRAPH_ANALYTICS_DEFAULT, b'a')
+        metrics._start_request('custom', None)
+        profile = GraphExecutionProfile()
+        metrics._start_request(profile, b'a')
+        self.assertEqual(set(metrics.snapshot()),
+                         set([('graph_default', 'a'), ('graph_default', 'b'), ('graph_analytics_default', 'a'),
+                              ('custom', None), ('GraphExecutionProfile@%x' % (id(profile),), 'a')]))
+
+    def test_profile_instances(self):
+        metrics = GraphMetrics()
+        first, second = GraphExecutionProfile(), GraphExecutionProfile()
+        for profile in (first, second, second):
+            stats, request = metrics._start_request(profile, b'graph')
+            stats.on_success([], request, None)
+        snapshot = metrics.snapshot()
+        self.assertEqual(len(snapshot), 2)
+        self.assertEqual(sorted(s['requests'] for s in snapshot.values()), [1, 2])
+
+    def test_reset(self):
+        metrics = GraphMetrics()
+        stats, request = metrics._start_request(EXEC_PROFILE_GRAPH_DEFAULT, b'graph')
+        metrics.reset()
+        stats.on_success([], request, None)
+        self.assertEqual(metrics.snapshot(), {})
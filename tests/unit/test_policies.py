@@ -11,12 +11,12 @@ try:
 except ImportError:
     import unittest  # noqa
 
-from mock import Mock
+from mock import Mock, patch
 
 from cassandra.pool import Host
-from cassandra.policies import RoundRobinPolicy
+from cassandra.policies import RoundRobinPolicy, SimpleConvictionPolicy
 
-from dse.policies import DSELoadBalancingPolicy
+from dse.policies import DSELoadBalancingPolicy, LatencyAwarePolicy, WorkloadAwarePolicy, _workloads
 
 
 class ClusterMetaMock(object):
@@ -96,3 +96,127 @@ class DSELoadBalancingPolicyTest(unittest.TestCase):
             query_plan = list(policy.make_query_plan(None, Mock(target_host='127.0.0.1')))
             self.assertEqual(sorted(query_plan), hosts)
             self.assertEqual(query_plan[0], target_host)
+
+
+class ClockMock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class LatencyAwarePolicyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = ClockMock()
+        patcher = patch('dse.policies._clock', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.hosts = list(range(4))
+        self.policy = LatencyAwarePolicy(RoundRobinPolicy(), min_measurements=3)
+        self.policy.populate(Mock(), self.hosts)
+
+    def record(self, latencies, count=3):
+        for _ in range(count):
+            self.clock.now += 0.01
+            for host, latency in latencies.items():
+                self.policy.record_latency(host, latency)
+        self.clock.now += 1  # past the update interval of the fastest average
+
+    def plans(self):
+        return [list(self.policy.make_query_plan()) for _ in range(len(self.hosts))]
+
+    def test_no_latencies(self):
+        for plan in self.plans():
+            self.assertEqual(sorted(plan), self.hosts)
+
+    def test_slow_host_last(self):
+        self.record({0: 0.01, 1: 0.012, 2: 0.1, 3: 0.01})
+        for plan in self.plans():
+            self.assertEqual(sorted(plan), self.hosts)
+            self.assertEqual(plan[-1], 2)
+        self.assertEqual(set(plan[0] for plan in self.plans()), set([0, 1, 3]))  # others are still rotated
+
+    def test_min_measurements(self):
+        self.record({0: 0.01, 1: 0.01, 2: 0.1, 3: 0.01}, count=2)
+        self.assertNotEqual(set(plan[-1] for plan in self.plans()), set([2]))
+
+    def test_retry_period(self):
+        self.record({0: 0.01, 1: 0.01, 2: 0.1, 3: 0.01})
+        self.clock.now += self.policy.retry_period / 2
+        self.record({0: 0.01, 1: 0.01, 3: 0.01})
+        self.assertEqual(set(plan[-1] for plan in self.plans()), set([2]))
+
+        self.clock.now += self.policy.retry_period
+        self.record({0: 0.01, 1: 0.01, 3: 0.01})
+        self.assertNotEqual(set(plan[-1] for plan in self.plans()), set([2]))
+
+    def test_moving_average(self):
+        self.record({0: 0.01, 1: 0.01, 2: 0.1, 3: 0.01})
+        self.clock.now += self.policy.scale * 100
+        self.policy.record_latency(2, 0.01)  # the previous average has almost no weight after 100 * scale
+        average, count = self.policy.host_latencies()[2]
+        self.assertAlmostEqual(average, 0.01, delta=0.005)
+        self.assertEqual(count, 4)
+
+        self.policy.record_latency(2, 1.0)  # no time elapsed
+        self.assertAlmostEqual(self.policy.host_latencies()[2][0], average)
+
+    def test_host_up(self):
+        self.record({0: 0.01, 1: 0.01, 2: 0.1, 3: 0.01})
+        self.policy.on_down(2)
+        self.policy.on_up(2)
+        self.assertNotIn(2, self.policy.host_latencies())
+        self.clock.now += 1
+        self.assertNotEqual(set(plan[-1] for plan in self.plans()), set([2]))
+
+    def test_invalid_settings(self):
+        self.assertRaises(ValueError, LatencyAwarePolicy, RoundRobinPolicy(), exclusion_threshold=0.5)
+        self.assertRaises(ValueError, LatencyAwarePolicy, RoundRobinPolicy(), scale=0)
+
+
+class WorkloadAwarePolicyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.hosts = [Host('127.0.0.%d' % (i,), SimpleConvictionPolicy) for i in range(1, 6)]
+        self.hosts[0].dse_workloads = frozenset(['Cassandra'])
+        self.hosts[1].dse_workloads = frozenset(['Cassandra', 'Graph'])
+        self.hosts[2].dse_workloads = frozenset(['Analytics'])
+        self.hosts[3].dse_workload = 'SearchAnalytics'  # not read from the system tables yet
+        self.hosts[4].dse_workload = None
+
+    def plans(self, workloads):
+        policy = WorkloadAwarePolicy(RoundRobinPolicy(), workloads)
+        policy.populate(Mock(), self.hosts)
+        return [list(policy.make_query_plan()) for _ in range(len(self.hosts))]
+
+    def test_preferred_first(self):
+        for workloads, preferred in ((['Graph'], [1]), ('Cassandra', [0, 1]), (['Analytics'], [2, 3]),
+                                     (['Search', 'Graph'], [1, 3])):
+            preferred = set(self.hosts[i] for i in preferred)
+            for plan in self.plans(workloads):
+                self.assertEqual(set(plan), set(self.hosts))
+                self.assertEqual(set(plan[:len(preferred)]), preferred)
+
+    def test_fallback_order(self):
+        child = Mock(make_query_plan=Mock(side_effect=lambda *args: iter(self.hosts)))
+        policy = WorkloadAwarePolicy(child, ['Graph', 'Analytics'])
+        # other hosts follow, in the order of the child plan
+        self.assertEqual(list(policy.make_query_plan('ks', 'query')), [self.hosts[i] for i in (1, 2, 3, 0, 4)])
+        child.make_query_plan.assert_called_once_with('ks', 'query')
+
+    def test_no_preferred_host(self):
+        for plan in self.plans(['Unknown']):
+            self.assertEqual(set(plan), set(self.hosts))
+
+    def test_no_workloads(self):
+        self.assertRaises(ValueError, WorkloadAwarePolicy, RoundRobinPolicy(), [])
+
+    def test_workloads(self):
+        self.assertEqual(_workloads('Cassandra'), frozenset(['Cassandra']))
+        self.assertEqual(_workloads('Cassandra', graph=True), frozenset(['Cassandra', 'Graph']))
+        self.assertEqual(_workloads('SearchAnalytics'), frozenset(['Search', 'Analytics']))
+        self.assertEqual(_workloads('Analytics', workloads=set(['Analytics', 'Graph'])),
+                         frozenset(['Analytics', 'Graph']))
+        self.assertEqual(_workloads(None), frozenset())
@@ -0,0 +1,76 @@
+# Copyright 2016 DataStax, Inc.
+#
+# Licensed under the DataStax DSE Driver License;
+# you may not use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+# http://www.datastax.com/terms/datastax-dse-driver-license-terms
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest  # noqa
+
+import copy
+from mock import Mock
+import pickle
+
+from cassandra.query import SimpleStatement, BoundStatement, BatchStatement
+
+from dse.graph import SimpleGraphStatement
+from dse.query import HostTargetingStatement
+
+
+class HostTargetingStatementTest(unittest.TestCase):
+
+    def _statements(self):
+        batch = BatchStatement()
+        batch.add(SimpleStatement('INSERT'))
+        bound = BoundStatement(Mock(column_metadata=None, routing_key_indexes=None, is_idempotent=False,
+                                    consistency_level=None, serial_consistency_level=None, fetch_size=None,
+                                    custom_payload=None, retry_policy=None))
+        return [SimpleStatement('SELECT', fetch_size=10), SimpleGraphStatement('g.V()', is_idempotent=True),
+                bound, batch]
+
+    def test_statement_types(self):
+        for statement in self._statements():
+            targeted = HostTargetingStatement(statement, '127.0.0.1')
+            self.assertIsInstance(targeted, type(statement))
+            self.assertIsInstance(targeted, HostTargetingStatement)
+            self.assertEqual(targeted.target_host, '127.0.0.1')
+            self.assertEqual(targeted.is_idempotent, statement.is_idempotent)
+            self.assertEqual(targeted.fetch_size, statement.fetch_size)
+            self.assertEqual(targeted.routing_key, statement.routing_key)
+
+    def test_statement_not_modified(self):
+        for statement in self._statements():
+            HostTargetingStatement(statement, '127.0.0.1')
+            self.assertFalse(hasattr(statement, 'target_host'))
+            self.assertNotIn('target_host', statement.__dict__)
+
+    def test_class_cached(self):
+        first = HostTargetingStatement(SimpleGraphStatement('g.V()'), '127.0.0.1')
+        second = HostTargetingStatement(SimpleGraphStatement('g.E()'), '127.0.0.2')
+        self.assertIs(type(first), type(second))
+        self.assertIsNot(type(first), type(HostTargetingStatement(SimpleStatement('SELECT'), '127.0.0.1')))
+        self.assertEqual((first.query_string, first.target_host), ('g.V()', '127.0.0.1'))
+
+    def test_retarget(self):
+        statement = SimpleGraphStatement('g.V()')
+        targeted = HostTargetingStatement(statement, '127.0.0.1')
+        retargeted = HostTargetingStatement(targeted, '127.0.0.2')
+        self.assertIs(type(retargeted), type(targeted))
+        self.assertEqual(targeted.target_host, '127.0.0.1')
+        self.assertEqual(retargeted.target_host, '127.0.0.2')
+        self.assertEqual(retargeted.query_string, 'g.V()')
+
+    def test_copy(self):
+        statement = SimpleGraphStatement('g.V()', is_idempotent=True)
+        targeted = HostTargetingStatement(statement, '127.0.0.1')
+        for copied in (copy.copy(targeted), copy.deepcopy(targeted), pickle.loads(pickle.dumps(targeted))):
+            self.assertIs(type(copied), type(targeted))
+            self.assertEqual((copied.query_string, copied.is_idempotent, copied.target_host),
+                             ('g.V()', True, '127.0.0.1'))
+            copied.fetch_size = 10
+            self.assertNotEqual(statement.fetch_size, 10)
+            self.assertNotEqual(targeted.fetch_size, 10)
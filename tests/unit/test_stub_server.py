@@ -0,0 +1,196 @@
+# Copyright 2016 DataStax, Inc.
+#
+# Licensed under the DataStax DSE Driver License;
+# you may not use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+# http://www.datastax.com/terms/datastax-dse-driver-license-terms
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest  # noqa
+
+import time
+
+from cassandra import InvalidRequest
+from cassandra.policies import ConstantSpeculativeExecutionPolicy, WhiteListRoundRobinPolicy, RoundRobinPolicy
+from dse.cluster import (Cluster, GraphExecutionProfile, EXEC_PROFILE_GRAPH_DEFAULT,
+                         EXEC_PROFILE_GRAPH_ANALYTICS_DEFAULT)
+from dse.graph import SimpleGraphStatement, Vertex
+from dse.metrics import GraphMetrics
+from dse.policies import LatencyAwarePolicy, WorkloadAwarePolicy
+
+from tests.stub_server import StubServer, StubError, INVALID
+
+
+class StubServerTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.received = []
+
+        def handler(request):
+            cls.received.append(request)
+            if request.query == 'fail':
+                raise StubError("no such property", INVALID)
+            if request.query == 'echo':
+                return [request.parameters]
+            return cls.server._canned_response(request)
+
+        cls.server = StubServer(handler=handler, latency=lambda request: 0.2 if request.query == 'slow' else 0,
+                                responses={'g.V().count()': [42],
+                                           'g.V()': [{'id': 1, 'label': 'person', 'type': 'vertex',
+                                                      'properties': {}}]}).start()
+        cls.cluster = Cluster([cls.server.address], port=cls.server.port, protocol_version=4)
+        cls.session = cls.cluster.connect()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.cluster.shutdown()
+        cls.server.stop()
+
+    def setUp(self):
+        del self.received[:]
+
+    def test_canned_results(self):
+        self.assertEqual(self.session.execute_graph('g.V().count()')[0].value, 42)
+        vertex, = self.session.execute_graph('g.V()')
+        self.assertIsInstance(vertex, Vertex)
+        self.assertEqual(list(self.session.execute_graph('g.E()')), [])
+
+    def test_request(self):
+        self.assertEqual(self.session.execute_graph('echo', {'x': [1, 2]})[0].value, {'x': [1, 2]})
+        request, = self.received
+        self.assertEqual(request.query, 'echo')
+        self.assertEqual(request.custom_payload['graph-language'], b'gremlin-groovy')
+
+    def test_error(self):
+        self.assertRaises(InvalidRequest, self.session.execute_graph, 'fail')
+
+    def test_latency(self):
+        start = time.time()
+        slow = self.session.execute_graph_async('slow')
+        self.session.execute_graph('g.V().count()')  # not held up by the slow response
+        self.assertLess(time.time() - start, 0.2)
+        slow.result()
+        self.assertGreaterEqual(time.time() - start, 0.2)
+
+    def test_analytics_master(self):
+        self.session.execute_graph('g.V().count()', execution_profile=EXEC_PROFILE_GRAPH_ANALYTICS_DEFAULT)
+        self.assertEqual(self.session._analytics_master[0], self.server.address)
+        self.assertEqual(self.received[0].custom_payload['graph-source'], b'a')
+
+
+class SpeculativeExecutionTests(unittest.TestCase):
+
+    def setUp(self):
+        # the first node is slow to respond
+        self.slow = StubServer(responses={'g.V()': ['slow']}, latency=0.5, peers=['127.0.0.2']).start()
+        self.fast = StubServer(responses={'g.V()': ['fast']}, address='127.0.0.2', port=self.slow.port,
+                               peers=['127.0.0.1']).start()
+        profile = GraphExecutionProfile(load_balancing_policy=WhiteListRoundRobinPolicy(['127.0.0.1', '127.0.0.2']),
+                                        speculative_execution_policy=ConstantSpeculativeExecutionPolicy(0.05, 1))
+        self.cluster = Cluster(['127.0.0.1'], port=self.slow.port, protocol_version=4,
+                               execution_profiles={EXEC_PROFILE_GRAPH_DEFAULT: profile})
+        self.session = self.cluster.connect()
+        self.session.graph_metrics = GraphMetrics()
+        # the second node is discovered by the control connection; wait for its pool
+        deadline = time.time() + 5
+        while len(self.session._pools) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+
+    def tearDown(self):
+        self.cluster.shutdown()
+        self.slow.stop()
+        self.fast.stop()
+
+    def execute(self, statement):
+        results = []
+        callbacks = []
+        # the round robin plan starts with each node in turn
+        for _ in range(2):
+            start = time.time()
+            future = self.session.execute_graph_async(statement)
+            future.add_callback(callbacks.append)
+            results.append(future.result()[0].value)
+            self.assertLess(time.time() - start, 0.4)
+            time.sleep(0.6)
+        self.assertEqual(len(callbacks), 2)  # late responses are discarded
+        return results
+
+    def test_idempotent(self):
+        self.assertEqual(self.execute(SimpleGraphStatement('g.V()', is_idempotent=True)), ['fast', 'fast'])
+        self.assertEqual(self.session.graph_metrics.snapshot()[('graph_default', None)]['wasted_attempts'], 1)
+        self.assertEqual(self.slow.requests + self.fast.requests, 3)
+
+    def test_not_idempotent(self):
+        self.assertRaises(AssertionError, self.execute, SimpleGraphStatement('g.V()'))
+        self.assertEqual(self.session.graph_metrics.snapshot()[('graph_default', None)]['wasted_attempts'], 0)
+
+
+class LatencyAwareTests(unittest.TestCase):
+
+    def setUp(self):
+        self.slow = StubServer(responses={'g.V()': ['slow']}, latency=0.05, peers=['127.0.0.2']).start()
+        self.fast = StubServer(responses={'g.V()': ['fast']}, address='127.0.0.2', port=self.slow.port,
+                               peers=['127.0.0.1']).start()
+        self.policy = LatencyAwarePolicy(WhiteListRoundRobinPolicy(['127.0.0.1', '127.0.0.2']), min_measurements=3)
+        profile = GraphExecutionProfile(load_balancing_policy=self.policy)
+        self.cluster = Cluster(['127.0.0.1'], port=self.slow.port, protocol_version=4,
+                               execution_profiles={EXEC_PROFILE_GRAPH_DEFAULT: profile})
+        self.session = self.cluster.connect()
+        deadline = time.time() + 5
+        while len(self.session._pools) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+
+    def tearDown(self):
+        self.cluster.shutdown()
+        self.slow.stop()
+        self.fast.stop()
+
+    def test_slow_host_avoided(self):
+        results = [self.session.execute_graph('g.V()')[0].value for _ in range(40)]
+        # the slow host is used until both hosts have enough measurements
+        self.assertNotIn('slow', results[-10:])
+        latencies = dict((host.address, latency) for host, latency in self.policy.host_latencies().items())
+        self.assertGreater(latencies['127.0.0.1'][0], 0.05)
+        self.assertLess(latencies['127.0.0.2'][0], 0.05)
+
+
+class WorkloadAwareTests(unittest.TestCase):
+
+    def setUp(self):
+        workloads = {'127.0.0.1': ('Cassandra', False), '127.0.0.2': ('Cassandra', True)}
+        self.cassandra = StubServer(responses={'g.V()': ['cassandra']}, workload='Cassandra', graph=False,
+                                    peers=['127.0.0.2'], peer_workloads=workloads).start()
+        self.graph = StubServer(responses={'g.V()': ['graph']}, address='127.0.0.2', port=self.cassandra.port,
+                                workload='Cassandra', graph=True, peers=['127.0.0.1'],
+                                peer_workloads=workloads).start()
+        profile = GraphExecutionProfile(load_balancing_policy=WorkloadAwarePolicy(RoundRobinPolicy(), ['Graph']))
+        self.cluster = Cluster(['127.0.0.1'], port=self.cassandra.port, protocol_version=4,
+                               execution_profiles={EXEC_PROFILE_GRAPH_DEFAULT: profile})
+        self.session = self.cluster.connect()
+        deadline = time.time() + 5
+        while len(self.session._pools) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+
+    def tearDown(self):
+        self.cluster.shutdown()
+        self.cassandra.stop()
+        self.graph.stop()
+
+    def test_host_workloads(self):
+        workloads = dict((host.address, host.dse_workloads) for host in self.cluster.metadata.all_hosts())
+        self.assertEqual(workloads, {'127.0.0.1': frozenset(['Cassandra']),
+                                     '127.0.0.2': frozenset(['Cassandra', 'Graph'])})
+
+    def test_workloads_refreshed(self):
+        self.cassandra.peer_workloads['127.0.0.2'] = ('SearchAnalytics', False)
+        self.cluster.control_connection.refresh_node_list_and_token_map(force_token_rebuild=True)
+        self.assertEqual(self.cluster.metadata.get_host('127.0.0.2').dse_workloads, frozenset(['Search', 'Analytics']))
+
+    def test_graph_requests_routed(self):
+        results = [self.session.execute_graph('g.V()')[0].value for _ in range(10)]
+        self.assertEqual(results, ['graph'] * 10)